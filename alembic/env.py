@@ -27,6 +27,12 @@ from database.models import Base  # noqa: E402
 
 target_metadata = Base.metadata
 
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Keeps autogenerate from dropping the FTS5 table and its shadow tables."""
+    return not (type_ == "table" and name.startswith("log_entry_fts"))
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired: my_important_option = config.get_main_option("my_important_option")
 # ... etc.
@@ -48,6 +54,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -73,6 +80,7 @@ def run_migrations_online() -> None:
         context.configure(
             connection=connection,
             target_metadata=target_metadata,
+            include_object=include_object,
             render_as_batch=True,  # Enable batch mode for SQLite
         )
 
@@ -0,0 +1,54 @@
+"""Add log entry full-text index
+
+Revision ID: 3c14c17e10af
+Revises: add_tension_tracking_system
+Create Date: 2026-10-19 09:12:41.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3c14c17e10af"
+down_revision: Union[str, Sequence[str], None] = "add_tension_tracking_system"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS log_entry_fts USING fts5("
+        "content, content='log_entry', content_rowid='id', "
+        "tokenize='porter unicode61')"
+    )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS log_entry_fts_ai AFTER INSERT ON log_entry "
+        "BEGIN INSERT INTO log_entry_fts(rowid, content) "
+        "VALUES (new.id, new.content); END"
+    )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS log_entry_fts_ad AFTER DELETE ON log_entry "
+        "BEGIN INSERT INTO log_entry_fts(log_entry_fts, rowid, content) "
+        "VALUES ('delete', old.id, old.content); END"
+    )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS log_entry_fts_au "
+        "AFTER UPDATE OF content ON log_entry "
+        "BEGIN INSERT INTO log_entry_fts(log_entry_fts, rowid, content) "
+        "VALUES ('delete', old.id, old.content); "
+        "INSERT INTO log_entry_fts(rowid, content) VALUES (new.id, new.content); END"
+    )
+    # Index the log entries written before this migration
+    op.execute("INSERT INTO log_entry_fts(log_entry_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS log_entry_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS log_entry_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS log_entry_fts_ai")
+    op.execute("DROP TABLE IF EXISTS log_entry_fts")
@@ -0,0 +1,72 @@
+"""Add tension event due_at_watch
+
+Schedules tension event deadlines on an absolute game clock, kept in
+world_state under 'game_clock'. Existing saves start the clock at 0, so each
+active event's deadline falls on its current watches_remaining.
+
+Revision ID: 5e82c4d1f9a7
+Revises: b6e3f0a8d215
+Create Date: 2026-10-19 12:40:09.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5e82c4d1f9a7"
+down_revision: Union[str, Sequence[str], None] = "b6e3f0a8d215"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+tension_event = sa.table(
+    "tension_event",
+    sa.column("status", sa.String),
+    sa.column("watches_remaining", sa.Integer),
+    sa.column("due_at_watch", sa.Integer),
+)
+world_state = sa.table(
+    "world_state",
+    sa.column("key", sa.String),
+    sa.column("value", sa.JSON),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("tension_event", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("due_at_watch", sa.Integer(), nullable=True))
+        batch_op.create_index(
+            batch_op.f("ix_tension_event_due_at_watch"), ["due_at_watch"], unique=False
+        )
+
+    op.execute(
+        tension_event.update()
+        .where(tension_event.c.status == "active")
+        .values(due_at_watch=tension_event.c.watches_remaining)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Write the live countdown back before the clock goes away
+    conn = op.get_bind()
+    clock = conn.execute(
+        sa.select(world_state.c.value).where(world_state.c.key == "game_clock")
+    ).scalar()
+    op.execute(
+        tension_event.update()
+        .where(
+            tension_event.c.status == "active",
+            tension_event.c.due_at_watch.is_not(None),
+        )
+        .values(watches_remaining=tension_event.c.due_at_watch - int(clock or 0))
+    )
+    op.execute(world_state.delete().where(world_state.c.key == "game_clock"))
+
+    with op.batch_alter_table("tension_event", schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f("ix_tension_event_due_at_watch"))
+        batch_op.drop_column("due_at_watch")
@@ -0,0 +1,211 @@
+"""Add npc relationship tables
+
+Moves NPC relationship state out of the JSON stored in game_entity.bond and
+into npc_relationship, with the history in relationship_event.
+
+Revision ID: 9d4b7e21c6a3
+Revises: 3c14c17e10af
+Create Date: 2026-10-19 10:05:12.000000
+
+"""
+
+import json
+import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9d4b7e21c6a3"
+down_revision: Union[str, Sequence[str], None] = "3c14c17e10af"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+game_entity = sa.table(
+    "game_entity",
+    sa.column("id", sa.Integer),
+    sa.column("bond", sa.String),
+)
+npc_relationship = sa.table(
+    "npc_relationship",
+    sa.column("npc_id", sa.Integer),
+    sa.column("level", sa.Integer),
+    sa.column("type", sa.String),
+    sa.column("trust", sa.String),
+    sa.column("fear", sa.String),
+)
+relationship_event = sa.table(
+    "relationship_event",
+    sa.column("id", sa.Integer),
+    sa.column("npc_id", sa.Integer),
+    sa.column("action", sa.String),
+    sa.column("impact", sa.Integer),
+    sa.column("description", sa.Text),
+    sa.column("created_at", sa.DateTime),
+)
+
+
+def _parse_relationship(bond):
+    """Returns the relationship JSON stored in a bond, or None for plain text."""
+    try:
+        data = json.loads(bond)
+    except (TypeError, ValueError):
+        return None
+    if isinstance(data, dict) and "relationship_level" in data:
+        return data
+    return None
+
+
+def _parse_timestamp(value):
+    try:
+        return datetime.datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "npc_relationship",
+        sa.Column("npc_id", sa.Integer(), nullable=False),
+        sa.Column("level", sa.Integer(), nullable=False),
+        sa.Column("type", sa.String(), nullable=False),
+        sa.Column("trust", sa.String(), nullable=False),
+        sa.Column("fear", sa.String(), nullable=False),
+        sa.ForeignKeyConstraint(["npc_id"], ["game_entity.id"]),
+        sa.PrimaryKeyConstraint("npc_id"),
+    )
+    for column in ("level", "type", "trust", "fear"):
+        op.create_index(
+            f"ix_npc_relationship_{column}", "npc_relationship", [column]
+        )
+
+    op.create_table(
+        "relationship_event",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("npc_id", sa.Integer(), nullable=False),
+        sa.Column("action", sa.String(), nullable=False),
+        sa.Column("impact", sa.Integer(), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["npc_id"], ["game_entity.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_relationship_event_npc_id", "relationship_event", ["npc_id"]
+    )
+
+    # Move the relationship JSON out of bond
+    conn = op.get_bind()
+    relationships, events, bonds = [], [], []
+    for entity_id, bond in conn.execute(
+        sa.select(game_entity.c.id, game_entity.c.bond).where(
+            game_entity.c.bond.is_not(None)
+        )
+    ):
+        data = _parse_relationship(bond)
+        if data is None:
+            continue
+        relationships.append(
+            {
+                "npc_id": entity_id,
+                "level": int(data.get("relationship_level", 0)),
+                "type": data.get("relationship_type", "neutral"),
+                "trust": data.get("trust_level", "cautious"),
+                "fear": data.get("fear_level", "none"),
+            }
+        )
+        # A plain-text bond was kept as the first history entry; give it back
+        original_bond = None
+        for entry in data.get("history", []):
+            if entry.get("action") == "initial_bond":
+                original_bond = entry.get("description")
+                continue
+            events.append(
+                {
+                    "npc_id": entity_id,
+                    "action": entry.get("action", "unknown"),
+                    "impact": int(entry.get("impact", 0)),
+                    "description": entry.get("description"),
+                    "created_at": _parse_timestamp(entry.get("timestamp")),
+                }
+            )
+        bonds.append({"entity_id": entity_id, "bond": original_bond})
+
+    if relationships:
+        op.bulk_insert(npc_relationship, relationships)
+    if events:
+        op.bulk_insert(relationship_event, events)
+    if bonds:
+        conn.execute(
+            game_entity.update()
+            .where(game_entity.c.id == sa.bindparam("entity_id"))
+            .values(bond=sa.bindparam("bond")),
+            bonds,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Fold the relationships back into the bond JSON, keeping the last 10 events
+    conn = op.get_bind()
+    bonds = dict(
+        conn.execute(sa.select(game_entity.c.id, game_entity.c.bond)).fetchall()
+    )
+    updates = []
+    for row in conn.execute(sa.select(npc_relationship)).mappings():
+        history = []
+        if bonds.get(row["npc_id"]):
+            history.append(
+                {
+                    "action": "initial_bond",
+                    "impact": 0,
+                    "description": bonds[row["npc_id"]],
+                }
+            )
+        event_rows = conn.execute(
+            sa.select(relationship_event)
+            .where(relationship_event.c.npc_id == row["npc_id"])
+            .order_by(relationship_event.c.id.desc())
+            .limit(10)
+        ).mappings()
+        for event in reversed(list(event_rows)):
+            history.append(
+                {
+                    "action": event["action"],
+                    "impact": event["impact"],
+                    "description": event["description"],
+                    "timestamp": event["created_at"].isoformat()
+                    if event["created_at"]
+                    else None,
+                }
+            )
+        updates.append(
+            {
+                "entity_id": row["npc_id"],
+                "bond": json.dumps(
+                    {
+                        "relationship_level": row["level"],
+                        "relationship_type": row["type"],
+                        "history": history[-10:],
+                        "trust_level": row["trust"],
+                        "fear_level": row["fear"],
+                    }
+                ),
+            }
+        )
+    if updates:
+        conn.execute(
+            game_entity.update()
+            .where(game_entity.c.id == sa.bindparam("entity_id"))
+            .values(bond=sa.bindparam("bond")),
+            updates,
+        )
+
+    op.drop_index("ix_relationship_event_npc_id", table_name="relationship_event")
+    op.drop_table("relationship_event")
+    for column in ("level", "type", "trust", "fear"):
+        op.drop_index(f"ix_npc_relationship_{column}", table_name="npc_relationship")
+    op.drop_table("npc_relationship")
@@ -0,0 +1,75 @@
+"""Normalize game entity attacks
+
+Older rows store attacks as a JSON-encoded string inside the JSON column
+('"[{\"name\": ...}]"'). This rewrites them as plain JSON lists.
+
+Revision ID: b6e3f0a8d215
+Revises: 9d4b7e21c6a3
+Create Date: 2026-10-19 11:20:37.000000
+
+"""
+
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b6e3f0a8d215"
+down_revision: Union[str, Sequence[str], None] = "9d4b7e21c6a3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+game_entity = sa.table(
+    "game_entity",
+    sa.column("id", sa.Integer),
+    sa.column("attacks", sa.JSON),
+)
+
+
+def _rewrite_attacks(convert) -> None:
+    conn = op.get_bind()
+    updates = []
+    for entity_id, attacks in conn.execute(
+        sa.select(game_entity.c.id, game_entity.c.attacks).where(
+            game_entity.c.attacks.is_not(None)
+        )
+    ):
+        converted = convert(attacks)
+        if converted is not attacks:
+            updates.append({"entity_id": entity_id, "attacks": converted})
+    if updates:
+        conn.execute(
+            game_entity.update()
+            .where(game_entity.c.id == sa.bindparam("entity_id"))
+            .values(attacks=sa.bindparam("attacks")),
+            updates,
+        )
+
+
+def _decode(attacks):
+    decoded = attacks
+    while isinstance(decoded, str):
+        try:
+            decoded = json.loads(decoded)
+        except ValueError:
+            # Not JSON at all; leave the row for the runtime fallback
+            return attacks
+    return decoded if isinstance(decoded, list) else attacks
+
+
+def _encode(attacks):
+    return json.dumps(attacks) if isinstance(attacks, list) else attacks
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _rewrite_attacks(_decode)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Earlier revisions of deal_damage only read the string form
+    _rewrite_attacks(_encode)
@@ -0,0 +1,115 @@
+"""
+Benchmarks tension condition dispatch with many active conditions.
+
+Compares ConditionTracker's indexed dispatch with the previous approach, which
+queried the unmet conditions of every active tension event on each trigger.
+Triggers are a mix of kills, moves, gifts and pickups; a few of them meet a
+condition, most match nothing.
+
+Usage:
+    python benchmarks/bench_condition_dispatch.py [--events N] [--triggers N]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from core.condition_tracker import ConditionTracker  # noqa: E402
+from database.models import Base, TensionEvent, ResolutionCondition  # noqa: E402
+
+
+def build_session(events: int, rng: random.Random):
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    for i in range(events):
+        kind = rng.choice(["entity_death", "item_delivery", "location_visit"])
+        if kind == "entity_death":
+            target = {"entity_name": f"Beast {i}"}
+        elif kind == "item_delivery":
+            target = {"item_name": f"Relic {i}", "receiver_name": f"Elder {i}"}
+        else:
+            target = {"location_name": f"Shrine {i}"}
+        db.add(
+            TensionEvent(
+                title=f"Event {i}", description="", source_type="world_event",
+                deadline_watches=3, watches_remaining=3,
+                conditions=[
+                    ResolutionCondition(
+                        condition_type=kind, description="", target_data=target
+                    ),
+                    ResolutionCondition(
+                        condition_type="custom", description="",
+                        target_data={"description": "Something hard"},
+                    ),
+                ],
+            )
+        )
+    db.commit()
+    return db
+
+
+def build_triggers(count: int, events: int, rng: random.Random):
+    triggers = []
+    for _ in range(count):
+        i = rng.randrange(events * 10)  # roughly one in ten names exists
+        triggers.append(rng.choice([
+            ("entity_death", {"entity_name": f"Beast {i}", "entity_id": i}),
+            ("item_delivery", {"item_name": f"Relic {i}", "receiver_name": f"Elder {i}"}),
+            ("item_received", {"item_name": f"Relic {i}", "recipient_name": "Player"}),
+            ("location_visit", {"location_name": f"Shrine {i}", "character_name": "Player"}),
+        ]))
+    return triggers
+
+
+def scan_all_events(tracker: ConditionTracker, trigger_type, trigger_data) -> None:
+    """The previous dispatch: every active event, then its unmet conditions."""
+    db = tracker.db
+    for event in db.query(TensionEvent).filter(TensionEvent.status == "active").all():
+        unmet = db.query(ResolutionCondition).filter(
+            ResolutionCondition.tension_event_id == event.id,
+            ResolutionCondition.is_met == False,  # noqa: E712
+        ).all()
+        for condition in unmet:
+            tracker._evaluate_condition(condition, trigger_type, trigger_data)
+
+
+def run(name: str, dispatch, events: int, triggers) -> float:
+    db = build_session(events, random.Random(0))
+    tracker = ConditionTracker(db)
+    start = time.perf_counter()
+    for trigger_type, trigger_data in triggers:
+        dispatch(tracker, trigger_type, trigger_data)
+    seconds = time.perf_counter() - start
+    per_trigger_ms = seconds / len(triggers) * 1000
+    print(f"{name:>8}: {per_trigger_ms:8.3f} ms/trigger ({len(triggers)} triggers)")
+    db.close()
+    return per_trigger_ms
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=1000)
+    parser.add_argument("--triggers", type=int, default=200)
+    args = parser.parse_args()
+
+    triggers = build_triggers(args.triggers, args.events, random.Random(1))
+    print(f"{args.events} active tension events, {args.events * 2} unmet conditions")
+    scan = run("scan", scan_all_events, args.events, triggers)
+    indexed = run(
+        "indexed",
+        lambda tracker, kind, data: tracker.check_all_conditions(kind, data),
+        args.events,
+        triggers,
+    )
+    print(f"speedup: {scan / indexed:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
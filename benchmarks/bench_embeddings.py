@@ -0,0 +1,106 @@
+"""
+Benchmarks indexing throughput and retrieval recall of the embedding backends.
+
+The corpus is built from the background descriptions in the oracle tables. Each
+query is a shuffled fragment of one document, and recall@k counts how often that
+document is among the top k results.
+
+Usage:
+    python benchmarks/bench_embeddings.py [--docs N] [--k K]
+
+The Google backend is only measured when GOOGLE_API_KEY is set.
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from langchain_community.vectorstores import Chroma  # noqa: E402
+from langchain_core.documents import Document  # noqa: E402
+from core.embeddings import create_embeddings  # noqa: E402
+from core.oracles import BACKGROUNDS  # noqa: E402
+
+
+def build_corpus() -> list[str]:
+    corpus = []
+    for background in BACKGROUNDS.values():
+        for key, table in background.items():
+            if key in ("name", "starting_gear", "names"):
+                continue
+            corpus.extend(entry["description"] for entry in table.values())
+    return corpus
+
+
+def build_queries(corpus: list[str], rng: random.Random) -> list[tuple[int, str]]:
+    queries = []
+    for doc_id, text in enumerate(corpus):
+        words = text.split()
+        start = rng.randint(0, max(0, len(words) - 6))
+        fragment = words[start : start + 6]
+        rng.shuffle(fragment)
+        queries.append((doc_id, " ".join(fragment)))
+    return queries
+
+
+def run_backend(name: str, corpus: list[str], queries, k: int) -> dict:
+    embeddings = create_embeddings(name)
+    store = Chroma(collection_name=f"bench_{name}", embedding_function=embeddings)
+    documents = [
+        Document(page_content=text, metadata={"doc_id": i})
+        for i, text in enumerate(corpus)
+    ]
+
+    start = time.perf_counter()
+    store.add_documents(documents, ids=[str(i) for i in range(len(documents))])
+    index_seconds = time.perf_counter() - start
+
+    hits = 0
+    start = time.perf_counter()
+    for doc_id, query in queries:
+        results = store.similarity_search(query, k=k)
+        hits += any(doc.metadata["doc_id"] == doc_id for doc in results)
+    query_seconds = time.perf_counter() - start
+    store.delete_collection()
+
+    return {
+        "backend": embeddings.backend_name,
+        "docs_per_sec": len(corpus) / index_seconds,
+        "queries_per_sec": len(queries) / query_seconds,
+        "recall": hits / len(queries),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--docs", type=int, default=0, help="Limit the corpus size.")
+    parser.add_argument("--k", type=int, default=5, help="Recall cut-off.")
+    args = parser.parse_args()
+
+    rng = random.Random(1234)
+    corpus = build_corpus()
+    if args.docs:
+        corpus = corpus[: args.docs]
+    queries = build_queries(corpus, rng)
+
+    backends = ["local"]
+    if os.getenv("GOOGLE_API_KEY"):
+        backends.append("google")
+    else:
+        print("GOOGLE_API_KEY not set; skipping the google backend.")
+
+    print(f"{len(corpus)} documents, {len(queries)} queries, recall@{args.k}")
+    print(f"{'backend':<24}{'docs/s':>12}{'queries/s':>12}{'recall':>10}")
+    for name in backends:
+        result = run_backend(name, corpus, queries, args.k)
+        print(
+            f"{result['backend']:<24}{result['docs_per_sec']:>12.1f}"
+            f"{result['queries_per_sec']:>12.1f}{result['recall']:>10.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Benchmarks the Monte Carlo encounter simulator.
+
+Fights a hero against a pack of hostiles many times and reports the outcome
+odds along with simulated fights per second.
+
+Usage:
+    python benchmarks/bench_encounters.py [--fights N] [--enemies N] [--seed N]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import numpy as np  # noqa: E402
+from core.dice import compile_dice  # noqa: E402
+from core.encounters import StatBlock, simulate_encounter  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--fights", type=int, default=100_000)
+    parser.add_argument("--enemies", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    hero = StatBlock("Hero", 6, 12, 1, compile_dice("1d8"))
+    enemies = [
+        StatBlock(f"Bandit {i}", 4, 10, 0, compile_dice("1d6")) for i in range(args.enemies)
+    ]
+    started = time.perf_counter()
+    report = simulate_encounter(hero, enemies, args.fights, np.random.default_rng(args.seed))
+    seconds = time.perf_counter() - started
+
+    print(f"{args.fights:,} fights against {args.enemies} bandits in {seconds:.2f}s: "
+          f"{args.fights / seconds:,.0f} fights/s")
+    print(f"won {report.win_rate:.1%}, died {report.death_rate:.1%}, "
+          f"undecided {report.stalemate_rate:.1%}, {report.expected_rounds:.2f} rounds on average")
+    print(f"scars: {report.scar_distribution}")
+    print(f"bandits slain: {report.enemy_deaths}")
+
+
+if __name__ == "__main__":
+    main()
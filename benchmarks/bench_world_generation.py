@@ -0,0 +1,84 @@
+"""
+Benchmarks new-world generation against the database.
+
+Generates worlds in an in-memory database with a canned LLM reply, so only
+planning and database time are measured, and reports the rows written and
+where the time went.
+
+Usage:
+    python benchmarks/bench_world_generation.py [--worlds N] [--npcs N] [--seed N]
+"""
+
+import os
+import sys
+import json
+import argparse
+from collections import defaultdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from sqlalchemy import create_engine, event  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from core.rng import WORLD_GEN, RNGService  # noqa: E402
+from core.world_generator import WorldGenerator  # noqa: E402
+from database.models import Base  # noqa: E402
+
+
+class CannedLLM:
+    """Answers every prompt with the same area, with a crowd of NPCs in each location."""
+
+    def __init__(self, npcs: int):
+        crowd = [f"A busy merchant {i}" for i in range(npcs)] + ["A rusty lantern", "A goblin (HP: 3)"]
+        self.reply = json.dumps({
+            "summary": "A crowded place.",
+            "locations": [
+                {"name": f"Room {i}", "description": "Busy.", "contents": crowd} for i in range(5)
+            ],
+            "connections": {f"Room {i}": [f"Room {(i + 1) % 5}"] for i in range(5)},
+            "active_tensions": [
+                {"title": "Trouble", "description": "Trouble brews.", "source_location": "Room 0",
+                 "urgency": "urgent", "potential_solutions": ["Visit Room 1", "Bring bread to the merchant"]},
+            ],
+        })
+
+    def generate_response(self, prompt: str) -> str:
+        return self.reply
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--worlds", type=int, default=20)
+    parser.add_argument("--npcs", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    seconds = defaultdict(float)
+    rows = defaultdict(int)
+    statements = 0
+    for i in range(args.worlds):
+        engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(engine)
+        db = sessionmaker(bind=engine)()
+        counter = []
+        event.listen(engine, "before_cursor_execute", lambda *a: counter.append(1))
+        generator = WorldGenerator(db, CannedLLM(args.npcs), RNGService(args.seed + i).stream(WORLD_GEN))
+        report = generator.generate_new_world()
+        for phase, spent in report.seconds.items():
+            seconds[phase] += spent
+        for table, count in report.rows.items():
+            rows[table] += count
+        statements += len(counter)
+        db.close()
+
+    total_rows = sum(rows.values())
+    print(f"{args.worlds} worlds, {total_rows / args.worlds:,.0f} rows and "
+          f"{statements / args.worlds:.0f} statements each, "
+          f"{seconds['total'] / args.worlds * 1000:.1f}ms per world")
+    for phase, spent in sorted(seconds.items(), key=lambda item: -item[1]):
+        print(f"  {phase:<22}{spent / args.worlds * 1000:8.2f}ms")
+    for table, count in sorted(rows.items()):
+        print(f"  {table:<22}{count / args.worlds:8.0f} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmarks fast-forwarding a synthetic world with WorldSimulator.
+
+Builds a map of connected points with wandering hostile entities and active
+tension events, then simulates many watches and reports simulated watches per
+second.
+
+Usage:
+    python benchmarks/bench_world_simulation.py [--points N] [--hostiles N] [--events N] [--watches N]
+"""
+
+import os
+import sys
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from core.world_simulator import WorldSimulator  # noqa: E402
+from database.models import (  # noqa: E402
+    Base, GameEntity, Location, MapPoint, Path, TensionEvent
+)
+
+
+def build_session(points: int, hostiles: int, events: int, rng: random.Random):
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    map_points = [MapPoint(name=f"Point {i}", status="known") for i in range(points)]
+    db.add_all(map_points)
+    db.flush()
+    for point in map_points:
+        db.add(Location(name=f"Gate of {point.name}", description="", map_point=point, is_entry_point=True))
+    for i, point in enumerate(map_points):
+        # A ring keeps the map connected; a few shortcuts make it interesting
+        for other in (map_points[(i + 1) % points], rng.choice(map_points)):
+            if other.id != point.id:
+                db.add(Path(
+                    start_point_id=point.id, end_point_id=other.id,
+                    status="known", watches=rng.randint(1, 3),
+                ))
+    for i in range(hostiles):
+        db.add(GameEntity(
+            name=f"Beast {i}", entity_type="Monster", is_hostile=True, hp=4, strength=8,
+            current_map_point_id=rng.choice(map_points).id,
+        ))
+    for i in range(events):
+        deadline = rng.randint(2, 8)
+        db.add(TensionEvent(
+            title=f"Event {i}", description="", source_type="world_event",
+            severity_level=1, max_severity=rng.randint(2, 5),
+            deadline_watches=deadline, watches_remaining=deadline,
+            origin_map_point_id=rng.choice(map_points).id,
+        ))
+    db.commit()
+    return db
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--points", type=int, default=50)
+    parser.add_argument("--hostiles", type=int, default=100)
+    parser.add_argument("--events", type=int, default=50)
+    parser.add_argument("--watches", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    db = build_session(args.points, args.hostiles, args.events, random.Random(args.seed))
+    report = WorldSimulator(db, seed=args.seed).fast_forward(args.watches)
+    print(
+        f"{args.points} map points, {args.hostiles} hostiles, {args.events} tension events"
+    )
+    print(
+        f"{report.watches} watches in {report.seconds:.2f}s: "
+        f"{report.watches_per_second:,.0f} watches/s"
+    )
+    print(
+        f"{report.moves} journeys, {report.escalations} escalations, "
+        f"{report.failures} failures, {len(report.consequences)} consequences"
+    )
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -7,9 +7,11 @@ from sqlalchemy import create_engine
 from core.llm_service import LLMService
 from core.orchestrator import WardenOrchestrator
 from core.world_generator import WorldGenerator
+from core.rng import set_adventure_seed
 from database.database import init_engine, get_db, dispose_engine
 from database.models import GameEntity, Base, MapPoint
-from core.rag_service import RAGService
+from core.rag_service import RAGService, index_directory_for
+from core.indexing_worker import IndexingWorker
 from ui.character_creation_view import render_character_creation_view
 from ui.main_view import render_main_view
 from ui.sidebar_view import render_sidebar
@@ -22,10 +24,17 @@ def initialize_services():
     """Initializes and caches the core services for an active game."""
     if "rag_service" not in st.session_state:
         with next(get_db()) as db:
-            st.session_state.rag_service = RAGService(db)
+            st.session_state.rag_service = RAGService(
+                db, index_directory_for(st.session_state["active_db_path"])
+            )
             st.session_state.rag_service.load_adventure_log()
             st.toast("Memory Engrams Loaded.")
 
+    if "indexing_worker" not in st.session_state:
+        st.session_state.indexing_worker = IndexingWorker(
+            st.session_state.rag_service
+        ).start()
+
     if "llm_service" not in st.session_state:
         try:
             st.session_state.llm_service = LLMService()
@@ -36,7 +45,10 @@ def initialize_services():
     if "orchestrator" not in st.session_state:
         with next(get_db()) as db:
             st.session_state.orchestrator = WardenOrchestrator(
-                st.session_state.llm_service, db
+                st.session_state.llm_service,
+                db,
+                indexing_worker=st.session_state.indexing_worker,
+                rag_service=st.session_state.rag_service,
             )
 
 
@@ -68,9 +80,14 @@ def show_launcher():
 
     st.subheader("New Adventure")
     new_adventure_name = st.text_input("Enter a name for your new adventure:")
+    new_adventure_seed = st.text_input(
+        "Seed (optional):", help="The same seed always generates the same world."
+    ).strip()
     if st.button("Create New Game", use_container_width=True):
         if not new_adventure_name:
             st.warning("Please enter a name for your adventure.")
+        elif new_adventure_seed and not new_adventure_seed.isdigit():
+            st.warning("The seed must be a whole number.")
         else:
             adventure_file = f"{new_adventure_name.strip().replace(' ', '_')}.db"
             db_path = os.path.join(ADVENTURES_DIR, adventure_file)
@@ -90,6 +107,8 @@ def show_launcher():
 
                 # 3. Generate world
                 with next(get_db()) as db:
+                    if new_adventure_seed:
+                        set_adventure_seed(db, int(new_adventure_seed))
                     llm_service = LLMService()
                     world_generator = WorldGenerator(db, llm_service)
                     world_generator.generate_new_world()
@@ -169,7 +188,7 @@ def show_main_layout():
                     max_dexterity=10,
                     willpower=10,
                     max_willpower=10,
-                    attacks='[{"name": "Simple Dagger", "damage": "1d4"}]',
+                    attacks=[{"name": "Simple Dagger", "damage": "1d4"}],
                 )
                 start_map_point = (
                     db.query(MapPoint).filter(MapPoint.status == "explored").first()
@@ -1,8 +1,15 @@
 """
 This module provides a service for generating a complete, randomized character.
+
+Characters can also be generated in bulk: generate_characters rolls every
+attribute of N characters in a few vectorized numpy draws and returns them as
+columns, which entity_rows turns into GameEntity rows for a single bulk insert.
 """
 
 import random
+from typing import Any, Dict, List
+import numpy as np
+from .oracle_tables import get_table
 from .oracles import (
     PHYSIQUE,
     SKIN,
@@ -17,18 +24,43 @@ from .oracles import (
     BACKGROUNDS,
 )
 
+# The compiled oracle table each character trait is rolled on
+_TRAIT_TABLES = {
+    "physique": "PHYSIQUE",
+    "skin": "SKIN",
+    "hair": "HAIR",
+    "face": "FACE",
+    "speech": "SPEECH",
+    "clothing": "CLOTHING",
+    "virtue": "VIRTUE",
+    "vice": "VICE",
+    "bond": "BONDS",
+    "omen": "OMENS",
+}
+
+
+def _background_tables(background: dict) -> List[str]:
+    """The keys of a background's own d6 tables."""
+    return [key for key in background if key not in ("name", "starting_gear", "names")]
+
+
+_MAX_BACKGROUND_TABLES = max(len(_background_tables(b)) for b in BACKGROUNDS.values())
+
 
 class CharacterGenerator:
     """A service for generating a complete, randomized character."""
 
+    def __init__(self, rng: random.Random = random):
+        self.rng = rng
+
     def _d6(self):
-        return random.randint(1, 6)
+        return self.rng.randint(1, 6)
 
     def _d10(self):
-        return random.randint(1, 10)
+        return self.rng.randint(1, 10)
 
     def _d20(self):
-        return random.randint(1, 20)
+        return self.rng.randint(1, 20)
 
     def _3d6(self):
         return self._d6() + self._d6() + self._d6()
@@ -43,7 +75,7 @@ class CharacterGenerator:
         background = BACKGROUNDS[background_roll]
 
         character_sheet = {
-            "name": random.choice(background["names"]),
+            "name": self.rng.choice(background["names"]),
             "background": background["name"],
             "strength": self._3d6(),
             "dexterity": self._3d6(),
@@ -60,14 +92,98 @@ class CharacterGenerator:
             "vice": VICE[self._d10()],
             "bond": BONDS[self._d20()],
             "omen": OMENS[self._d20()],
-            "starting_gear": background["starting_gear"],
+            "starting_gear": list(background["starting_gear"]),
             "background_specific": {},
         }
 
-        for key, value in background.items():
-            if key not in ["name", "starting_gear", "names"]:
-                roll_result = value[self._d6()]
-                character_sheet["background_specific"][key] = roll_result["description"]
-                character_sheet["starting_gear"].extend(roll_result["items"])
+        for key in _background_tables(background):
+            roll_result = background[key][self._d6()]
+            character_sheet["background_specific"][key] = roll_result["description"]
+            character_sheet["starting_gear"].extend(roll_result["items"])
 
         return character_sheet
+
+    def generate_characters(
+        self, n: int, seed: int | None = None, details: bool = True
+    ) -> Dict[str, List[Any]]:
+        """Generates N randomized characters at once.
+
+        Args:
+            n: The number of characters.
+            seed: Seeds the rolls; by default they come from this generator's
+                stream, seeded from its bits if it has no numpy generator.
+            details: Whether to roll each background's starting gear and
+                background-specific tables, which is the only per-character work.
+
+        Returns:
+            The character sheets as columns: a dictionary with the same keys as
+            generate_character, each holding a list of N values.
+        """
+        if seed is not None:
+            rng = np.random.default_rng(seed)
+        else:
+            rng = getattr(self.rng, "numpy", None) or np.random.default_rng(self.rng.getrandbits(64))
+
+        backgrounds = get_table("BACKGROUNDS").sample(n, rng)
+        abilities = rng.integers(1, 7, size=(3, n, 3)).sum(axis=2)
+        name_picks = rng.random(n)
+        columns: Dict[str, List[Any]] = {
+            "name": [
+                b["names"][int(pick * len(b["names"]))]
+                for b, pick in zip(backgrounds, name_picks)
+            ],
+            "background": [b["name"] for b in backgrounds],
+            "strength": abilities[0].tolist(),
+            "dexterity": abilities[1].tolist(),
+            "willpower": abilities[2].tolist(),
+            "hp": rng.integers(1, 7, size=n).tolist(),
+            "age": (rng.integers(1, 21, size=(n, 2)).sum(axis=1) + 10).tolist(),
+        }
+        for key, table in _TRAIT_TABLES.items():
+            columns[key] = get_table(table).sample(n, rng)
+
+        if details:
+            columns["starting_gear"], columns["background_specific"] = [], []
+            specific_rolls = rng.integers(1, 7, size=(n, _MAX_BACKGROUND_TABLES)).tolist()
+            for background, rolls in zip(backgrounds, specific_rolls):
+                gear = list(background["starting_gear"])
+                specific = {}
+                for key, roll in zip(_background_tables(background), rolls):
+                    roll_result = background[key][roll]
+                    specific[key] = roll_result["description"]
+                    gear.extend(roll_result["items"])
+                columns["starting_gear"].append(gear)
+                columns["background_specific"].append(specific)
+        return columns
+
+
+def entity_rows(columns: Dict[str, List[Any]], **fields: Any) -> List[Dict[str, Any]]:
+    """
+    Turns generated character columns into GameEntity rows for a bulk insert.
+
+    Args:
+        columns: The output of CharacterGenerator.generate_characters.
+        **fields: Values shared by every row, such as entity_type or
+            current_location_id. A list of N values sets a different value per row.
+
+    Returns:
+        One dictionary of GameEntity column values per character.
+    """
+    n = len(columns["name"])
+    rows = []
+    for i in range(n):
+        row = {
+            "name": columns["name"][i],
+            "hp": columns["hp"][i],
+            "max_hp": columns["hp"][i],
+            "strength": columns["strength"][i],
+            "max_strength": columns["strength"][i],
+            "dexterity": columns["dexterity"][i],
+            "max_dexterity": columns["dexterity"][i],
+            "willpower": columns["willpower"][i],
+            "max_willpower": columns["willpower"][i],
+        }
+        for key, value in fields.items():
+            row[key] = value[i] if isinstance(value, list) else value
+        rows.append(row)
+    return rows
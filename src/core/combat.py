@@ -0,0 +1,237 @@
+"""
+This module holds the combat rules shared by the world tools and the
+orchestrator.
+
+Each entity's attacks are compiled once into an AttackProfile of parsed dice
+expressions and cached by entity id, so repeated attacks do no JSON or dice
+parsing. A combat round loads every combatant once, rolls all of their damage
+in one batch and resolves the attacks in memory before writing the results
+back in a single flush.
+"""
+
+import copy
+import json
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple
+from sqlalchemy.orm import Session
+from database.models import GameEntity
+from .dice import DiceExpression, compile_dice, roll_batch
+from . import rng, trigger_bus
+from . import condition_tracker  # noqa: F401  (subscribes to the deaths raised here)
+
+DEFAULT_DAMAGE = "1d4"
+MAX_ARMOR = 3
+PROFILE_CACHE_SIZE = 4096
+SCAR_DESCRIPTION = "A nasty gash across the face, a constant reminder of this day."
+
+
+class Attack(NamedTuple):
+    name: str
+    damage_dice: str
+    damage: DiceExpression
+
+
+class AttackProfile(NamedTuple):
+    """An entity's attacks, with their damage dice already parsed."""
+
+    attacks: tuple[Attack, ...]
+
+    @property
+    def primary(self) -> Attack:
+        return self.attacks[0]
+
+
+UNARMED = Attack("Unarmed", DEFAULT_DAMAGE, compile_dice(DEFAULT_DAMAGE))
+DEFAULT_PROFILE = AttackProfile((UNARMED,))
+
+# entity id -> (attacks value the profile was built from, profile)
+_profile_cache: OrderedDict[int, tuple[Any, AttackProfile]] = OrderedDict()
+
+
+def decode_attacks(raw: Any) -> list:
+    """
+    Returns the attack list stored in an attacks value. Older rows hold the
+    list as a JSON-encoded string inside the JSON column.
+    """
+    while isinstance(raw, str):
+        try:
+            raw = json.loads(raw)
+        except json.JSONDecodeError:
+            return []
+    return raw if isinstance(raw, list) else []
+
+
+def compile_attack_profile(raw: Any) -> AttackProfile:
+    """Builds an attack profile from an attacks value, falling back to unarmed."""
+    attacks = []
+    for attack in decode_attacks(raw):
+        if not isinstance(attack, dict):
+            continue
+        damage_dice = str(attack.get("damage") or DEFAULT_DAMAGE)
+        damage = compile_dice(damage_dice)
+        if damage is None:
+            damage_dice, damage = DEFAULT_DAMAGE, UNARMED.damage
+        attacks.append(Attack(attack.get("name", "Attack"), damage_dice, damage))
+    return AttackProfile(tuple(attacks)) if attacks else DEFAULT_PROFILE
+
+
+def attack_profile_for(entity: GameEntity) -> AttackProfile:
+    """
+    Returns the entity's compiled attack profile.
+
+    The cached profile is keyed by entity id and checked against the entity's
+    current attacks value, which acts as its version: a profile built from a
+    different value (edited attacks, or another adventure reusing the id) is
+    rebuilt.
+    """
+    raw = entity.attacks
+    cached = _profile_cache.get(entity.id)
+    if cached is not None and cached[0] == raw:
+        _profile_cache.move_to_end(entity.id)
+        return cached[1]
+
+    profile = compile_attack_profile(raw)
+    # Copied so in-place edits to the entity's list still invalidate the entry
+    _profile_cache[entity.id] = (copy.deepcopy(raw), profile)
+    _profile_cache.move_to_end(entity.id)
+    while len(_profile_cache) > PROFILE_CACHE_SIZE:
+        _profile_cache.popitem(last=False)
+    return profile
+
+
+def armor_of(entity: GameEntity) -> int:
+    """Returns the Armor an entity has against damage, between 0 and 3."""
+    return max(0, min(MAX_ARMOR, entity.armor or 0))
+
+
+def apply_damage(
+    attacker_name: str, target: GameEntity, damage_dice: str, damage_amount: int
+) -> Dict[str, Any]:
+    """
+    Applies damage to a target in memory under Cairn's rules.
+
+    The target's Armor (at most 3) is subtracted from the damage rolled.
+    Damage comes off HP first and overflows into Strength. Dropping to exactly
+    0 HP leaves a Scar, and Strength at 0 or below kills the target.
+
+    Returns:
+        The outcome of the attack, as reported by the deal_damage tool.
+    """
+    armor = armor_of(target)
+    damage_rolled = damage_amount
+    damage_amount = max(0, damage_amount - armor)
+    original_hp = target.hp
+    original_strength = target.strength
+    received_scar = None
+
+    # Check for a Scar before applying damage
+    if original_hp > 0 and (original_hp - damage_amount) == 0:
+        target.scars = (
+            f"{target.scars}\n{SCAR_DESCRIPTION}" if target.scars else SCAR_DESCRIPTION
+        )
+        target.max_hp = max(0, target.max_hp - 1)
+        received_scar = SCAR_DESCRIPTION
+
+    # Apply damage to HP first
+    hp_damage = min(original_hp, damage_amount)
+    target.hp = original_hp - hp_damage
+    remaining_damage = damage_amount - hp_damage
+
+    # Apply remaining damage to Strength
+    if remaining_damage > 0:
+        target.strength -= remaining_damage
+
+    result = {
+        "attacker_name": attacker_name,
+        "target_name": target.name,
+        "damage_roll": damage_dice,
+        "damage_rolled": damage_rolled,
+        "armor": armor,
+        "damage_taken": damage_amount,
+        "hp_lost": hp_damage,
+        "strength_lost": original_strength - target.strength,
+        "new_hp": target.hp,
+        "new_strength": target.strength,
+        "received_scar": received_scar,
+        "is_dead": False,
+    }
+
+    # Check for death
+    if target.strength <= 0:
+        target.is_retired = True
+        result["is_dead"] = True
+        result["final_state"] = f"{target.name} has been slain."
+    return result
+
+
+def death_trigger(target: GameEntity, killed_by: str) -> Dict[str, Any]:
+    """Returns the entity_death trigger data for a slain entity."""
+    return {
+        "entity_name": target.name,
+        "entity_id": target.id,
+        "killed_by": killed_by,
+        "is_hostile": bool(target.is_hostile),
+        "location_name": target.current_location.name if target.current_location else None,
+    }
+
+
+def resolve_combat_round(db: Session, target: GameEntity) -> Dict[str, Any]:
+    """
+    Has every living hostile entity at the target's location attack it once.
+
+    The combatants are loaded with one query and the attacks are resolved in
+    memory, in id order, stopping once the target is slain. Results are written
+    with a single flush; committing is left to the caller.
+
+    Args:
+        db: The database session.
+        target: The entity being attacked, usually the player character.
+
+    Returns:
+        A dictionary with the per-attack log and the target's final state.
+    """
+    if not target.current_location_id:
+        return {"attacks": [], "target_name": target.name, "is_dead": target.is_retired}
+
+    attackers = (
+        db.query(GameEntity)
+        .filter(
+            GameEntity.current_location_id == target.current_location_id,
+            GameEntity.is_hostile == True,  # noqa: E712
+            GameEntity.is_retired == False,  # noqa: E712
+            GameEntity.id != target.id,
+        )
+        .order_by(GameEntity.id)
+        .all()
+    )
+
+    attacks = [attack_profile_for(attacker).primary for attacker in attackers]
+    # Every attacker's damage is rolled in one batch
+    damage_rolls = roll_batch(
+        [attack.damage for attack in attacks], rng=rng.stream(db, rng.COMBAT).numpy
+    )[:, 0]
+
+    attack_log = []
+    killed_by = None
+    for attacker, attack, damage_amount in zip(attackers, attacks, damage_rolls):
+        if target.is_retired:
+            break
+        result = apply_damage(attacker.name, target, attack.damage_dice, int(damage_amount))
+        result["attack_name"] = attack.name
+        attack_log.append(result)
+        if result["is_dead"]:
+            killed_by = attacker.name
+
+    db.flush()
+
+    if killed_by:
+        # Raise the death for tension event conditions
+        trigger_bus.publish(db, "entity_death", death_trigger(target, killed_by))
+
+    return {
+        "attacks": attack_log,
+        "target_name": target.name,
+        "new_hp": target.hp,
+        "new_strength": target.strength,
+        "is_dead": bool(target.is_retired),
+    }
@@ -6,9 +6,210 @@ and automatically detects when resolution conditions for tension events are met.
 """
 
 import datetime
-from typing import Dict, Any, List
+from collections import defaultdict
+from typing import Dict, Any, List, Hashable, NamedTuple
+from sqlalchemy import insert, or_
 from sqlalchemy.orm import Session
 from database.models import TensionEvent, ResolutionCondition, GameEntity, LogEntry
+from .scheduler import DEADLINE_QUEUE_KEY, get_game_clock, set_game_clock
+from .session_cache import CACHES_UPDATED, SessionCache
+from .trigger_bus import Trigger, subscribe
+from .predicates import compile_predicate, index_keys, predicate_for, trigger_index_keys
+
+# Where a session keeps its index of unmet conditions
+CONDITION_INDEX_KEY = "condition_index"
+# The triggers tension event conditions can be met by
+CONDITION_TRIGGER_TYPES = ("entity_death", "item_delivery", "item_received", "location_visit")
+
+
+class ClockOutcome(NamedTuple):
+    severity_level: int
+    watches_remaining: int
+    escalations: int
+    failed: bool
+
+
+def advance_event_clock(
+    severity_level: int, max_severity: int, deadline_watches: int,
+    watches_remaining: int, watches: int
+) -> ClockOutcome:
+    """
+    Computes a tension event's state after some watches pass, in constant time.
+    
+    A deadline falls when the remaining watches reach zero. Each deadline raises
+    the severity by one and restarts the countdown; a deadline that falls at
+    maximum severity fails the event.
+    """
+    deadline_watches = max(1, deadline_watches)
+    if watches_remaining > watches:
+        return ClockOutcome(severity_level, watches_remaining - watches, 0, False)
+    
+    overflow = watches - watches_remaining
+    deadlines_passed = overflow // deadline_watches + 1
+    escalations_left = max(0, max_severity - severity_level)
+    if deadlines_passed > escalations_left:
+        return ClockOutcome(max(severity_level, max_severity), 0, escalations_left, True)
+    return ClockOutcome(
+        severity_level + deadlines_passed,
+        deadline_watches - overflow % deadline_watches,
+        deadlines_passed,
+        False,
+    )
+
+
+def _lower(value: Any) -> str:
+    return str(value or "").lower()
+
+
+def condition_key(condition_type: str, target_data: Dict[str, Any]) -> Hashable | None:
+    """
+    Returns the normalized key a condition is indexed under, or None for
+    condition types that no trigger can satisfy.
+    """
+    target_data = target_data or {}
+    if condition_type == "entity_death":
+        if "entity_name" in target_data:
+            return ("name", _lower(target_data["entity_name"]))
+        if "entity_id" in target_data:
+            return ("id", target_data["entity_id"])
+        return None
+    if condition_type == "item_delivery":
+        return (_lower(target_data.get("item_name")), _lower(target_data.get("receiver_name")))
+    if condition_type == "item_received":
+        return (_lower(target_data.get("item_name")), _lower(target_data.get("recipient_name")))
+    if condition_type == "location_visit":
+        return _lower(target_data.get("location_name"))
+    return None
+
+
+def condition_buckets(condition_type: str, target_data: Dict[str, Any]) -> List[tuple]:
+    """
+    Returns the index buckets a condition is filed under. A condition with a
+    predicate is filed under the predicate's index keys instead of its type.
+    """
+    if isinstance(target_data, dict) and "predicate" in target_data:
+        try:
+            compile_predicate(target_data["predicate"])
+        except ValueError:
+            return []  # never met, so never a candidate
+        return [("predicate", key) for key in index_keys(target_data["predicate"])]
+    key = condition_key(condition_type, target_data)
+    return [(condition_type, key)] if key is not None else []
+
+
+def trigger_keys(trigger_type: str, trigger_data: Dict[str, Any]) -> List[Hashable]:
+    """Returns every condition key a trigger could satisfy."""
+    if trigger_type == "entity_death":
+        return [
+            ("name", _lower(trigger_data.get("entity_name"))),
+            ("id", trigger_data.get("entity_id")),
+        ]
+    if trigger_type == "item_delivery":
+        return [(_lower(trigger_data.get("item_name")), _lower(trigger_data.get("receiver_name")))]
+    if trigger_type == "item_received":
+        return [(_lower(trigger_data.get("item_name")), _lower(trigger_data.get("recipient_name")))]
+    if trigger_type == "location_visit":
+        return [_lower(trigger_data.get("location_name"))]
+    return []
+
+
+class ConditionIndex:
+    """
+    The unmet conditions of active tension events, bucketed by
+    (condition_type, normalized key) or by predicate index key, with the unmet
+    conditions of each event.
+    """
+
+    def __init__(self):
+        self.buckets: Dict[tuple, set[int]] = defaultdict(set)
+        self.unmet_by_event: Dict[int, set[int]] = defaultdict(set)
+        self._entries: Dict[int, tuple] = {}  # condition id -> (buckets, event id)
+
+    @classmethod
+    def build(cls, db: Session) -> "ConditionIndex":
+        index = cls()
+        rows = (
+            db.query(
+                ResolutionCondition.id,
+                ResolutionCondition.tension_event_id,
+                ResolutionCondition.condition_type,
+                ResolutionCondition.target_data,
+            )
+            .join(TensionEvent, TensionEvent.id == ResolutionCondition.tension_event_id)
+            .filter(
+                TensionEvent.status == "active",
+                ResolutionCondition.is_met == False,  # noqa: E712
+            )
+            .all()
+        )
+        for row in rows:
+            index.add(row.id, row.tension_event_id, row.condition_type, row.target_data)
+        return index
+
+    def add(self, condition_id: int, event_id: int, condition_type: str, target_data) -> None:
+        buckets = condition_buckets(condition_type, target_data)
+        self._entries[condition_id] = (buckets, event_id)
+        for bucket in buckets:
+            self.buckets[bucket].add(condition_id)
+        self.unmet_by_event[event_id].add(condition_id)
+
+    def discard(self, condition_id: int) -> None:
+        """Removes a condition, e.g. once it is met."""
+        entry = self._entries.pop(condition_id, None)
+        if entry is None:
+            return
+        buckets, event_id = entry
+        for bucket in buckets:
+            self.buckets[bucket].discard(condition_id)
+            if not self.buckets[bucket]:
+                del self.buckets[bucket]
+        self.unmet_by_event[event_id].discard(condition_id)
+
+    def drop_event(self, event_id: int) -> None:
+        """Removes every condition of an event that is no longer active."""
+        for condition_id in list(self.unmet_by_event.pop(event_id, ())):
+            self.discard(condition_id)
+        self.unmet_by_event.pop(event_id, None)
+
+    def candidates(self, trigger_type: str, trigger_data: Dict[str, Any]) -> List[int]:
+        """Returns the ids of the only conditions this trigger could meet."""
+        found: set[int] = set()
+        for key in trigger_keys(trigger_type, trigger_data):
+            found |= self.buckets.get((trigger_type, key), set())
+        for key in trigger_index_keys(trigger_type, trigger_data):
+            found |= self.buckets.get(("predicate", key), set())
+        return sorted(found)
+
+    def unmet_count(self, event_id: int) -> int:
+        return len(self.unmet_by_event.get(event_id, ()))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _track_condition_changes(session: Session, index: ConditionIndex) -> None:
+    """Keeps a session's condition index current with what it flushes."""
+    for obj in session.new:
+        if isinstance(obj, ResolutionCondition) and not obj.is_met:
+            index.add(obj.id, obj.tension_event_id, obj.condition_type, obj.target_data)
+    for obj in session.dirty:
+        if isinstance(obj, ResolutionCondition) and obj.is_met:
+            index.discard(obj.id)
+        elif isinstance(obj, TensionEvent) and obj.status != "active":
+            index.drop_event(obj.id)
+    for obj in session.deleted:
+        if isinstance(obj, ResolutionCondition):
+            index.discard(obj.id)
+        elif isinstance(obj, TensionEvent):
+            index.drop_event(obj.id)
+
+
+_condition_indexes = SessionCache(
+    CONDITION_INDEX_KEY,
+    ConditionIndex.build,
+    (TensionEvent, ResolutionCondition),
+    on_flush=_track_condition_changes,
+)
 
 
 class ConditionTracker:
@@ -17,65 +218,82 @@ class ConditionTracker:
     def __init__(self, db: Session):
         self.db = db
     
+    def _condition_index(self) -> ConditionIndex:
+        """Returns this session's condition index, building it on first use."""
+        return _condition_indexes.get(self.db)
+
     def check_all_conditions(self, trigger_type: str, trigger_data: Dict[str, Any]) -> None:
         """
-        Check all active tension events for met conditions.
+        Check the unmet conditions of active tension events that this trigger could meet.
         
         Args:
             trigger_type: The type of trigger that occurred (e.g., "entity_death", "item_received")
             trigger_data: Data about the trigger event
         """
-        active_events = self.db.query(TensionEvent).filter(TensionEvent.status == "active").all()
-        
-        for event in active_events:
-            self._check_event_conditions(event, trigger_type, trigger_data)
+        self.check_triggers([Trigger(trigger_type, trigger_data)])
     
-    def _check_event_conditions(self, event: TensionEvent, trigger_type: str, trigger_data: Dict[str, Any]) -> None:
+    def check_triggers(self, triggers: List[Trigger]) -> None:
         """
-        Check if any conditions for this specific event are now met.
+        Check a batch of triggers against the unmet conditions they could meet.
+        
+        Only the conditions indexed under each trigger's type and key are loaded,
+        all with one query, so triggers that match nothing cost no queries at all.
+        Changes are flushed; committing is left to the caller.
         
         Args:
-            event: The tension event to check
-            trigger_type: The type of trigger that occurred
-            trigger_data: Data about the trigger event
+            triggers: The triggers to evaluate, in the order they happened
         """
-        # Get unmet conditions for this event
-        unmet_conditions = self.db.query(ResolutionCondition).filter(
-            ResolutionCondition.tension_event_id == event.id,
-            ResolutionCondition.is_met == False
-        ).all()
-        
-        for condition in unmet_conditions:
-            if self._evaluate_condition(condition, trigger_type, trigger_data):
-                # Mark condition as met
-                self.db.query(ResolutionCondition).filter(
-                    ResolutionCondition.id == condition.id
-                ).update({
-                    "is_met": True,
-                    "met_at": datetime.datetime.utcnow()
-                })
-                
-                # Log the condition being met
-                log_entry = LogEntry(
-                    source="Warden",
-                    content=f"**Condition Met:** {condition.description}",
-                    metadata_dict={"tension_event_id": event.id, "condition_id": condition.id}
-                )
-                self.db.add(log_entry)
-                
-                # Check if all conditions for this event are now met
-                remaining_unmet = self.db.query(ResolutionCondition).filter(
-                    ResolutionCondition.tension_event_id == event.id,
-                    ResolutionCondition.is_met == False
-                ).count()
-                
-                if remaining_unmet == 0:
-                    self._resolve_tension_event(event, str(condition.condition_type))
+        index = self._condition_index()
+        triggers_by_condition: Dict[int, List[Trigger]] = defaultdict(list)
+        for trigger in triggers:
+            for condition_id in index.candidates(trigger.trigger_type, trigger.data):
+                triggers_by_condition[condition_id].append(trigger)
+        if not triggers_by_condition:
+            return
+        
+        conditions = (
+            self.db.query(ResolutionCondition)
+            .filter(ResolutionCondition.id.in_(triggers_by_condition))
+            .order_by(ResolutionCondition.id)
+            .all()
+        )
+        for condition in conditions:
+            if condition.is_met or not any(
+                self._evaluate_condition(condition, trigger.trigger_type, trigger.data)
+                for trigger in triggers_by_condition[condition.id]
+            ):
+                continue
+            
+            event_id = condition.tension_event_id
+            # Mark condition as met
+            self.db.query(ResolutionCondition).filter(
+                ResolutionCondition.id == condition.id
+            ).execution_options(**{CACHES_UPDATED: True}).update({
+                "is_met": True,
+                "met_at": datetime.datetime.utcnow()
+            })
+            index.discard(condition.id)
+            
+            # Log the condition being met
+            log_entry = LogEntry(
+                source="Warden",
+                content=f"**Condition Met:** {condition.description}",
+                metadata_dict={"tension_event_id": event_id, "condition_id": condition.id}
+            )
+            self.db.add(log_entry)
+            
+            # Resolve the event once all its conditions are met
+            if index.unmet_count(event_id) == 0:
+                self._resolve_tension_event(condition.tension_event, str(condition.condition_type))
+        self.db.flush()
     
     def _evaluate_condition(self, condition: ResolutionCondition, trigger_type: str, trigger_data: Dict[str, Any]) -> bool:
         """
         Evaluate whether a specific condition is met by the current trigger.
         
+        A condition whose target_data holds a predicate is tested with the
+        predicate's compiled form, whatever its condition type.
+        
         Args:
             condition: The condition to evaluate
             trigger_type: The type of trigger that occurred
@@ -84,6 +302,11 @@ class ConditionTracker:
         Returns:
             True if the condition is met, False otherwise
         """
+        target_data = condition.target_data
+        if isinstance(target_data, dict) and "predicate" in target_data:
+            predicate = predicate_for(condition.id, target_data["predicate"])
+            return predicate(trigger_type, trigger_data)
+        
         condition_type = str(condition.condition_type)
         
         if condition_type == "entity_death" and trigger_type == "entity_death":
@@ -152,11 +375,14 @@ class ConditionTracker:
             resolution_method: How the event was resolved
         """
         # Update the event using SQLAlchemy's update method
-        self.db.query(TensionEvent).filter(TensionEvent.id == event.id).update({
+        self.db.query(TensionEvent).filter(TensionEvent.id == event.id).execution_options(
+            **{CACHES_UPDATED: True}
+        ).update({
             "status": "resolved",
             "resolved_at": datetime.datetime.utcnow(),
             "resolution_method": resolution_method
         })
+        self._drop_event_from_index(event.id)
         
         # Log the resolution
         log_entry = LogEntry(
@@ -169,85 +395,107 @@ class ConditionTracker:
         # TODO: Apply resolution consequences (new tension events, world state changes, etc.)
         # This will be implemented in later tasks
         
-        self.db.commit()
+        self.db.flush()
+    
+    def _drop_event_from_index(self, event_id: int) -> None:
+        # Bulk updates bypass the flush listeners, so the caches are told directly
+        index = self.db.info.get(CONDITION_INDEX_KEY)
+        if index is not None:
+            index.drop_event(event_id)
+        queue = self.db.info.get(DEADLINE_QUEUE_KEY)
+        if queue is not None:
+            queue.remove(event_id)
     
     def escalate_tension_events(self) -> List[TensionEvent]:
         """
-        Check all active tension events and escalate those that have reached their deadline.
-        This should be called periodically (e.g., when time advances).
+        Escalate or fail the active tension events whose deadline has already passed.
         
         Returns:
-            List of tension events that were escalated
+            List of tension events that were escalated or failed
         """
-        # Query for events that need escalation
-        events_to_escalate = self.db.query(TensionEvent).filter(
-            TensionEvent.status == "active",
-            TensionEvent.watches_remaining <= 0,
-            TensionEvent.severity_level < TensionEvent.max_severity
-        ).all()
-        
-        # Query for events that have failed (reached max severity)
-        events_to_fail = self.db.query(TensionEvent).filter(
-            TensionEvent.status == "active", 
-            TensionEvent.watches_remaining <= 0,
-            TensionEvent.severity_level >= TensionEvent.max_severity
-        ).all()
-        
-        escalated_events = []
-        
-        # Handle escalations
-        for event in events_to_escalate:
-            new_severity = event.severity_level + 1
-            self.db.query(TensionEvent).filter(TensionEvent.id == event.id).update({
-                "severity_level": new_severity,
-                "watches_remaining": event.deadline_watches
-            })
-            
-            log_entry = LogEntry(
-                source="Warden",
-                content=f"**{event.title} - ESCALATED**\n\nSeverity increased to {new_severity}. The situation grows more dire!",
-                metadata_dict={"tension_event_id": event.id, "new_severity": new_severity}
-            )
-            self.db.add(log_entry)
-            escalated_events.append(event)
-        
-        # Handle failures
-        for event in events_to_fail:
-            self.db.query(TensionEvent).filter(TensionEvent.id == event.id).update({
-                "status": "failed",
-                "resolved_at": datetime.datetime.utcnow()
-            })
-            
-            log_entry = LogEntry(
-                source="Warden",
-                content=f"**{event.title} - FAILED**\n\n{event.description}\n\nThe situation has spiraled out of control!",
-                metadata_dict={"tension_event_id": event.id}
-            )
-            self.db.add(log_entry)
-            
-            # TODO: Apply failure consequences
-            # This will be implemented in later tasks
-        
-        if escalated_events or events_to_fail:
-            self.db.commit()
-        
-        return escalated_events
+        return self.advance_time(watches=0)
     
-    def advance_time(self, watches: int = 1) -> List[TensionEvent]:
+    def advance_time(self, watches: int = 1, commit: bool = True) -> List[TensionEvent]:
         """
-        Advance time for all active tension events and check for escalations.
+        Advance time for all active tension events and apply every escalation due.
+        
+        Each event's severity, remaining watches and failure after any number of
+        watches are computed in closed form, so a long journey costs the same as
+        a single watch and may escalate an event several times. Only events whose
+        due_at_watch has passed on the game clock are read or written; the live
+        countdown of the others is their due watch minus the clock.
         
         Args:
             watches: Number of watches to advance
+            commit: Commit the changes, or only flush them for a caller that
+                advances time many times in one transaction
             
         Returns:
             List of tension events that were escalated or failed
         """
-        # Update all active events' remaining watches
-        self.db.query(TensionEvent).filter(TensionEvent.status == "active").update({
-            "watches_remaining": TensionEvent.watches_remaining - watches
-        }, synchronize_session=False)
+        clock = get_game_clock(self.db)
+        new_clock = clock + watches
+        set_game_clock(self.db, new_clock)
         
-        self.db.commit()
+        # Only events whose deadline falls within this advance are touched;
+        # unscheduled rows (created outside the ORM) are scheduled on the way
+        due_events = self.db.query(TensionEvent).filter(
+            TensionEvent.status == "active",
+            or_(
+                TensionEvent.due_at_watch <= new_clock,
+                TensionEvent.due_at_watch.is_(None),
+            )
+        ).order_by(TensionEvent.id).all()
         
-        return self.escalate_tension_events()
+        now = datetime.datetime.utcnow()
+        changed_events = []
+        log_rows = []
+        for event in due_events:
+            if event.due_at_watch is None:
+                event.due_at_watch = clock + event.watches_remaining
+            outcome = advance_event_clock(
+                event.severity_level, event.max_severity,
+                event.deadline_watches, event.due_at_watch - clock, watches
+            )
+            event.watches_remaining = outcome.watches_remaining
+            if not outcome.escalations and not outcome.failed:
+                # Only an unscheduled event that is not yet due gets here
+                event.due_at_watch = new_clock + outcome.watches_remaining
+                continue
+            event.severity_level = outcome.severity_level
+            event.due_at_watch = None if outcome.failed else new_clock + outcome.watches_remaining
+            changed_events.append(event)
+            
+            if outcome.failed:
+                event.status = "failed"
+                event.resolved_at = now
+                log_rows.append({
+                    "source": "Warden",
+                    "created_at": now,
+                    "content": f"**{event.title} - FAILED**\n\n{event.description}\n\nThe situation has spiraled out of control!",
+                    "metadata_dict": {"tension_event_id": event.id}
+                })
+            else:
+                log_rows.append({
+                    "source": "Warden",
+                    "created_at": now,
+                    "content": f"**{event.title} - ESCALATED**\n\nSeverity increased to {outcome.severity_level}. The situation grows more dire!",
+                    "metadata_dict": {"tension_event_id": event.id, "new_severity": outcome.severity_level}
+                })
+        
+        if log_rows:
+            self.db.execute(insert(LogEntry), log_rows)
+        # Failed events are dropped from the condition index by the flush listener
+        if commit:
+            self.db.commit()
+        else:
+            self.db.flush()
+        
+        return changed_events
+
+
+def _check_conditions(db: Session, triggers: List[Trigger]) -> None:
+    ConditionTracker(db).check_triggers(triggers)
+
+
+subscribe(CONDITION_TRIGGER_TYPES, _check_conditions)
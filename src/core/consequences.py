@@ -0,0 +1,137 @@
+"""
+This module applies the consequences of failed tension events: hostile
+entities scaled against the player, and the follow-up tension events a
+failure leaves behind. It is shared by the Warden's consequence tools and the
+world simulator, and none of its functions are offered to the LLM as tools.
+"""
+
+import json
+import random
+from sqlalchemy.orm import Session
+from database.models import GameEntity, Location, TensionEvent
+from . import encounters
+
+# The share of one-on-one fights a spawned hostile may win against the player
+SPAWN_MAX_DEATH_RATE = 0.15
+# ...and per severity level of the tension event whose failure spawned it
+CONSEQUENCE_DEATH_RATE_PER_SEVERITY = 0.05
+
+
+def _find_player(db: Session) -> GameEntity | None:
+    return (
+        db.query(GameEntity)
+        .filter_by(entity_type="Character", is_retired=False)
+        .first()
+    )
+
+
+def apply_default_consequence(
+    db: Session,
+    failed_event: TensionEvent,
+    location: Location | None,
+    rng: random.Random = random,
+) -> str | None:
+    """
+    Applies the severity-based consequence of a failed tension event without
+    committing: a hostile entity at the given location for severe events, a
+    follow-up tension event for moderate ones.
+
+    Returns:
+        A short description of the consequence, or None if nothing happened.
+    """
+    if failed_event.max_severity >= 4:
+        # High severity: spawn hostile entity
+        if location is None:
+            return None
+        entity = create_hostile_entity(
+            db,
+            entity_name=f"Consequence of {failed_event.title}",
+            entity_type="NPC",
+            location=location,
+            description=f"A hostile presence manifested by the failure of {failed_event.title}",
+            rng=rng,
+            max_death_rate=CONSEQUENCE_DEATH_RATE_PER_SEVERITY * failed_event.max_severity,
+        )
+        return f"A hostile {entity.name} has appeared at {location.name}!"
+    if failed_event.max_severity >= 2:
+        # Medium severity: create cascading event
+        new_event = create_cascading_event(
+            db,
+            title=f"Aftermath of {failed_event.title}",
+            description=f"The failure of {failed_event.title} has created new problems.",
+            source_event_id=failed_event.id,
+            severity_level=1,
+            deadline_watches=3
+        )
+        return f"A new crisis has emerged: {new_event.title}"
+    return None
+
+
+def create_hostile_entity(
+    db: Session,
+    entity_name: str,
+    entity_type: str,
+    location: Location,
+    description: str,
+    rng: random.Random = random,
+    max_death_rate: float = SPAWN_MAX_DEATH_RATE,
+) -> GameEntity:
+    """
+    Adds a hostile entity at a location, without committing. Its stats come
+    from the strongest threat tier that kills the player in at most
+    max_death_rate of simulated fights, or the standard tier with no player.
+    """
+    player = _find_player(db)
+    if player:
+        tier, stats = encounters.scale_threat(
+            encounters.StatBlock.from_entity(player), entity_name, max_death_rate, rng
+        )
+    else:
+        tier = encounters.THREAT_TIERS[1]
+        stats = encounters.roll_threat(tier, entity_name, rng)
+    new_entity = GameEntity(
+        name=entity_name,
+        entity_type=entity_type,
+        hp=stats.hp,
+        max_hp=stats.hp,
+        strength=stats.strength,
+        max_strength=stats.strength,
+        dexterity=rng.randint(8, 12),
+        max_dexterity=rng.randint(8, 12),
+        willpower=rng.randint(8, 12),
+        max_willpower=rng.randint(8, 12),
+        armor=stats.armor,
+        disposition="hostile",
+        is_hostile=True,
+        description=description,
+        current_location_id=location.id,
+        current_map_point_id=location.map_point_id,
+        attacks=[{"name": "Attack", "damage": tier.damage}]
+    )
+    db.add(new_entity)
+    return new_entity
+
+
+def create_cascading_event(
+    db: Session,
+    title: str,
+    description: str,
+    source_event_id: int,
+    severity_level: int,
+    deadline_watches: int,
+) -> TensionEvent:
+    """Adds a tension event caused by another event's failure, without committing."""
+    new_event = TensionEvent(
+        title=title,
+        description=description,
+        source_type="cascading_failure",
+        source_data=json.dumps({"source_event_id": source_event_id}),
+        severity_level=severity_level,
+        max_severity=5,
+        deadline_watches=deadline_watches,
+        watches_remaining=deadline_watches,
+        status="active"
+    )
+
+    db.add(new_event)
+    return new_event
@@ -0,0 +1,189 @@
+"""
+This module compiles dice strings once into reusable dice expressions.
+
+An expression is a sum of dice terms and fixed modifiers, e.g. '1d6+1d4',
+'2d20kh1' (keep the highest), '4d6kl3-1' (keep the lowest) or 'd8+2-1'.
+Cairn's impaired and enhanced attacks replace the damage dice with a d4 or a
+d12. Compiling is cached by the dice string, so rolling the same weapon many
+times never re-parses it, and roll_batch rolls many expressions, or many
+repetitions of them, in one vectorized numpy call.
+"""
+
+import re
+import random
+from collections import defaultdict
+from functools import lru_cache
+from typing import Any, Dict, NamedTuple, Sequence
+import numpy as np
+
+MAX_DICE = 1000
+IMPAIRED_DAMAGE = "1d4"
+ENHANCED_DAMAGE = "1d12"
+
+_TERM_PATTERN = re.compile(r"\s*(?:(\d*)d(\d+)(?:(kh|kl|k)(\d+))?|(\d+))")
+_OPERATOR_PATTERN = re.compile(r"\s*([+-])")
+
+_numpy_rng = np.random.default_rng()
+
+
+class DiceTerm(NamedTuple):
+    """
+    Some dice of one size. keep > 0 keeps that many of the highest dice,
+    keep < 0 that many of the lowest, and 0 keeps them all.
+    """
+
+    count: int
+    sides: int
+    keep: int = 0
+    sign: int = 1
+
+    def roll(self, rng: random.Random = random) -> tuple[list[int], list[int], list[int]]:
+        """Returns the dice rolled, the dice kept and the dice dropped."""
+        rolls = [rng.randint(1, self.sides) for _ in range(self.count)]
+        if not self.keep:
+            return rolls, rolls, []
+        ordered = sorted(rolls)
+        if self.keep > 0:
+            return rolls, ordered[-self.keep:], ordered[:-self.keep]
+        return rolls, ordered[:-self.keep], ordered[-self.keep:]
+
+
+class DiceExpression(NamedTuple):
+    """A compiled dice string. A fixed number has no terms."""
+
+    terms: tuple[DiceTerm, ...]
+    modifier: int
+
+    @property
+    def minimum(self) -> int:
+        return self.modifier + sum(
+            t.sign * (abs(t.keep) or t.count) * (1 if t.sign > 0 else t.sides)
+            for t in self.terms
+        )
+
+    @property
+    def maximum(self) -> int:
+        return self.modifier + sum(
+            t.sign * (abs(t.keep) or t.count) * (t.sides if t.sign > 0 else 1)
+            for t in self.terms
+        )
+
+    def roll(self, rng: random.Random = random) -> Dict[str, Any]:
+        """Rolls the expression, in the same shape as the roll_dice tool."""
+        if not self.terms:
+            return {
+                "total": self.modifier,
+                "rolls": [self.modifier],
+                "modifier": 0,
+                "final_result": self.modifier,
+            }
+        rolls, dropped = [], []
+        total = self.modifier
+        for term in self.terms:
+            term_rolls, kept, term_dropped = term.roll(rng)
+            rolls.extend(term_rolls)
+            dropped.extend(term_dropped)
+            total += term.sign * sum(kept)
+        result = {
+            "total": total,
+            "rolls": rolls,
+            "modifier": self.modifier,
+            "final_result": total,
+        }
+        if dropped:
+            result["dropped"] = dropped
+        return result
+
+    def roll_many(self, repetitions: int, rng: np.random.Generator | None = None) -> np.ndarray:
+        """Rolls the expression many times, returning the totals."""
+        return roll_batch([self], repetitions, rng)[0]
+
+
+def _parse(dice_string: str) -> DiceExpression | None:
+    terms: list[DiceTerm] = []
+    modifier = 0
+    position, sign = 0, 1
+    while True:
+        match = _TERM_PATTERN.match(dice_string, position)
+        if not match:
+            return None
+        count, sides, keep_kind, keep, number = match.groups()
+        if number is not None:
+            modifier += sign * int(number)
+        else:
+            count = int(count) if count else 1
+            sides = int(sides)
+            keep = int(keep) if keep else 0
+            if not 0 < count <= MAX_DICE or sides < 1 or keep > count:
+                return None
+            if keep_kind == "kl":
+                keep = -keep
+            elif keep_kind and not keep:
+                return None
+            terms.append(DiceTerm(count, sides, keep, sign))
+        position = match.end()
+
+        operator = _OPERATOR_PATTERN.match(dice_string, position)
+        if not operator:
+            break
+        sign = 1 if operator.group(1) == "+" else -1
+        position = operator.end()
+
+    # Anything left must be an annotation such as '1d8 (slashing)'
+    rest = dice_string[position:]
+    if rest and not rest[0].isspace() and not rest.startswith("("):
+        return None
+    return DiceExpression(tuple(terms), modifier)
+
+
+@lru_cache(maxsize=1024)
+def compile_dice(
+    dice_string: str, impaired: bool = False, enhanced: bool = False
+) -> DiceExpression | None:
+    """
+    Compiles a dice string: sums of dice and numbers ('1d6+1d4-1'), keep
+    highest or lowest ('2d20kh1', '4d6kl3'), or a fixed number.
+
+    An impaired attack rolls a d4 and an enhanced attack a d12 in place of the
+    expression; an attack that is both rolls its own dice.
+
+    Returns:
+        The compiled expression, or None if the string is not valid dice notation.
+    """
+    expression = _parse(dice_string.lower().strip())
+    if expression is None or impaired == enhanced:
+        return expression
+    return compile_dice(IMPAIRED_DAMAGE if impaired else ENHANCED_DAMAGE)
+
+
+def roll_batch(
+    expressions: Sequence[DiceExpression],
+    repetitions: int = 1,
+    rng: np.random.Generator | None = None,
+) -> np.ndarray:
+    """
+    Rolls several expressions, each some number of times, in one vectorized pass.
+
+    Terms with the same dice are drawn together across every expression, so a
+    combat round or a simulation pays for one numpy call per kind of die.
+
+    Returns:
+        An integer array of totals shaped (len(expressions), repetitions).
+    """
+    rng = rng or _numpy_rng
+    modifiers = np.array([e.modifier for e in expressions], dtype=np.int64)
+    totals = np.tile(modifiers.reshape(-1, 1), (1, repetitions))
+    uses: Dict[tuple, list[tuple[int, int]]] = defaultdict(list)
+    for row, expression in enumerate(expressions):
+        for term in expression.terms:
+            uses[(term.count, term.sides, term.keep)].append((row, term.sign))
+
+    for (count, sides, keep), term_uses in uses.items():
+        dice = rng.integers(1, sides + 1, size=(len(term_uses), repetitions, count))
+        if keep:
+            dice = np.sort(dice, axis=2)
+            dice = dice[:, :, count - keep:] if keep > 0 else dice[:, :, :-keep]
+        rows = np.array([row for row, _ in term_uses])
+        signs = np.array([sign for _, sign in term_uses]).reshape(-1, 1)
+        np.add.at(totals, rows, dice.sum(axis=2) * signs)
+    return totals
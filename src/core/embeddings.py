@@ -0,0 +1,156 @@
+"""
+This module provides the embedding backends used by the RAG system.
+
+The remote backend uses Google's embedding API. The local backend hashes word
+features into a fixed-size vector on the CPU, so the adventure log can be
+indexed offline and without any model download.
+"""
+
+import os
+import re
+import math
+import hashlib
+from collections import OrderedDict
+from functools import lru_cache
+from langchain_core.embeddings import Embeddings
+
+DEFAULT_DIMENSIONS = 512
+DEFAULT_BATCH_SIZE = 64
+DEFAULT_CACHE_SIZE = 10_000
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9']+")
+
+
+@lru_cache(maxsize=65_536)
+def _hash_feature(feature: str, dimensions: int) -> tuple[int, float]:
+    """Maps a feature to a bucket and a sign, stable across processes."""
+    digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+    value = int.from_bytes(digest, "little")
+    return value % dimensions, 1.0 if (value >> 63) & 1 else -1.0
+
+
+class HashingEmbeddings(Embeddings):
+    """Local embeddings built from signed feature hashing of words and word pairs."""
+
+    def __init__(self, dimensions: int = DEFAULT_DIMENSIONS):
+        self.dimensions = dimensions
+        self.backend_name = f"local-hashing-{dimensions}"
+
+    def _features(self, text: str) -> list[str]:
+        tokens = _TOKEN_PATTERN.findall(text.lower())
+        bigrams = [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        return tokens + bigrams
+
+    def _embed(self, text: str) -> list[float]:
+        counts: dict[str, int] = {}
+        for feature in self._features(text):
+            counts[feature] = counts.get(feature, 0) + 1
+
+        vector = [0.0] * self.dimensions
+        for feature, count in counts.items():
+            bucket, sign = _hash_feature(feature, self.dimensions)
+            # Sublinear term frequency keeps repeated words from dominating
+            vector[bucket] += sign * (1.0 + math.log(count))
+
+        norm = math.sqrt(sum(v * v for v in vector))
+        if norm:
+            vector = [v / norm for v in vector]
+        return vector
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self._embed(text)
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Wraps an embedding backend, sending uncached texts in batches and caching
+    the resulting vectors by content hash.
+    """
+
+    def __init__(
+        self,
+        backend: Embeddings,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_entries: int = DEFAULT_CACHE_SIZE,
+        name: str | None = None,
+    ):
+        self.backend = backend
+        self.batch_size = batch_size
+        self.max_entries = max_entries
+        self.backend_name = name or backend_name(backend)
+        self._cache: OrderedDict[str, list[float]] = OrderedDict()
+
+    @staticmethod
+    def _key(kind: str, text: str) -> str:
+        # Documents and queries are kept apart because remote backends embed
+        # them with different task types.
+        return f"{kind}:{hashlib.sha256(text.encode('utf-8')).hexdigest()}"
+
+    def _remember(self, key: str, vector: list[float]) -> None:
+        self._cache[key] = vector
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        keys = [self._key("doc", text) for text in texts]
+        missing: dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in self._cache and key not in missing:
+                missing[key] = text
+
+        pending = list(missing.items())
+        for start in range(0, len(pending), self.batch_size):
+            batch = pending[start : start + self.batch_size]
+            vectors = self.backend.embed_documents([text for _, text in batch])
+            for (key, _), vector in zip(batch, vectors):
+                self._remember(key, vector)
+
+        return [self._cache[key] for key in keys]
+
+    def embed_query(self, text: str) -> list[float]:
+        key = self._key("query", text)
+        if key not in self._cache:
+            self._remember(key, self.backend.embed_query(text))
+        return self._cache[key]
+
+
+def backend_name(embeddings: Embeddings) -> str:
+    """Returns a name identifying the vector space an embedding backend produces."""
+    return getattr(embeddings, "backend_name", type(embeddings).__name__)
+
+
+def create_embeddings(backend: str | None = None) -> Embeddings:
+    """
+    Creates the configured embedding backend, wrapped in a content-hash cache.
+
+    Args:
+        backend: "google" or "local". Defaults to the SCAW_EMBEDDINGS environment
+            variable, then to "google" when GOOGLE_API_KEY is set and "local" otherwise.
+
+    Returns:
+        An embeddings object usable by the vector store.
+    """
+    backend = backend or os.getenv("SCAW_EMBEDDINGS")
+    if not backend:
+        backend = "google" if os.getenv("GOOGLE_API_KEY") else "local"
+
+    if backend == "local":
+        return CachedEmbeddings(HashingEmbeddings())
+    if backend == "google":
+        # Imported lazily so the local backend works without the Google client
+        from langchain_google_genai import GoogleGenerativeAIEmbeddings
+
+        api_key = os.getenv("GOOGLE_API_KEY")
+        if not api_key:
+            raise ValueError("GOOGLE_API_KEY environment variable not set.")
+        google_embeddings = GoogleGenerativeAIEmbeddings(
+            model="models/embedding-001",
+            google_api_key=api_key,
+            transport="rest",
+        )
+        return CachedEmbeddings(google_embeddings, name="google-embedding-001")
+    raise ValueError(f"Unknown embedding backend '{backend}'.")
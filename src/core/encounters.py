@@ -0,0 +1,192 @@
+"""
+This module estimates how deadly an encounter is before it reaches the player.
+
+It plays many fights at once under the same rules as deal_damage and
+resolve_combat_round: Armor is subtracted from each hit, damage comes off HP
+and overflows into Strength, dropping to exactly 0 HP leaves a Scar, and
+Strength at 0 or below is death. Every fight is a row of numpy arrays, so a
+hundred thousand fights cost a few vectorized operations per round and per
+combatant rather than a Python loop per attack.
+
+Each round the hero strikes the first enemy still standing, then every living
+enemy strikes the hero in turn, as a combat round does in play.
+"""
+
+import random
+from typing import Dict, List, NamedTuple, Sequence
+import numpy as np
+from database.models import GameEntity
+from .combat import armor_of, attack_profile_for
+from .dice import DiceExpression, compile_dice, roll_batch
+
+DEFAULT_FIGHTS = 100_000
+MAX_ROUNDS = 50
+
+
+class StatBlock(NamedTuple):
+    """What a combatant brings to a fight."""
+
+    name: str
+    hp: int
+    strength: int
+    armor: int
+    damage: DiceExpression
+
+    @classmethod
+    def from_entity(cls, entity: GameEntity) -> "StatBlock":
+        return cls(
+            entity.name,
+            entity.hp or 0,
+            entity.strength or 0,
+            armor_of(entity),
+            attack_profile_for(entity).primary.damage,
+        )
+
+
+class EncounterReport(NamedTuple):
+    fights: int
+    win_rate: float
+    death_rate: float
+    stalemate_rate: float
+    expected_rounds: float
+    # Number of Scars the hero took -> share of fights
+    scar_distribution: Dict[int, float]
+    # Number of enemies slain -> share of fights
+    enemy_deaths: Dict[int, float]
+
+
+def _hit(hp: np.ndarray, strength: np.ndarray, scars: np.ndarray,
+         damage: np.ndarray, armor: np.ndarray | int, landed: np.ndarray) -> None:
+    """Applies one attack to every fight where it landed, in place."""
+    damage = np.where(landed, np.maximum(damage - armor, 0), 0)
+    scars += landed & (hp > 0) & (hp == damage)
+    hp_loss = np.minimum(hp, damage)
+    strength -= damage - hp_loss
+    hp -= hp_loss
+
+
+def simulate_encounter(
+    hero: StatBlock,
+    enemies: Sequence[StatBlock],
+    fights: int = DEFAULT_FIGHTS,
+    rng: np.random.Generator | None = None,
+    max_rounds: int = MAX_ROUNDS,
+) -> EncounterReport:
+    """
+    Fights the same encounter many times.
+
+    Args:
+        hero: The combatant whose survival is measured, usually the player.
+        enemies: The hostile combatants, in the order they attack.
+        fights: How many fights to simulate.
+        rng: The numpy generator to roll with.
+        max_rounds: Fights still undecided after this many rounds are stalemates.
+
+    Returns:
+        The share of fights won, lost and undecided, how many rounds they
+        lasted and how many Scars and kills they left behind.
+    """
+    rng = rng or np.random.default_rng()
+    count = len(enemies)
+    hero_hp = np.full(fights, hero.hp, dtype=np.int64)
+    hero_strength = np.full(fights, hero.strength, dtype=np.int64)
+    hero_scars = np.zeros(fights, dtype=np.int64)
+    enemy_hp = np.tile(np.array([e.hp for e in enemies], dtype=np.int64), (fights, 1))
+    enemy_strength = np.tile(np.array([e.strength for e in enemies], dtype=np.int64), (fights, 1))
+    enemy_scars = np.zeros((fights, count), dtype=np.int64)
+    enemy_armor = np.array([e.armor for e in enemies], dtype=np.int64)
+    rounds = np.zeros(fights, dtype=np.int64)
+    rows = np.arange(fights)
+
+    ongoing = (hero_strength > 0) & (enemy_strength > 0).any(axis=1)
+    for _ in range(max_rounds):
+        if not ongoing.any():
+            break
+        rounds += ongoing
+        # Every die of the round is rolled in one batch: the hero's, then each enemy's
+        damage = roll_batch([hero.damage, *(e.damage for e in enemies)], fights, rng)
+
+        target = np.argmax(enemy_strength > 0, axis=1)
+        target_hp, target_strength = enemy_hp[rows, target], enemy_strength[rows, target]
+        target_scars = enemy_scars[rows, target]
+        _hit(target_hp, target_strength, target_scars, damage[0], enemy_armor[target], ongoing)
+        enemy_hp[rows, target], enemy_strength[rows, target] = target_hp, target_strength
+        enemy_scars[rows, target] = target_scars
+
+        for i in range(count):
+            landed = ongoing & (enemy_strength[:, i] > 0) & (hero_strength > 0)
+            _hit(hero_hp, hero_strength, hero_scars, damage[i + 1], hero.armor, landed)
+
+        ongoing = (hero_strength > 0) & (enemy_strength > 0).any(axis=1)
+
+    died = hero_strength <= 0
+    won = ~died & ~(enemy_strength > 0).any(axis=1)
+    kills = (enemy_strength <= 0).sum(axis=1)
+    return EncounterReport(
+        fights=fights,
+        win_rate=float(won.mean()),
+        death_rate=float(died.mean()),
+        stalemate_rate=float((~won & ~died).mean()),
+        expected_rounds=float(rounds.mean()),
+        scar_distribution=_distribution(hero_scars),
+        enemy_deaths=_distribution(kills),
+    )
+
+
+def _distribution(values: np.ndarray) -> Dict[int, float]:
+    counts = np.bincount(values)
+    return {k: float(c) / len(values) for k, c in enumerate(counts) if c}
+
+
+class ThreatTier(NamedTuple):
+    name: str
+    hp: tuple[int, int]
+    strength: tuple[int, int]
+    armor: int
+    damage: str
+
+
+# From a nuisance to something that should make a seasoned hero run
+THREAT_TIERS: List[ThreatTier] = [
+    ThreatTier("lesser", (2, 4), (6, 9), 0, "1d4"),
+    ThreatTier("standard", (3, 8), (8, 12), 0, "1d6"),
+    ThreatTier("veteran", (6, 10), (10, 14), 1, "1d8"),
+    ThreatTier("elite", (9, 14), (12, 16), 2, "1d10"),
+    ThreatTier("dire", (14, 20), (14, 18), 3, "1d12"),
+]
+
+
+def roll_threat(tier: ThreatTier, name: str, rng: random.Random = random) -> StatBlock:
+    """Rolls a stat block from a threat tier."""
+    return StatBlock(
+        name,
+        rng.randint(*tier.hp),
+        rng.randint(*tier.strength),
+        tier.armor,
+        compile_dice(tier.damage),
+    )
+
+
+def scale_threat(
+    hero: StatBlock,
+    name: str,
+    max_death_rate: float,
+    rng: random.Random = random,
+    fights: int = 2000,
+) -> tuple[ThreatTier, StatBlock]:
+    """
+    Picks the strongest threat tier that kills the hero in at most the given
+    share of one-on-one fights, falling back to the weakest tier.
+
+    Returns:
+        The tier and the stat block rolled from it.
+    """
+    numpy_rng = getattr(rng, "numpy", None) or np.random.default_rng(rng.getrandbits(64))
+    chosen = THREAT_TIERS[0], roll_threat(THREAT_TIERS[0], name, rng)
+    for tier in THREAT_TIERS[1:]:
+        candidate = roll_threat(tier, name, rng)
+        report = simulate_encounter(hero, [candidate], fights, numpy_rng)
+        if report.death_rate > max_death_rate:
+            break
+        chosen = tier, candidate
+    return chosen
@@ -0,0 +1,154 @@
+"""
+This module provides a background worker that embeds newly committed log
+entries into the adventure's vector index, off the request path.
+"""
+
+import time
+import queue
+import threading
+from collections import deque
+from typing import NamedTuple
+from database.models import LogEntry
+
+DEFAULT_BATCH_SIZE = 32
+DEFAULT_FLUSH_INTERVAL = 0.25
+# A failing batch is tried this many times, waiting a little longer each time
+MAX_ATTEMPTS = 3
+DEFAULT_RETRY_DELAY = 0.5
+LAG_SAMPLE_SIZE = 200
+
+
+class PendingEntry(NamedTuple):
+    """A detached copy of a committed log entry waiting to be indexed."""
+
+    id: int
+    content: str
+    source: str
+    committed_at: float
+
+
+class IndexingWorker:
+    """Takes committed log entries from a queue and upserts them in batches."""
+
+    def __init__(
+        self,
+        rag_service,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        retry_delay: float = DEFAULT_RETRY_DELAY,
+    ):
+        self.rag_service = rag_service
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retry_delay = retry_delay
+        self.queue: queue.Queue[PendingEntry | None] = queue.Queue()
+        self.indexed_count = 0
+        self.failed_count = 0
+        self._lag_samples: deque[float] = deque(maxlen=LAG_SAMPLE_SIZE)
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> "IndexingWorker":
+        """Starts the worker thread if it is not already running."""
+        if not self._thread or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name="scaw-indexing-worker", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Indexes whatever is still queued, then stops the worker thread."""
+        if self._thread and self._thread.is_alive():
+            self.queue.put(None)
+            self._thread.join(timeout)
+        self._thread = None
+
+    def submit(self, log_entries: list[LogEntry]) -> None:
+        """
+        Queues committed log entries for indexing.
+
+        The entries are copied, so the caller's session can be closed or reused
+        while the worker embeds them.
+        """
+        committed_at = time.time()
+        for entry in log_entries:
+            self.queue.put(
+                PendingEntry(entry.id, entry.content, entry.source, committed_at)
+            )
+
+    def wait_until_idle(self) -> None:
+        """Blocks until every submitted entry has been processed."""
+        self.queue.join()
+
+    def _next_batch(self) -> tuple[list[PendingEntry], bool]:
+        """Waits for one entry, then drains up to a batch without blocking."""
+        batch: list[PendingEntry] = []
+        item = self.queue.get()
+        if item is None:
+            return batch, True
+        batch.append(item)
+
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self.queue.get(timeout=max(0.0, remaining))
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch, stopping = self._next_batch()
+            if batch:
+                self._index_batch(batch)
+            for _ in range(len(batch) + (1 if stopping else 0)):
+                self.queue.task_done()
+
+    def _index_batch(self, batch: list[PendingEntry]) -> None:
+        entry_ids = [entry.id for entry in batch]
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            try:
+                self.rag_service.index_entries(batch)
+                break
+            except Exception as e:
+                print(f"Error indexing log entries {entry_ids} (attempt {attempt} of {MAX_ATTEMPTS}): {e}")
+                if attempt < MAX_ATTEMPTS:
+                    time.sleep(self.retry_delay * attempt)
+                    continue
+                # The high-water mark is held below the entries, so the next
+                # load_adventure_log picks them up again
+                self.failed_count += len(batch)
+                try:
+                    self.rag_service.mark_unindexed(entry_ids)
+                except Exception as e:
+                    print(f"Error holding back the index's high-water mark: {e}")
+                return
+
+        searchable_at = time.time()
+        self.indexed_count += len(batch)
+        self._lag_samples.extend(
+            searchable_at - entry.committed_at for entry in batch
+        )
+
+    def freshness(self) -> dict:
+        """
+        Reports how far the index trails the adventure log.
+
+        Returns:
+            The queue depth and the commit-to-searchable lag in seconds over
+            the most recent indexed entries.
+        """
+        samples = list(self._lag_samples)
+        return {
+            "pending": self.queue.qsize(),
+            "indexed": self.indexed_count,
+            "failed": self.failed_count,
+            "last_lag_seconds": samples[-1] if samples else None,
+            "mean_lag_seconds": sum(samples) / len(samples) if samples else None,
+            "max_lag_seconds": max(samples) if samples else None,
+        }
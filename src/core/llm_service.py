@@ -4,6 +4,11 @@ import concurrent.futures
 from typing import Any, Callable, Dict
 import google.generativeai as genai
 
+# How much of the narrative prompt recalled memories may take up
+MEMORY_TOKEN_ALLOWANCE = 300
+# Rough size of a token in English text, good enough for budgeting prompts
+CHARS_PER_TOKEN = 4
+
 # The foundational prompt that defines the AI Warden's persona and rules.
 SYSTEM_PROMPT = """
 You are the AI Warden, a game master for a solo player in the dark fantasy tabletop RPG, Cairn. Your role is to be a neutral arbiter of the rules and a vivid narrator of the world.
@@ -49,6 +54,25 @@ Examples:
 """
 
 
+def fit_memories(
+    memories: list[str], token_allowance: int = MEMORY_TOKEN_ALLOWANCE
+) -> list[str]:
+    """
+    Keeps recalled memories, best first, until the token allowance is spent.
+    The memory that crosses the allowance is cut short and the rest are dropped.
+    """
+    budget = token_allowance * CHARS_PER_TOKEN
+    fitted = []
+    for memory in memories:
+        if budget <= 0:
+            break
+        if len(memory) > budget:
+            memory = memory[: max(0, budget - 3)].rstrip() + "..."
+        fitted.append(memory)
+        budget -= len(memory)
+    return fitted
+
+
 class LLMService:
     """Service for interacting with a Large Language Model, including tool use."""
 
@@ -108,10 +132,16 @@ class LLMService:
             return None
 
     def synthesize_narrative(
-        self, user_input: str, tool_name: str, tool_result: Dict[str, Any], db=None
+        self,
+        user_input: str,
+        tool_name: str,
+        tool_result: Dict[str, Any],
+        db=None,
+        memories: list[str] | None = None,
     ) -> str:
         """
         Generates a narrative description based on the outcome of a tool, including recent conversation history for context.
+        Recalled memories from earlier in the adventure are included within MEMORY_TOKEN_ALLOWANCE.
         """
         # Get recent conversation history for context
         conversation_context = ""
@@ -141,8 +171,18 @@ class LLMService:
                 print(f"Error retrieving conversation history: {e}")
                 conversation_context = ""
 
+        memory_context = ""
+        fitted_memories = fit_memories(memories or [])
+        if fitted_memories:
+            memory_lines = "\n".join(f"- {memory}" for memory in fitted_memories)
+            memory_context = f"""
+**RELEVANT MEMORIES:**
+{memory_lines}
+
+"""
+
         prompt = f"""
-        {conversation_context}**CURRENT ACTION:**
+        {conversation_context}{memory_context}**CURRENT ACTION:**
         The player performed an action: "{user_input}"
         This resulted in the following game event: 
         - Tool Used: {tool_name}
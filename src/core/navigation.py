@@ -0,0 +1,171 @@
+"""
+This module finds the way between the Locations inside a MapPoint.
+
+A per-session NavigationIndex holds one small LocationMap per MapPoint, built
+from its Locations and the LocationConnections between them on first use, so
+resolving a location name or a route only looks at the POI the character is
+in. A two-way connection can be taken in both directions, a one-way one only
+from its source. A POI whose locations have no connections at all is open
+ground, where every location can be reached from every other. Flushed changes
+to a Location or LocationConnection drop the affected POI's map; bulk
+statements and rollbacks drop them all.
+"""
+
+from collections import deque
+from typing import Dict, List
+from sqlalchemy.orm import Session
+from database.models import Location, LocationConnection
+from .session_cache import SessionCache
+
+# Where a session keeps its navigation index
+NAVIGATION_INDEX_KEY = "navigation_index"
+
+
+class LocationMap:
+    """The locations of one MapPoint and the exits between them."""
+
+    def __init__(self, map_point_id: int):
+        self.map_point_id = map_point_id
+        # Location id -> name, in id order
+        self.names: Dict[int, str] = {}
+        # Lowercased name -> the first location id bearing it
+        self._by_name: Dict[str, int] = {}
+        # Location id -> ids reachable in one step
+        self.exits: Dict[int, List[int]] = {}
+        self.open = True
+
+    @classmethod
+    def build(cls, db: Session, map_point_id: int) -> "LocationMap":
+        location_map = cls(map_point_id)
+        for location_id, name in (
+            db.query(Location.id, Location.name)
+            .filter(Location.map_point_id == map_point_id)
+            .order_by(Location.id)
+        ):
+            location_map.names[location_id] = name
+            location_map._by_name.setdefault(name.lower(), location_id)
+            location_map.exits[location_id] = []
+        if not location_map.names:
+            return location_map
+        connections = (
+            db.query(
+                LocationConnection.source_location_id,
+                LocationConnection.destination_location_id,
+                LocationConnection.is_two_way,
+            )
+            .filter(LocationConnection.source_location_id.in_(location_map.names))
+            .order_by(LocationConnection.id)
+            .all()
+        )
+        for source, destination, is_two_way in connections:
+            # Connections leading out of the POI are not part of its map
+            if destination not in location_map.names:
+                continue
+            location_map.open = False
+            location_map._connect(source, destination)
+            if is_two_way or is_two_way is None:
+                location_map._connect(destination, source)
+        return location_map
+
+    def _connect(self, source: int, destination: int) -> None:
+        if destination not in self.exits[source]:
+            self.exits[source].append(destination)
+
+    def find(self, name: str) -> int | None:
+        """Returns the id of the location with this name, case-insensitively."""
+        return self._by_name.get(name.lower())
+
+    def neighbours(self, location_id: int) -> List[int]:
+        """The ids of the locations one step away."""
+        if self.open:
+            return [other for other in self.names if other != location_id]
+        return self.exits.get(location_id, [])
+
+    def route(self, start: int, end: int) -> List[int] | None:
+        """
+        Returns the ids of the locations entered on the shortest way from one
+        location to another, ending with the destination, or None if it
+        cannot be reached.
+        """
+        if start == end:
+            return []
+        came_from = {start: None}
+        frontier = deque([start])
+        while frontier:
+            current = frontier.popleft()
+            for neighbour in self.neighbours(current):
+                if neighbour in came_from:
+                    continue
+                came_from[neighbour] = current
+                if neighbour == end:
+                    steps = [end]
+                    while came_from[steps[-1]] != start:
+                        steps.append(came_from[steps[-1]])
+                    return steps[::-1]
+                frontier.append(neighbour)
+        return None
+
+
+class NavigationIndex:
+    """LocationMaps by MapPoint, built as characters move through them."""
+
+    def __init__(self):
+        self.maps: Dict[int, LocationMap] = {}
+        # Location id -> the MapPoint whose map holds it
+        self._map_point_of: Dict[int, int] = {}
+
+    def location_map(self, db: Session, map_point_id: int) -> LocationMap:
+        location_map = self.maps.get(map_point_id)
+        if location_map is None:
+            location_map = LocationMap.build(db, map_point_id)
+            self.maps[map_point_id] = location_map
+            for location_id in location_map.names:
+                self._map_point_of[location_id] = map_point_id
+        return location_map
+
+    def drop_map_point(self, map_point_id: int | None) -> None:
+        location_map = self.maps.pop(map_point_id, None)
+        if location_map is not None:
+            for location_id in location_map.names:
+                self._map_point_of.pop(location_id, None)
+
+    def drop_location(self, location_id: int | None) -> None:
+        """Drops the map holding a location, if one was built."""
+        self.drop_map_point(self._map_point_of.get(location_id))
+
+    def __len__(self) -> int:
+        return len(self.maps)
+
+
+def _track_location_changes(session: Session, index: NavigationIndex) -> None:
+    """Drops the maps of the POIs whose locations or connections were flushed."""
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Location):
+            # Characters and items coming and going change nothing on the map
+            if obj in session.dirty and not session.is_modified(obj, include_collections=False):
+                continue
+            index.drop_location(obj.id)
+            index.drop_map_point(obj.map_point_id)
+        elif isinstance(obj, LocationConnection):
+            index.drop_location(obj.source_location_id)
+            index.drop_location(obj.destination_location_id)
+
+
+_navigation_indexes = SessionCache(
+    NAVIGATION_INDEX_KEY,
+    lambda db: NavigationIndex(),
+    (Location, LocationConnection),
+    on_flush=_track_location_changes,
+)
+
+
+def navigation_index(db: Session) -> NavigationIndex:
+    """Returns this session's navigation index, creating it on first use."""
+    return _navigation_indexes.get(db)
+
+
+def location_map(db: Session, map_point_id: int) -> LocationMap:
+    """Returns the navigation map of one MapPoint's locations."""
+    # Flush pending changes first, so the map reflects them
+    db.flush()
+    return navigation_index(db).location_map(db, map_point_id)
@@ -0,0 +1,148 @@
+"""
+This module compiles oracle tables into array-backed samplers.
+
+An oracle table maps the faces of a die to results, and several faces often
+share a result (TERRAIN_DIE_DROP and POI_DIE_DROP are d6 "die drops" weighted
+towards some outcomes). Compiling a table keeps each distinct result once,
+with the alias method over their weights, so one roll costs a uniform
+draw and a coin flip whatever the table's shape, and K rolls are two
+vectorized numpy draws and an array lookup. Tables are compiled once and
+registered by name; custom tables can be registered from JSON data files.
+"""
+
+import json
+import random
+from typing import Any, Dict, List, Sequence
+import numpy as np
+
+
+class OracleTable:
+    """A compiled oracle table: distinct results with alias-method weights."""
+
+    def __init__(self, name: str, results: Sequence[Any], weights: Sequence[float]):
+        if not results or len(results) != len(weights) or min(weights) <= 0:
+            raise ValueError(f"Oracle table '{name}' needs results with positive weights.")
+        self.name = name
+        self.results = tuple(results)
+        self._values = np.empty(len(results), dtype=object)
+        for i, result in enumerate(self.results):
+            self._values[i] = result  # Element by element, so tuples stay whole
+        self.probability, self.alias = _alias_table(np.asarray(weights, dtype=float))
+        self.uniform = bool(np.all(self.probability >= 1.0))
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def roll(self, rng: random.Random = random) -> Any:
+        """Draws one result."""
+        column = rng.randrange(len(self.results))
+        if self.uniform or rng.random() < self.probability[column]:
+            return self.results[column]
+        return self.results[self.alias[column]]
+
+    def sample_indices(self, k: int, rng: np.random.Generator | None = None) -> np.ndarray:
+        """
+        Draws K results at once, as indices into results. Without a generator,
+        one is seeded from the random module, so random.seed() still applies.
+        """
+        rng = rng or np.random.default_rng(random.getrandbits(64))
+        columns = rng.integers(0, len(self.results), size=k)
+        if self.uniform:
+            return columns
+        keep = rng.random(k) < self.probability[columns]
+        return np.where(keep, columns, self.alias[columns])
+
+    def sample(self, k: int, rng: np.random.Generator | None = None) -> List[Any]:
+        """Draws K results at once."""
+        return self._values[self.sample_indices(k, rng)].tolist()
+
+
+def _alias_table(weights: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Builds Vose's alias table for the given weights."""
+    n = len(weights)
+    scaled = weights * n / weights.sum()
+    probability = np.ones(n)
+    alias = np.arange(n)
+    small = [i for i in range(n) if scaled[i] < 1.0]
+    large = [i for i in range(n) if scaled[i] >= 1.0]
+    while small and large:
+        less, more = small.pop(), large.pop()
+        probability[less] = scaled[less]
+        alias[less] = more
+        scaled[more] -= 1.0 - scaled[less]
+        (small if scaled[more] < 1.0 else large).append(more)
+    # Whatever is left over is 1.0 up to rounding error
+    return probability, alias
+
+
+def compile_table(name: str, table: Dict[int, Any] | Sequence[Any]) -> OracleTable:
+    """
+    Compiles a die table ({face: result}) or a list of equally likely results.
+    Faces that share a result are merged into one weighted entry, and faces
+    missing between 1 and the highest face roll None, as table.get would.
+    """
+    if not isinstance(table, dict):
+        table = dict(enumerate(table, start=1))
+    faces = [int(face) for face in table]
+    if not faces or min(faces) < 1:
+        raise ValueError(f"Oracle table '{name}' must number its faces from 1.")
+    results: List[Any] = []
+    weights: List[float] = []
+    for face in range(1, max(faces) + 1):
+        result = table.get(face, table.get(str(face)))
+        for i, known in enumerate(results):
+            if known == result:
+                weights[i] += 1
+                break
+        else:
+            results.append(result)
+            weights.append(1)
+    return OracleTable(name, results, weights)
+
+
+_tables: Dict[str, OracleTable] = {}
+# Raw tables by identity, so the table objects themselves can be rolled on
+_compiled_by_id: Dict[int, tuple[Any, OracleTable]] = {}
+
+
+def register_table(name: str, table: Dict[int, Any] | Sequence[Any] | OracleTable) -> OracleTable:
+    """Compiles a table, if needed, and registers it under a name."""
+    result = table if isinstance(table, OracleTable) else compile_table(name, table)
+    _tables[name] = result
+    if not isinstance(table, OracleTable):
+        _compiled_by_id[id(table)] = (table, result)
+    return result
+
+
+def get_table(name: str) -> OracleTable:
+    """Returns a registered table, raising KeyError if there is none by that name."""
+    return _tables[name]
+
+
+def compiled(table: Dict[int, Any] | Sequence[Any] | OracleTable | str) -> OracleTable:
+    """Returns the compiled form of a table, its name or an unregistered table."""
+    if isinstance(table, OracleTable):
+        return table
+    if isinstance(table, str):
+        return get_table(table)
+    registered = _compiled_by_id.get(id(table))
+    if registered is None or registered[0] is not table:
+        return compile_table("custom", table)
+    return registered[1]
+
+
+def load_tables(path: str) -> List[str]:
+    """
+    Registers the tables in a JSON data file, which maps table names to either
+    a {"face": result} object or a list of equally likely results.
+
+    Returns:
+        The names of the tables registered.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError(f"{path} must map table names to tables.")
+    for name, table in data.items():
+        register_table(name, table)
+    return list(data)
@@ -4,7 +4,9 @@ These tables are used by the Warden to generate procedural content during the ga
 """
 
 import random
-from typing import Dict, Any
+from typing import Dict, Any, List
+import numpy as np
+from .oracle_tables import OracleTable, compiled, register_table
 
 # --- Oracle Tables (Data from Warden's Guide) ---
 
@@ -913,38 +915,68 @@ BACKGROUNDS = {
 # --- Oracle Roller Class ---
 
 
+# This is a placeholder for a more complex wilderness event table.
+WILDERNESS_EVENTS = [
+    "You find a hidden stash of supplies.",
+    "A group of travelers passes by.",
+    "The weather takes a sudden turn for the worse.",
+    "You discover the tracks of a large, unknown creature.",
+    "A strange, magical phenomenon occurs.",
+    "You encounter a friendly animal.",
+]
+
+# Every table above is compiled once, at import, and registered by its name
+for _name, _table in list(globals().items()):
+    if _name.isupper() and isinstance(_table, (dict, list)):
+        register_table(_name, _table)
+
+
 class OracleRoller:
     """A class to handle rolling on various oracle tables."""
 
+    def __init__(self, rng: random.Random = random):
+        self.rng = rng
+        # Adventure streams carry a numpy generator for bulk sampling
+        self._numpy_rng = getattr(rng, "numpy", None)
+
+    @property
+    def numpy_rng(self) -> np.random.Generator:
+        """The generator for bulk sampling, seeded from rng when it has none of its own."""
+        if self._numpy_rng is None:
+            self._numpy_rng = np.random.default_rng(self.rng.getrandbits(64))
+        return self._numpy_rng
+
     def _d20(self) -> int:
-        return random.randint(1, 20)
+        return self.rng.randint(1, 20)
 
     def _d6(self) -> int:
-        return random.randint(1, 6)
+        return self.rng.randint(1, 6)
 
-    def roll_on_table(self, table: Dict[int, Any]) -> Any:
+    def roll_on_table(self, table: Dict[int, Any] | OracleTable | str) -> Any:
         """
-        Rolls a d20 and returns the corresponding result from the given table.
+        Rolls on the given table and returns the corresponding result.
 
         Args:
-            table: The oracle table to roll on.
+            table: The oracle table to roll on, compiled or not, or its registered name.
 
         Returns:
             The result from the table.
         """
-        roll = self._d20()
-        return table.get(roll)
+        return compiled(table).roll(self.rng)
+
+    def sample(self, table: Dict[int, Any] | OracleTable | str, k: int) -> List[Any]:
+        """
+        Rolls on the given table K times at once.
+
+        Args:
+            table: The oracle table to roll on, compiled or not, or its registered name.
+            k: The number of rolls.
+
+        Returns:
+            The K results, in order.
+        """
+        return compiled(table).sample(k, self.numpy_rng)
 
     def roll_wilderness_event(self) -> str:
         """Rolls for a random wilderness event."""
-        # This is a placeholder for a more complex wilderness event table.
-        # For now, we'll just use a simple list of events.
-        events = [
-            "You find a hidden stash of supplies.",
-            "A group of travelers passes by.",
-            "The weather takes a sudden turn for the worse.",
-            "You discover the tracks of a large, unknown creature.",
-            "A strange, magical phenomenon occurs.",
-            "You encounter a friendly animal.",
-        ]
-        return random.choice(events)
+        return self.roll_on_table(WILDERNESS_EVENTS)
@@ -1,16 +1,44 @@
+import time
 import inspect
-import random
+import concurrent.futures
 from sqlalchemy.orm import Session
 from core.llm_service import LLMService
 from database.models import LogEntry, GameEntity, Item
-from core import world_tools, world_manager
+from core import world_tools, world_manager, relationships, combat, rng, trigger_bus
+
+# Retrieval runs alongside tool selection and is dropped if it overruns this
+RETRIEVAL_BUDGET_SECONDS = 1.5
+RETRIEVAL_TOP_K = 3
 
 
 class WardenOrchestrator:
     """Orchestrates the AI Warden's response to player input."""
 
-    def __init__(self, llm_service: LLMService, db: Session):
+    def __init__(
+        self,
+        llm_service: LLMService,
+        db: Session,
+        indexing_worker=None,
+        rag_service=None,
+        retrieval_budget: float = RETRIEVAL_BUDGET_SECONDS,
+    ):
         self.llm_service = llm_service
+        # Optional IndexingWorker that embeds each turn's log entries
+        self.indexing_worker = indexing_worker
+        # Optional RAGService that recalls past log entries for the narrative
+        self.rag_service = rag_service
+        self.retrieval_budget = retrieval_budget
+        # One worker, since searches share the RAG service's database session
+        self._retrieval_executor = (
+            concurrent.futures.ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="scaw-retrieval"
+            )
+            if rag_service
+            else None
+        )
+        # The last search submitted, which may still be running after a timeout
+        self._retrieval_future: concurrent.futures.Future | None = None
+        self.last_retrieval_stats: dict | None = None
         self.world_manager = world_manager.WorldManager(db)
         self.available_tools = self._load_tools()
 
@@ -92,12 +120,17 @@ Present: {context_names}
 - Hint at potential dangers or opportunities in the environment
 """
 
-        # --- Tool Selection Step ---
+        # Deaths, visits and deliveries raised this turn are evaluated together
+        trigger_bus.open_bus(db)
+
+        # --- Tool Selection Step (memory retrieval runs alongside it) ---
+        retrieval = self._start_retrieval(player_input, player_log.id)
         prompt_for_llm = f"{context_prompt}\nPlayer command: {player_input}"
         print(f"Prompt for LLM: {prompt_for_llm}")
         chosen_tool_call = self.llm_service.choose_tool(
             prompt_for_llm, tools=self.available_tools
         )
+        memories = self._finish_retrieval(retrieval)
 
         player_action_result = None
         tool_name = "N/A"
@@ -116,7 +149,7 @@ Present: {context_names}
                         tool_args["db"] = db
 
                     player_action_result = tool_function(**tool_args)
-                    db.commit()  # Commit after successful tool use
+                    db.flush()
                 except Exception as e:
                     db.rollback()
                     player_action_result = {
@@ -146,31 +179,23 @@ Present: {context_names}
         if tool_name == "deal_damage":
             player = self.get_player_character(db)
             if player and player.current_location:
-                hostile_npcs = (
-                    db.query(GameEntity)
-                    .filter(
-                        GameEntity.current_location_id == player.current_location_id,
-                        GameEntity.is_hostile == True,  # noqa: E712
-                        GameEntity.is_retired == False,  # noqa: E712
-                        GameEntity.id != player.id,
-                    )
-                    .all()
+                # Every hostile NPC here strikes back in one combat round
+                combat_round = combat.resolve_combat_round(db, player)
+                npc_actions.extend(
+                    {f"{attack['attacker_name']}_combat": attack}
+                    for attack in combat_round["attacks"]
                 )
 
-                for npc in hostile_npcs:
-                    # Simple NPC AI: always attack the player
-                    attack_result = world_tools.deal_damage(
-                        db, attacker_name=npc.name, target_name=player.name
-                    )
-                    npc_actions.append({f"{npc.name}_combat": attack_result})
-                    db.commit()  # Commit each NPC action
+        # One batched pass over the turn's triggers, then one commit for the turn
+        trigger_bus.dispatch(db)
+        db.commit()
 
         # --- Narrative Synthesis Step ---
         if player_action_result or npc_actions:
             # Use synthesize_narrative for tool-based actions with conversation context
             if player_action_result and not player_action_result.get("error"):
                 warden_response = self.llm_service.synthesize_narrative(
-                    player_input, tool_name, player_action_result, db
+                    player_input, tool_name, player_action_result, db, memories=memories
                 )
                 
                 # If there were NPC reactions, append them to the narrative
@@ -198,14 +223,91 @@ Present: {context_names}
             warden_response = self.llm_service.generate_response(player_input)
 
         if warden_response:
-            warden_log = LogEntry(source="Warden", content=warden_response)
+            warden_log = LogEntry(
+                source="Warden",
+                content=warden_response,
+                metadata_dict=(
+                    {"retrieval": self.last_retrieval_stats}
+                    if self.last_retrieval_stats
+                    else None
+                ),
+            )
             db.add(warden_log)
 
         db.commit()
+        self._submit_turn_log_entries(db, player_log.id)
+
+    def _start_retrieval(self, player_input: str, player_log_id: int):
+        """Starts recalling log entries related to the player's input, if enabled."""
+        self.last_retrieval_stats = None
+        if not self.rag_service:
+            return None
+        if self._retrieval_future and not self._retrieval_future.done():
+            # A search that overran its budget is still using the session
+            print("Previous memory retrieval is still running; skipping this one.")
+            self.last_retrieval_stats = {"hits": 0, "latency_ms": 0, "skipped": True}
+            return None
+        self._retrieval_future = self._retrieval_executor.submit(
+            self._timed_search, player_input, player_log_id
+        )
+        return self._retrieval_future, time.monotonic()
+
+    def _timed_search(self, player_input: str, player_log_id: int):
+        started_at = time.monotonic()
+        hits = self.rag_service.hybrid_search(
+            player_input, RETRIEVAL_TOP_K, exclude_ids={player_log_id}
+        )
+        return hits, time.monotonic() - started_at
+
+    def _finish_retrieval(self, retrieval) -> list[str]:
+        """
+        Waits for the retrieval only as long as the latency budget allows.
+
+        Returns:
+            The recalled snippets, or an empty list if retrieval was skipped.
+        """
+        if not retrieval:
+            return []
+        future, started_at = retrieval
+        remaining = self.retrieval_budget - (time.monotonic() - started_at)
+        try:
+            hits, elapsed = future.result(timeout=max(0.0, remaining))
+        except Exception as e:
+            if isinstance(e, concurrent.futures.TimeoutError):
+                print("Memory retrieval exceeded its latency budget; skipping it.")
+            else:
+                print(f"Error during memory retrieval: {e}")
+            self.last_retrieval_stats = {
+                "hits": 0,
+                "latency_ms": round((time.monotonic() - started_at) * 1000),
+                "skipped": True,
+            }
+            return []
+
+        self.last_retrieval_stats = {
+            "hits": len(hits),
+            "latency_ms": round(elapsed * 1000),
+            "skipped": False,
+            "log_entry_ids": [hit["log_entry_id"] for hit in hits],
+        }
+        return [hit["content"] for hit in hits]
+
+    def _submit_turn_log_entries(self, db: Session, first_log_id: int) -> None:
+        """Hands every log entry committed during this turn to the indexing worker."""
+        if not self.indexing_worker:
+            return
+        turn_entries = (
+            db.query(LogEntry)
+            .filter(LogEntry.id >= first_log_id)
+            .order_by(LogEntry.id.asc())
+            .all()
+        )
+        self.indexing_worker.submit(turn_entries)
 
     def _check_proactive_npc_actions(self, db: Session):
         """Occasionally have NPCs act independently"""
-        if random.random() < 0.05:  # 5% chance per turn
+        npc_rng = rng.stream(db, rng.NPC_BEHAVIOUR)
+        if npc_rng.random() < 0.05:  # 5% chance per turn
             player = self.get_player_character(db)
             if player and player.current_location:
                 npcs = (
@@ -220,7 +322,7 @@ Present: {context_names}
                 )
                 
                 if npcs:
-                    chosen_npc = random.choice(npcs)
+                    chosen_npc = npc_rng.choice(npcs)
                     return self._generate_npc_proactive_action(chosen_npc, db)
         
         return None
@@ -264,16 +366,16 @@ Present: {context_names}
             .all()
         )
         
+        # Skip NPCs that are hostile and will attack anyway
+        if tool_name == "deal_damage":
+            npcs = [npc for npc in npcs if not npc.is_hostile]
+
+        # Update relationships based on player actions, for all witnesses at once
+        self._update_npc_relationships_for_action(db, npcs, tool_name, tool_result)
+
         for npc in npcs:
-            # Skip if this NPC is hostile and will attack anyway
-            if npc.is_hostile and tool_name == "deal_damage":
-                continue
-                
-            # Update relationships based on player actions
-            self._update_npc_relationship_for_action(db, npc, tool_name, tool_result)
-            
             # Generate reaction based on the action
-            if self._should_npc_react(npc, tool_name):
+            if self._should_npc_react(npc, tool_name, db):
                 relationship_info = world_tools.get_npc_relationship_info(db, npc.name)
                 
                 context = f"""
@@ -292,33 +394,35 @@ Present: {context_names}
         
         return reactions
 
-    def _update_npc_relationship_for_action(self, db: Session, npc: GameEntity, tool_name: str, tool_result: dict):
-        """Update NPC relationships based on player actions"""
+    def _update_npc_relationships_for_action(self, db: Session, npcs: list[GameEntity], tool_name: str, tool_result: dict):
+        """Update the relationships of every NPC who saw a player action"""
         if tool_name == "deal_damage" and not tool_result.get("error"):
             # Witnessing violence makes NPCs fearful/hostile
             target_name = tool_result.get("target_name", "")
-            if target_name != npc.name:  # NPC witnessed violence against someone else
-                world_tools.update_npc_relationship(
-                    db, npc.name, "witnessed_violence", -1,
-                    f"Disturbed by the violence against {target_name}",
-                    fear_change="increase"
-                )
+            witnesses = [npc.id for npc in npcs if npc.name != target_name]
+            relationships.apply_relationship_change(
+                db, witnesses, "witnessed_violence", -1,
+                f"Disturbed by the violence against {target_name}",
+                fear_change="increase"
+            )
         elif tool_name == "give_item":
             # Already handled in the give_item function
             pass
         elif tool_name == "rest":
             # Peaceful actions might slightly improve relationships
-            world_tools.update_npc_relationship(
-                db, npc.name, "peaceful_action", 0,
+            relationships.apply_relationship_change(
+                db, [npc.id for npc in npcs], "peaceful_action", 0,
                 "Noticed the peaceful behavior"
             )
+        db.flush()
 
-    def _should_npc_react(self, npc: GameEntity, tool_name: str) -> bool:
+    def _should_npc_react(self, npc: GameEntity, tool_name: str, db: Session) -> bool:
         """Determine if an NPC should react to a player action"""
         # NPCs are more likely to react to dramatic actions
         dramatic_actions = ["deal_damage", "give_item", "roll_saving_throw"]
         
+        npc_rng = rng.stream(db, rng.NPC_BEHAVIOUR)
         if tool_name in dramatic_actions:
-            return random.random() < 0.7  # 70% chance to react to dramatic actions
+            return npc_rng.random() < 0.7  # 70% chance to react to dramatic actions
         else:
-            return random.random() < 0.2  # 20% chance to react to other actions
+            return npc_rng.random() < 0.2  # 20% chance to react to other actions
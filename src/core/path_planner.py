@@ -0,0 +1,101 @@
+"""
+This module plans the network of Paths between map points from their positions.
+
+A minimum spanning tree over the positions guarantees that every point can be
+reached from every other one, with the shortest total length of road. Each
+point is then also joined to a few of its nearest neighbours, so the map has
+loops and alternative routes rather than a single tree. All of it works on
+numpy arrays in memory, one row of distances at a time, so it scales to
+thousands of points without a quadratic distance matrix or a database query.
+"""
+
+import math
+from typing import List, Tuple
+import numpy as np
+
+# Map units covered in one watch of travel
+WATCH_DISTANCE = 150
+# Rows of the distance matrix computed at a time by nearest_neighbour_edges
+_CHUNK = 512
+
+Edge = Tuple[int, int]
+
+
+def minimum_spanning_tree(points: np.ndarray) -> List[Edge]:
+    """
+    Returns the edges of a Euclidean minimum spanning tree, using Prim's
+    algorithm with one vectorized distance row per point added.
+
+    Args:
+        points: An array of (x, y) positions, shaped (n, 2).
+
+    Returns:
+        n - 1 (i, j) index pairs.
+    """
+    n = len(points)
+    if n < 2:
+        return []
+    in_tree = np.zeros(n, dtype=bool)
+    best = np.full(n, np.inf)
+    parent = np.zeros(n, dtype=np.int64)
+    current = 0
+    edges = []
+    for _ in range(n - 1):
+        in_tree[current] = True
+        distance = np.hypot(*(points - points[current]).T)
+        closer = ~in_tree & (distance < best)
+        best[closer] = distance[closer]
+        parent[closer] = current
+        best[current] = np.inf
+        current = int(np.argmin(np.where(in_tree, np.inf, best)))
+        edges.append((int(parent[current]), current))
+    return edges
+
+
+def nearest_neighbour_edges(points: np.ndarray, k: int) -> List[Edge]:
+    """
+    Returns an edge from every point to each of its k nearest other points.
+
+    Args:
+        points: An array of (x, y) positions, shaped (n, 2).
+        k: The number of neighbours per point.
+    """
+    n = len(points)
+    k = min(k, n - 1)
+    if k <= 0:
+        return []
+    edges = []
+    for start in range(0, n, _CHUNK):
+        rows = points[start:start + _CHUNK]
+        distance = np.hypot(
+            rows[:, None, 0] - points[None, :, 0], rows[:, None, 1] - points[None, :, 1]
+        )
+        distance[np.arange(len(rows)), np.arange(start, start + len(rows))] = np.inf
+        nearest = np.argpartition(distance, k - 1, axis=1)[:, :k]
+        for offset, neighbours in enumerate(nearest.tolist()):
+            edges.extend((start + offset, j) for j in neighbours)
+    return edges
+
+
+def plan_paths(points: np.ndarray, extra_neighbours: int = 2) -> List[Edge]:
+    """
+    Plans a connected network: the minimum spanning tree plus each point's
+    nearest neighbours, without duplicates.
+
+    Returns:
+        (i, j) index pairs with i < j, the tree's edges first.
+    """
+    points = np.asarray(points, dtype=float)
+    seen = set()
+    edges = []
+    for i, j in minimum_spanning_tree(points) + nearest_neighbour_edges(points, extra_neighbours):
+        edge = (min(i, j), max(i, j))
+        if edge not in seen:
+            seen.add(edge)
+            edges.append(edge)
+    return edges
+
+
+def watches_between(a, b) -> int:
+    """The watches it takes to travel between two positions, at least one."""
+    return max(1, math.ceil(math.dist(a, b) / WATCH_DISTANCE))
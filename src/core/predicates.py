@@ -0,0 +1,210 @@
+"""
+This module implements the small predicate language resolution conditions can
+store under target_data["predicate"].
+
+A predicate is JSON that tests a trigger's type and data:
+
+    {"eq": ["field", value]}          field equals value exactly
+    {"ieq": ["field", "text"]}        case-insensitive string match
+    {"in": ["field", [values]]}       membership; strings compare case-insensitively
+    {"all": [predicate, ...]}         every predicate holds
+    {"any": [predicate, ...]}         at least one predicate holds
+
+The field "trigger_type" refers to the trigger's type; every other field is
+looked up in the trigger data. For example, delivering anything to the elder:
+
+    {"all": [{"eq": ["trigger_type", "item_delivery"]},
+             {"ieq": ["receiver_name", "Elder Mara"]}]}
+
+Predicates are compiled once into plain Python callables, and the keys a
+predicate needs are extracted so the condition index can skip triggers that
+cannot match.
+"""
+
+import copy
+import itertools
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Set, Tuple
+
+TRIGGER_TYPE_FIELD = "trigger_type"
+PREDICATE_CACHE_SIZE = 4096
+# Above this many alternatives an "all" is indexed by one of its parts only
+MAX_INDEX_KEYS = 64
+
+Predicate = Callable[[str, Dict[str, Any]], bool]
+# (trigger type or None, (field, normalized value) or None); None matches anything
+IndexKey = Tuple[str | None, Tuple[str, Hashable] | None]
+
+
+def _normalize(value: Any) -> Any:
+    return value.lower() if isinstance(value, str) else value
+
+
+def _never(trigger_type: str, data: Dict[str, Any]) -> bool:
+    return False
+
+
+def _getter(field: str) -> Callable[[str, Dict[str, Any]], Any]:
+    if field == TRIGGER_TYPE_FIELD:
+        return lambda trigger_type, data: trigger_type
+    return lambda trigger_type, data: data.get(field)
+
+
+def _operands(spec: Any, op: str) -> tuple:
+    if not isinstance(spec, list) or len(spec) != 2 or not isinstance(spec[0], str):
+        raise ValueError(f"'{op}' takes a [field, value] pair, got {spec!r}")
+    return spec[0], spec[1]
+
+
+def _check_hashable(value: Any, op: str) -> None:
+    """Values are index keys and set members, so lists and objects are refused."""
+    try:
+        hash(value)
+    except TypeError:
+        raise ValueError(f"'{op}' cannot compare against {value!r}") from None
+
+
+def compile_predicate(spec: Dict[str, Any]) -> Predicate:
+    """
+    Compiles a predicate into a callable taking (trigger_type, trigger_data).
+
+    Raises:
+        ValueError: If the predicate is malformed.
+    """
+    if not isinstance(spec, dict) or len(spec) != 1:
+        raise ValueError(f"A predicate needs exactly one operator, got {spec!r}")
+    (op, args), = spec.items()
+
+    if op in ("all", "any"):
+        if not isinstance(args, list):
+            raise ValueError(f"'{op}' takes a list of predicates, got {args!r}")
+        parts = tuple(compile_predicate(arg) for arg in args)
+        combine = all if op == "all" else any
+        return lambda trigger_type, data: combine(
+            part(trigger_type, data) for part in parts
+        )
+
+    if op == "eq":
+        field, expected = _operands(args, op)
+        _check_hashable(expected, op)
+        get = _getter(field)
+        return lambda trigger_type, data: get(trigger_type, data) == expected
+
+    if op == "ieq":
+        field, expected = _operands(args, op)
+        _check_hashable(expected, op)
+        get = _getter(field)
+        expected = str(expected).lower()
+        return lambda trigger_type, data: str(get(trigger_type, data) or "").lower() == expected
+
+    if op == "in":
+        field, values = _operands(args, op)
+        if not isinstance(values, list):
+            raise ValueError(f"'in' takes a list of values, got {values!r}")
+        for value in values:
+            _check_hashable(value, op)
+        get = _getter(field)
+        members = frozenset(_normalize(value) for value in values)
+        return lambda trigger_type, data: _normalize(get(trigger_type, data)) in members
+
+    raise ValueError(f"Unknown predicate operator '{op}'")
+
+
+def _merge(a: IndexKey, b: IndexKey) -> IndexKey | None:
+    """Combines the keys of two parts of an 'all', or None if they conflict."""
+    if a[0] is not None and b[0] is not None and a[0] != b[0]:
+        return None
+    return (a[0] if a[0] is not None else b[0], a[1] if a[1] is not None else b[1])
+
+
+def _field_keys(field: str, values: Iterable[Any]) -> Set[IndexKey]:
+    values = [_normalize(value) for value in values]
+    if field == TRIGGER_TYPE_FIELD:
+        return {(value, None) for value in values}
+    if None in values:
+        # A missing field reads as None, and triggers are never filed under it
+        return {(None, None)}
+    return {(None, (field, value)) for value in values}
+
+
+def index_keys(spec: Dict[str, Any]) -> Set[IndexKey]:
+    """
+    Returns keys of which every trigger satisfying the predicate matches at
+    least one. (None, None) means the predicate cannot be narrowed down.
+    """
+    (op, args), = spec.items()
+    if op == "eq":
+        return _field_keys(args[0], [args[1]])
+    if op == "ieq":
+        expected = str(args[1]).lower()
+        if not expected and args[0] != TRIGGER_TYPE_FIELD:
+            # An empty string also matches a missing or falsy field
+            return {(None, None)}
+        return _field_keys(args[0], [expected])
+    if op == "in":
+        return _field_keys(args[0], args[1])
+    if op == "any":
+        keys: Set[IndexKey] = set()
+        for arg in args:
+            keys |= index_keys(arg)
+        return keys if (None, None) not in keys else {(None, None)}
+    if op == "all":
+        keys = {(None, None)}
+        for arg in args:
+            part = index_keys(arg)
+            if part == {(None, None)}:
+                continue
+            merged = {
+                key for key in itertools.starmap(_merge, itertools.product(keys, part))
+                if key is not None
+            }
+            if len(merged) > MAX_INDEX_KEYS:
+                break
+            keys = merged
+        return keys
+    return {(None, None)}
+
+
+def trigger_index_keys(trigger_type: str, data: Dict[str, Any]) -> List[IndexKey]:
+    """
+    Returns every index key a trigger could be looked up under. A value that
+    is not a string is also filed under its lowercased text, which is what
+    'ieq' compares against.
+    """
+    trigger_type = _normalize(trigger_type)
+    keys: List[IndexKey] = [(trigger_type, None), (None, None)]
+    for field, value in data.items():
+        values = [_normalize(value)] if isinstance(value, Hashable) else []
+        if value is not None and not isinstance(value, str):
+            values.append(str(value).lower())
+        for value in values:
+            keys.append((trigger_type, (field, value)))
+            keys.append((None, (field, value)))
+    return keys
+
+
+# condition id -> (predicate it was compiled from, compiled predicate)
+_predicate_cache: OrderedDict[Hashable, Tuple[Any, Predicate]] = OrderedDict()
+
+
+def predicate_for(condition_id: Hashable, spec: Any) -> Predicate:
+    """
+    Returns a condition's compiled predicate, cached by condition id and
+    rebuilt if the stored predicate changes. A malformed predicate never
+    matches.
+    """
+    cached = _predicate_cache.get(condition_id)
+    if cached is not None and cached[0] == spec:
+        _predicate_cache.move_to_end(condition_id)
+        return cached[1]
+
+    try:
+        predicate = compile_predicate(spec)
+    except ValueError as e:
+        print(f"Ignoring invalid predicate on condition {condition_id}: {e}")
+        predicate = _never
+    _predicate_cache[condition_id] = (copy.deepcopy(spec), predicate)
+    _predicate_cache.move_to_end(condition_id)
+    while len(_predicate_cache) > PREDICATE_CACHE_SIZE:
+        _predicate_cache.popitem(last=False)
+    return predicate
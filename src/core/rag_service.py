@@ -2,36 +2,268 @@
 This module provides a service for interacting with the RAG system.
 """
 import os
+import re
+import json
+import threading
 from langchain_community.vectorstores import Chroma
 from langchain_core.documents import Document
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
-from sqlalchemy.orm import Session
+from langchain_core.embeddings import Embeddings
+from sqlalchemy import text
+from sqlalchemy.orm import Session, sessionmaker
 from database.models import LogEntry
+from .embeddings import backend_name, create_embeddings
+
+DEFAULT_PERSIST_DIRECTORY = "./chroma_db"
+INDEX_STATE_FILE = "index_state.json"
+INDEX_BATCH_SIZE = 100
+# Damping constant for reciprocal-rank fusion; 60 is the usual choice
+RRF_K = 60
+
+_FTS_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def index_directory_for(db_path: str) -> str:
+    """Returns the vector index directory that belongs to an adventure database."""
+    return f"{os.path.splitext(db_path)[0]}_memory"
+
+
+def document_id_for(log_entry_id: int) -> str:
+    """Returns the stable vector store id for a log entry."""
+    return f"log-{log_entry_id}"
+
+
+def fts_query_for(query: str) -> str:
+    """
+    Turns free text into an FTS5 MATCH expression that matches any of its words.
+    Each word is quoted so punctuation and FTS5 operators in the input are inert.
+    """
+    return " OR ".join(f'"{token}"' for token in _FTS_TOKEN_PATTERN.findall(query))
 
 
 class RAGService:
     """A service for managing the RAG system."""
 
-    def __init__(self, db_session: Session):
-        """Initializes the RAG service."""
-        self.db_session = db_session
-        self.embeddings = GoogleGenerativeAIEmbeddings(
-            model="models/embedding-001",
-            google_api_key=os.environ["GOOGLE_API_KEY"],
-            transport="rest",
-        )
-        self.vector_store = Chroma(
-            embedding_function=self.embeddings, persist_directory="./chroma_db"
+    def __init__(
+        self,
+        db_session: Session,
+        persist_directory: str = DEFAULT_PERSIST_DIRECTORY,
+        embeddings: Embeddings | None = None,
+    ):
+        """
+        Initializes the RAG service.
+
+        Args:
+            db_session: A session on the adventure database. Reads open their own
+                short-lived sessions on its engine, since searches run on
+                other threads.
+            persist_directory: Where the adventure's vector index is stored.
+            embeddings: The embedding backend. Defaults to the configured backend.
+        """
+        self._sessions = sessionmaker(bind=db_session.get_bind())
+        self.persist_directory = persist_directory
+        self.embeddings = embeddings or create_embeddings()
+        self.backend_name = backend_name(self.embeddings)
+        # Guards the vector store against the indexing worker and searches on other threads
+        self._index_lock = threading.Lock()
+        self.vector_store = self._open_vector_store()
+        self.high_water_mark = self._load_high_water_mark()
+        # Log entries that could not be indexed; the high-water mark stays below them
+        self._unindexed: set[int] = set()
+
+    def _open_vector_store(self) -> Chroma:
+        return Chroma(
+            embedding_function=self.embeddings,
+            persist_directory=self.persist_directory,
         )
 
-    def load_adventure_log(self):
-        """Loads the adventure log from the database into ChromaDB."""
-        log_entries = self.db_session.query(LogEntry).all()
-        documents = [Document(page_content=entry.content) for entry in log_entries]
-        if documents:
-            self.vector_store.add_documents(documents)
+    def _state_path(self) -> str:
+        return os.path.join(self.persist_directory, INDEX_STATE_FILE)
+
+    def _load_high_water_mark(self) -> int:
+        """
+        Reads the id of the newest indexed log entry, stored next to the index.
+        An index built by a different embedding backend is discarded.
+        """
+        try:
+            with open(self._state_path(), encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return 0
+
+        if state.get("embedding_backend") != self.backend_name:
+            self.vector_store.delete_collection()
+            self.vector_store = self._open_vector_store()
+            return 0
+        return int(state.get("high_water_mark", 0))
+
+    def _save_high_water_mark(self) -> None:
+        os.makedirs(self.persist_directory, exist_ok=True)
+        with open(self._state_path(), "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "embedding_backend": self.backend_name,
+                    "high_water_mark": self.high_water_mark,
+                },
+                f,
+            )
+
+    def _advance_high_water_mark(self, mark: int) -> None:
+        """Moves the high-water mark, but never past an entry that failed to index."""
+        if self._unindexed:
+            mark = min(mark, min(self._unindexed) - 1)
+        self.high_water_mark = mark
+        self._save_high_water_mark()
+
+    def mark_unindexed(self, entry_ids: list[int]) -> None:
+        """
+        Records log entries that could not be indexed, keeping the high-water
+        mark below them so load_adventure_log indexes them again.
+        """
+        with self._index_lock:
+            self._unindexed.update(entry_ids)
+            self._advance_high_water_mark(self.high_water_mark)
+
+    def load_adventure_log(self) -> int:
+        """
+        Indexes the log entries written since the last indexed entry.
+
+        Returns:
+            The number of log entries that were embedded.
+        """
+        with self._sessions() as db:
+            log_entries = (
+                db.query(LogEntry)
+                .filter(LogEntry.id > self.high_water_mark)
+                .order_by(LogEntry.id.asc())
+                .all()
+            )
+        for start in range(0, len(log_entries), INDEX_BATCH_SIZE):
+            self.index_entries(log_entries[start : start + INDEX_BATCH_SIZE])
+        return len(log_entries)
+
+    def index_entries(self, log_entries: list[LogEntry]) -> None:
+        """
+        Upserts log entries under their stable ids and advances the high-water mark.
+
+        Args:
+            log_entries: LogEntry rows, or any objects with id, content and source.
+        """
+        if not log_entries:
+            return
+        documents = [
+            Document(
+                page_content=entry.content,
+                metadata={"log_entry_id": entry.id, "source": entry.source},
+            )
+            for entry in log_entries
+        ]
+        with self._index_lock:
+            self.vector_store.add_documents(
+                documents, ids=[document_id_for(entry.id) for entry in log_entries]
+            )
+            self._unindexed.difference_update(entry.id for entry in log_entries)
+            self._advance_high_water_mark(
+                max(self.high_water_mark, max(entry.id for entry in log_entries))
+            )
+
+    def reindex(self) -> int:
+        """
+        Drops the adventure's index and rebuilds it from the full adventure log.
+
+        Returns:
+            The number of log entries that were embedded.
+        """
+        with self._index_lock:
+            self.vector_store.delete_collection()
+            self.vector_store = self._open_vector_store()
+            self.high_water_mark = 0
+            self._unindexed.clear()
+        return self.load_adventure_log()
 
     def search(self, query: str, limit: int = 3) -> list[str]:
         """Searches the knowledge base for relevant information."""
-        results = self.vector_store.similarity_search(query, k=limit)
-        return [doc.page_content for doc in results]
\ No newline at end of file
+        with self._index_lock:
+            results = self.vector_store.similarity_search(query, k=limit)
+        return [doc.page_content for doc in results]
+
+    def lexical_search(self, query: str, limit: int = 20) -> list[tuple[int, str]]:
+        """
+        Ranks log entries by BM25 over the full-text index.
+
+        Returns:
+            (log entry id, content) pairs, best match first.
+        """
+        match = fts_query_for(query)
+        if not match:
+            return []
+        with self._sessions() as db:
+            rows = db.execute(
+                text(
+                    "SELECT log_entry.id, log_entry.content FROM log_entry_fts "
+                    "JOIN log_entry ON log_entry.id = log_entry_fts.rowid "
+                    "WHERE log_entry_fts MATCH :match "
+                    "ORDER BY bm25(log_entry_fts) LIMIT :limit"
+                ),
+                {"match": match, "limit": limit},
+            )
+            return [(row.id, row.content) for row in rows]
+
+    def _vector_search(self, query: str, limit: int) -> list[tuple[int, str]]:
+        with self._index_lock:
+            results = self.vector_store.similarity_search(query, k=limit)
+        return [
+            (doc.metadata["log_entry_id"], doc.page_content)
+            for doc in results
+            if "log_entry_id" in doc.metadata
+        ]
+
+    def hybrid_search(
+        self,
+        query: str,
+        limit: int = 3,
+        candidates: int = 20,
+        exclude_ids: set[int] | None = None,
+    ) -> list[dict]:
+        """
+        Searches the adventure log with both BM25 and vector similarity, merging
+        the two rankings with reciprocal-rank fusion.
+
+        If the embedding backend fails, the full-text ranking is used on its own.
+
+        Args:
+            query: The free-text query.
+            limit: The maximum number of results.
+            candidates: How many results to take from each ranking before fusing.
+            exclude_ids: Log entry ids to leave out of the results.
+
+        Returns:
+            Dicts with the log entry id, content, fused score and the rankings
+            that matched it, best match first.
+        """
+        exclude_ids = exclude_ids or set()
+        rankings = {"lexical": self.lexical_search(query, candidates)}
+        try:
+            rankings["vector"] = self._vector_search(query, candidates)
+        except Exception as e:
+            print(f"Vector search unavailable, using full-text search only: {e}")
+
+        fused: dict[int, dict] = {}
+        for ranking_name, ranking in rankings.items():
+            for rank, (log_entry_id, content) in enumerate(ranking, start=1):
+                if log_entry_id in exclude_ids:
+                    continue
+                hit = fused.setdefault(
+                    log_entry_id,
+                    {
+                        "log_entry_id": log_entry_id,
+                        "content": content,
+                        "score": 0.0,
+                        "matched_by": [],
+                    },
+                )
+                hit["score"] += 1.0 / (RRF_K + rank)
+                hit["matched_by"].append(ranking_name)
+
+        return sorted(
+            fused.values(), key=lambda hit: (-hit["score"], -hit["log_entry_id"])
+        )[:limit]
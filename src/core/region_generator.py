@@ -0,0 +1,297 @@
+"""
+This module generates large regions of hundreds or thousands of POIs at once,
+for long campaigns that outgrow the handful made by WorldGenerator.
+
+POIs are placed with Poisson-disk sampling (Bridson's algorithm), so they
+spread evenly and never crowd each other. A uniform grid whose cells are
+small enough to hold at most one POI serves as the spatial index for the
+sampler's neighbour checks and for nearest-POI queries. The map is divided
+into terrain regions around random centres; each region's terrain is rolled
+on TERRAIN_DIE_DROP and names its POIs from EASY_TERRAIN, TOUGH_TERRAIN or
+PERILOUS_TERRAIN. The POI nearest each centre is the region's settlement.
+Nothing is enriched by the LLM: every table is sampled in bulk, the POIs and
+their paths are written with one insert each, and the whole run commits once.
+"""
+
+import math
+import random
+import time
+from typing import List, NamedTuple
+import numpy as np
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from database.models import MapPoint, WorldState
+from .oracles import (
+    CURIOSITIES,
+    DUNGEONS,
+    EASY_TERRAIN,
+    LAIRS,
+    PERILOUS_TERRAIN,
+    POI_DIE_DROP,
+    SETTLEMENTS,
+    TERRAIN_DIE_DROP,
+    TOUGH_TERRAIN,
+    OracleRoller,
+)
+from .rng import WORLD_GEN, stream
+from .world_generator import generate_paths
+
+REGIONS_KEY = "regions"
+TERRAIN_TABLES = {"Easy": EASY_TERRAIN, "Tough": TOUGH_TERRAIN, "Perilous": PERILOUS_TERRAIN}
+# Candidates tried around each active sample before it is retired
+POISSON_ATTEMPTS = 30
+# Offsets of a 5x5 block of cells in the padded grid, around a cell's unpadded index
+_BLOCK_OFFSETS = np.arange(0, 5)
+
+
+class SpatialGrid:
+    """
+    A grid index over points that keep a minimum distance from each other.
+    With cells no wider than that distance over the square root of two, each
+    cell holds at most one point, so the grid is a dense array of indices,
+    padded with two empty cells on every side so neighbour lookups need no
+    bounds checks.
+    """
+
+    def __init__(self, width: float, height: float, min_distance: float):
+        self.cell_size = min_distance / math.sqrt(2)
+        self.columns = max(1, math.ceil(width / self.cell_size))
+        self.rows = max(1, math.ceil(height / self.cell_size))
+        self.cells = np.full((self.rows + 4, self.columns + 4), -1, dtype=np.int64)
+        self._positions = np.empty((64, 2))
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def points(self) -> np.ndarray:
+        """The (x, y) positions of the points, shaped (n, 2), in the order added."""
+        return self._positions[:self._count]
+
+    def _cell(self, x: float, y: float) -> tuple[int, int]:
+        """The padded cells array's row and column for a position."""
+        return (
+            min(self.rows - 1, max(0, int(y / self.cell_size))) + 2,
+            min(self.columns - 1, max(0, int(x / self.cell_size))) + 2,
+        )
+
+    def add(self, x: float, y: float) -> int:
+        index = self._count
+        if index == len(self._positions):
+            self._positions = np.concatenate((self._positions, np.empty_like(self._positions)))
+        self._positions[index] = (x, y)
+        self._count += 1
+        self.cells[self._cell(x, y)] = index
+        return index
+
+    def _block(self, x: float, y: float, reach: int) -> np.ndarray:
+        """The indices of the points in the cells within reach of a position."""
+        row, column = self._cell(x, y)
+        block = self.cells[
+            max(0, row - reach):row + reach + 1, max(0, column - reach):column + reach + 1
+        ]
+        return block[block >= 0]
+
+    def within(self, x: float, y: float, radius: float) -> List[int]:
+        """Returns the indices of the points within a radius of a position."""
+        found = self._block(x, y, math.ceil(radius / self.cell_size))
+        if not len(found):
+            return []
+        points = self.points[found]
+        return found[np.hypot(points[:, 0] - x, points[:, 1] - y) <= radius].tolist()
+
+    def nearest(self, x: float, y: float) -> int | None:
+        """Returns the index of the point nearest a position, searching outwards."""
+        if not self._count:
+            return None
+        reach = 1
+        while not len(self._block(x, y, reach)):
+            reach *= 2
+        # A closer point may sit just outside the block, so search its full radius
+        candidates = self._block(x, y, reach)
+        points = self.points
+        radius = np.hypot(points[candidates, 0] - x, points[candidates, 1] - y).min()
+        found = self._block(x, y, math.ceil(radius / self.cell_size) + 1)
+        distance = np.hypot(points[found, 0] - x, points[found, 1] - y)
+        return int(found[int(np.argmin(distance))])
+
+    def is_clear(self, candidates: np.ndarray, min_distance: float) -> np.ndarray:
+        """Tells, for each (x, y) candidate, whether it keeps its distance from every point."""
+        if not self._count:
+            return np.ones(len(candidates), dtype=bool)
+        # Candidates must lie on the map, so their cells are never out of range
+        rows = (candidates[:, 1] / self.cell_size).astype(np.int64)
+        columns = (candidates[:, 0] / self.cell_size).astype(np.int64)
+        # The 5x5 block of cells around each candidate
+        neighbours = self.cells[
+            rows[:, None, None] + _BLOCK_OFFSETS[None, :, None],
+            columns[:, None, None] + _BLOCK_OFFSETS[None, None, :],
+        ].reshape(len(candidates), -1)
+        near = self.points[np.maximum(neighbours, 0)]
+        distance = np.hypot(near[..., 0] - candidates[:, None, 0], near[..., 1] - candidates[:, None, 1])
+        return ~((neighbours >= 0) & (distance < min_distance)).any(axis=1)
+
+
+def poisson_disk(
+    width: float,
+    height: float,
+    min_distance: float,
+    rng: np.random.Generator,
+    max_points: int | None = None,
+) -> SpatialGrid:
+    """
+    Scatters points over a width x height map so that no two are closer than
+    min_distance, until the map is full or max_points are placed.
+
+    Returns:
+        The grid index holding the points, in the order they were placed.
+    """
+    grid = SpatialGrid(width, height, min_distance)
+    grid.add(rng.uniform(0, width), rng.uniform(0, height))
+    active = [0]
+    while active and (max_points is None or len(grid) < max_points):
+        slot = int(rng.integers(len(active)))
+        x, y = grid.points[active[slot]]
+        # Candidates in the annulus between min_distance and twice that
+        angle = rng.uniform(0, 2 * math.pi, POISSON_ATTEMPTS)
+        radius = min_distance * np.sqrt(rng.uniform(1, 4, POISSON_ATTEMPTS))
+        candidates = np.column_stack((x + radius * np.cos(angle), y + radius * np.sin(angle)))
+        candidates = candidates[
+            (candidates[:, 0] >= 0) & (candidates[:, 0] < width)
+            & (candidates[:, 1] >= 0) & (candidates[:, 1] < height)
+        ]
+        clear = np.flatnonzero(grid.is_clear(candidates, min_distance)) if len(candidates) else []
+        if len(clear):
+            active.append(grid.add(*candidates[clear[0]]))
+        else:
+            active[slot] = active[-1]
+            active.pop()
+    return grid
+
+
+class Region(NamedTuple):
+    name: str
+    terrain: str
+    center: tuple[float, float]
+    poi_count: int
+
+
+class RegionReport(NamedTuple):
+    pois: int
+    paths: int
+    regions: List[Region]
+    seconds: float
+
+    @property
+    def pois_per_second(self) -> float:
+        return self.pois / self.seconds if self.seconds else float("inf")
+
+
+class RegionGenerator:
+    """Fills a large map with POIs grouped into terrain regions."""
+
+    def __init__(self, db: Session, rng: random.Random | None = None):
+        self.db = db
+        self.rng = rng or stream(db, WORLD_GEN)
+        self.numpy_rng = getattr(self.rng, "numpy", None) or np.random.default_rng(self.rng.getrandbits(64))
+        self.oracles = OracleRoller(self.rng)
+
+    def generate(
+        self,
+        width: int = 4000,
+        height: int = 3000,
+        min_distance: float = 60,
+        regions: int = 6,
+        max_pois: int | None = None,
+        origin: tuple[int, int] = (0, 0),
+        with_paths: bool = True,
+    ) -> RegionReport:
+        """
+        Generates a region of POIs and, optionally, joins them with paths.
+
+        Args:
+            width, height: The size of the area to fill, in map units.
+            min_distance: The least distance between two POIs.
+            regions: The number of terrain regions the area is divided into.
+            max_pois: Stops placing POIs once this many exist.
+            origin: Where the area's top-left corner sits on the map.
+            with_paths: Whether to plan paths across the whole map afterwards.
+
+        Returns:
+            A report with the POIs, paths and regions made and the time taken.
+        """
+        started = time.perf_counter()
+        grid = poisson_disk(width, height, min_distance, self.numpy_rng, max_pois)
+        positions = grid.points + np.array(origin, dtype=float)
+        n = len(positions)
+
+        # Terrain regions around random centres; each POI joins the nearest one
+        regions = max(1, regions)
+        centers = self.numpy_rng.uniform((0, 0), (width, height), size=(regions, 2))
+        terrains = self.oracles.sample(TERRAIN_DIE_DROP, regions)
+        region_of = np.argmin(
+            np.hypot(
+                positions[:, None, 0] - origin[0] - centers[None, :, 0],
+                positions[:, None, 1] - origin[1] - centers[None, :, 1],
+            ),
+            axis=1,
+        )
+        region_sizes = np.bincount(region_of, minlength=regions).tolist()
+        kinds = self.oracles.sample(POI_DIE_DROP, n)
+        for center in centers:
+            # The POI nearest each region's centre is its settlement
+            kinds[grid.nearest(*center)] = "Settlement"
+
+        details = {
+            kind: iter(self.oracles.sample(table, n))
+            for kind, table in (
+                ("Settlement", SETTLEMENTS), ("Curiosity", CURIOSITIES),
+                ("Lair", LAIRS), ("Dungeon", DUNGEONS),
+            )
+        }
+        region_names, landmarks = [], []
+        for terrain, size in zip(terrains, region_sizes):
+            table = TERRAIN_TABLES[terrain]
+            region_names.append(f"The {self.oracles.roll_on_table(table)[0]}")
+            landmarks.append(iter(self.oracles.sample(table, size)))
+
+        rows = []
+        for i, (kind, r) in enumerate(zip(kinds, region_of.tolist())):
+            detail_kind = "Settlement" if "Settlement" in kind else kind
+            detail = next(details[detail_kind])
+            landmark = next(landmarks[r])[1]
+            rows.append({
+                "name": f"{detail[0]} of the {landmark}",
+                "type": f"Settlement - {detail[0]}" if detail_kind == "Settlement" else kind,
+                "description": f"{detail[0]} - {detail[1]}. In {region_names[r]} ({terrains[r]} terrain).",
+                "status": "hidden",
+                "position_x": int(positions[i, 0]),
+                "position_y": int(positions[i, 1]),
+            })
+        if rows:
+            self.db.execute(insert(MapPoint), rows)
+
+        region_list = [
+            Region(name, terrain, (float(cx + origin[0]), float(cy + origin[1])), size)
+            for name, terrain, (cx, cy), size in zip(region_names, terrains, centers, region_sizes)
+        ]
+        self._record_regions(region_list)
+
+        paths = 0
+        if with_paths:
+            paths = generate_paths(self.db, self.oracles, commit=False)
+        self.db.commit()
+        return RegionReport(n, paths, region_list, time.perf_counter() - started)
+
+    def _record_regions(self, regions: List[Region]) -> None:
+        """Appends the regions to the list kept in WorldState."""
+        state = self.db.query(WorldState).filter(WorldState.key == REGIONS_KEY).first()
+        recorded = [
+            {"name": r.name, "terrain": r.terrain, "center": list(r.center), "poi_count": r.poi_count}
+            for r in regions
+        ]
+        if state:
+            state.value = list(state.value or []) + recorded
+        else:
+            self.db.add(WorldState(key=REGIONS_KEY, value=recorded))
@@ -0,0 +1,268 @@
+"""
+This module stores each NPC's relationship with the player in the
+npc_relationship table and appends every change to relationship_event.
+
+Updates are set-based: a change applied to many NPCs at once costs one SELECT
+and one executemany per table, however many NPCs are involved.
+"""
+
+import random
+import datetime
+from typing import Any, Dict
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+from database.models import GameEntity, NPCRelationship, RelationshipEvent
+from .rng import NPC_BEHAVIOUR, stream
+
+MIN_LEVEL = -5
+MAX_LEVEL = 5
+FEAR_LEVELS = ["none", "wary", "afraid", "terrified"]
+
+# The relationship of an NPC that has no npc_relationship row yet
+DEFAULT_RELATIONSHIP = {
+    "level": 0,
+    "type": "neutral",
+    "trust": "cautious",
+    "fear": "none",
+}
+
+
+def relationship_type_for(level: int, rng: random.Random = random) -> str:
+    """Convert relationship level to descriptive type"""
+    if level <= -3:
+        return rng.choice(["enemy", "rival", "nemesis"])
+    elif level <= -1:
+        return rng.choice(["suspicious", "resentful", "disappointed"])
+    elif level == 0:
+        return rng.choice(["indifferent", "professional", "cautious"])
+    elif level <= 2:
+        return rng.choice(["respectful", "grateful", "fond"])
+    else:
+        return rng.choice(["devoted", "loyal", "protective"])
+
+
+def trust_for(level: int, fear: str) -> str:
+    """Determine trust level based on relationship and fear"""
+    if fear in ["afraid", "terrified"]:
+        return "distrustful"
+    elif level <= -2:
+        return "distrustful"
+    elif level <= 0:
+        return "cautious"
+    elif level <= 2:
+        return "trusting"
+    else:
+        return "devoted"
+
+
+def disposition_for(level: int) -> tuple[str, bool]:
+    """Returns the disposition and hostility that follow from a relationship level."""
+    if level <= -3:
+        return "hostile", True
+    elif level <= -1:
+        return "unfriendly", False
+    elif level <= 2:
+        return "friendly", False
+    else:
+        return "allied", False
+
+
+def shift_fear(fear: str, fear_change: str | None) -> str:
+    """Moves a fear level one step up or down the scale."""
+    index = FEAR_LEVELS.index(fear) if fear in FEAR_LEVELS else 0
+    if fear_change == "increase":
+        index = min(len(FEAR_LEVELS) - 1, index + 1)
+    elif fear_change == "decrease":
+        index = max(0, index - 1)
+    return FEAR_LEVELS[index]
+
+
+def _relationship_dict(row) -> Dict[str, Any]:
+    return {"level": row.level, "type": row.type, "trust": row.trust, "fear": row.fear}
+
+
+def get_relationship(db: Session, npc_id: int) -> Dict[str, Any]:
+    """Returns an NPC's relationship, or the default one if none is stored."""
+    row = db.execute(
+        select(
+            NPCRelationship.level,
+            NPCRelationship.type,
+            NPCRelationship.trust,
+            NPCRelationship.fear,
+        ).where(NPCRelationship.npc_id == npc_id)
+    ).first()
+    return _relationship_dict(row) if row else dict(DEFAULT_RELATIONSHIP)
+
+
+def recent_events(db: Session, npc_id: int, limit: int = 3) -> list[Dict[str, Any]]:
+    """Returns an NPC's most recent relationship events, oldest first."""
+    rows = db.execute(
+        select(RelationshipEvent)
+        .where(RelationshipEvent.npc_id == npc_id)
+        .order_by(RelationshipEvent.id.desc())
+        .limit(limit)
+    ).scalars()
+    return [
+        {
+            "action": event.action,
+            "impact": event.impact,
+            "description": event.description,
+            "timestamp": event.created_at.isoformat() if event.created_at else None,
+        }
+        for event in reversed(list(rows))
+    ]
+
+
+def apply_relationship_change(
+    db: Session,
+    npc_ids: list[int],
+    action_type: str,
+    impact: int,
+    description: str,
+    fear_change: str | None = None,
+) -> Dict[int, Dict[str, Any]]:
+    """
+    Applies the same relationship change to several NPCs at once.
+
+    The caller's pending changes are flushed first. Nothing is committed.
+
+    Args:
+        db: The database session.
+        npc_ids: The ids of the NPCs affected.
+        action_type: Type of action (e.g., "gave_item", "witnessed_violence").
+        impact: Relationship level change, clamped to the -5..+5 range.
+        description: Human-readable description of what happened.
+        fear_change: Optional fear level change ("increase", "decrease", "none").
+
+    Returns:
+        The old level and the new relationship of each NPC, keyed by id.
+    """
+    npc_ids = list(dict.fromkeys(npc_ids))
+    if not npc_ids:
+        return {}
+    db.flush()
+
+    stored = {
+        row.npc_id: _relationship_dict(row)
+        for row in db.execute(
+            select(NPCRelationship).where(NPCRelationship.npc_id.in_(npc_ids))
+        ).scalars()
+    }
+
+    now = datetime.datetime.utcnow()
+    rng = stream(db, NPC_BEHAVIOUR)
+    new_rows, changed_rows, entity_rows, event_rows = [], [], [], []
+    results: Dict[int, Dict[str, Any]] = {}
+    for npc_id in npc_ids:
+        current = stored.get(npc_id, DEFAULT_RELATIONSHIP)
+        level = max(MIN_LEVEL, min(MAX_LEVEL, current["level"] + impact))
+        fear = shift_fear(current["fear"], fear_change)
+        relationship = {
+            "npc_id": npc_id,
+            "level": level,
+            "type": relationship_type_for(level, rng),
+            "trust": trust_for(level, fear),
+            "fear": fear,
+        }
+        (changed_rows if npc_id in stored else new_rows).append(relationship)
+
+        disposition, is_hostile = disposition_for(level)
+        entity_rows.append(
+            {"id": npc_id, "disposition": disposition, "is_hostile": is_hostile}
+        )
+        event_rows.append(
+            {
+                "npc_id": npc_id,
+                "action": action_type,
+                "impact": impact,
+                "description": description,
+                "created_at": now,
+            }
+        )
+        results[npc_id] = {
+            "old_level": current["level"],
+            **relationship,
+            "disposition": disposition,
+            "is_hostile": is_hostile,
+        }
+
+    if new_rows:
+        db.execute(insert(NPCRelationship), new_rows)
+    if changed_rows:
+        db.execute(update(NPCRelationship), changed_rows)
+    db.execute(update(GameEntity), entity_rows)
+    db.execute(insert(RelationshipEvent), event_rows)
+
+    # Bulk statements bypass loaded objects, so refresh any the session holds
+    affected = set(npc_ids)
+    for obj in list(db.identity_map.values()):
+        if isinstance(obj, GameEntity) and obj.id in affected:
+            db.expire(obj, ["disposition", "is_hostile", "npc_relationship"])
+        elif isinstance(obj, NPCRelationship) and obj.npc_id in affected:
+            db.expire(obj)
+    return results
+
+
+def find_npcs_by_relationship(
+    db: Session,
+    min_fear: str | None = None,
+    trust: str | None = None,
+    min_level: int | None = None,
+    max_level: int | None = None,
+) -> list[tuple[GameEntity, Dict[str, Any]]]:
+    """
+    Finds living NPCs whose relationship with the player matches every filter given.
+
+    Args:
+        db: The database session.
+        min_fear: Only NPCs at least this afraid ("wary", "afraid", "terrified").
+        trust: Only NPCs with this trust level.
+        min_level: Only NPCs with at least this relationship level.
+        max_level: Only NPCs with at most this relationship level.
+
+    Returns:
+        (NPC, relationship) pairs ordered by relationship level.
+    """
+    fears = FEAR_LEVELS[FEAR_LEVELS.index(min_fear) :] if min_fear else None
+    conditions = []
+    if fears is not None:
+        conditions.append(NPCRelationship.fear.in_(fears))
+    if trust is not None:
+        conditions.append(NPCRelationship.trust == trust)
+    if min_level is not None:
+        conditions.append(NPCRelationship.level >= min_level)
+    if max_level is not None:
+        conditions.append(NPCRelationship.level <= max_level)
+
+    living_npcs = (
+        GameEntity.entity_type == "NPC",
+        GameEntity.is_retired == False,  # noqa: E712
+    )
+    rows = (
+        db.query(GameEntity, NPCRelationship)
+        .join(NPCRelationship, NPCRelationship.npc_id == GameEntity.id)
+        .filter(*living_npcs, *conditions)
+        .order_by(NPCRelationship.level, GameEntity.id)
+        .all()
+    )
+    matches = [(npc, _relationship_dict(rel)) for npc, rel in rows]
+
+    default = DEFAULT_RELATIONSHIP
+    default_matches = (
+        (fears is None or default["fear"] in fears)
+        and (trust is None or default["trust"] == trust)
+        and (min_level is None or default["level"] >= min_level)
+        and (max_level is None or default["level"] <= max_level)
+    )
+    if default_matches:
+        # NPCs without a stored row still hold the default relationship
+        unrelated = (
+            db.query(GameEntity)
+            .filter(*living_npcs, ~GameEntity.npc_relationship.has())
+            .order_by(GameEntity.id)
+            .all()
+        )
+        matches.extend((npc, dict(default)) for npc in unrelated)
+        matches.sort(key=lambda match: match[1]["level"])
+    return matches
+
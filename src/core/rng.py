@@ -0,0 +1,170 @@
+"""
+This module gives each adventure reproducible random number streams.
+
+An adventure has one seed, stored in WorldState. Every subsystem draws from
+its own named stream (world generation, combat, oracles, NPC behaviour...),
+whose seed is derived from the adventure seed and the stream name with
+sha256, so streams are independent: rolling more oracles never changes the
+next combat roll. Each stream is a random.Random backed by a numpy PCG64
+generator, usable both with the random module API and, through .numpy, for
+vectorized draws. The state of every stream used in a session is written back
+to WorldState when the session commits, so reloading an adventure continues
+each stream exactly where it stopped.
+"""
+
+import random
+import hashlib
+import secrets
+from typing import Any, Dict
+import numpy as np
+from sqlalchemy.orm import Session
+from database.models import WorldState
+from .session_cache import SessionCache
+
+ADVENTURE_SEED_KEY = "adventure_seed"
+RNG_STATE_KEY = "rng_state"
+# Where a session keeps its RNG service
+RNG_SERVICE_KEY = "rng_service"
+
+# Stream names
+WORLD_GEN = "world_gen"
+CHARACTERS = "characters"
+COMBAT = "combat"
+DICE = "dice"
+ORACLES = "oracles"
+NPC_BEHAVIOUR = "npc_behaviour"
+CONSEQUENCES = "consequences"
+SIMULATION = "simulation"
+
+
+def stream_seed(seed: int, name: str) -> int:
+    """Derives a stream's 128-bit seed from the adventure seed and its name."""
+    digest = hashlib.sha256(f"{seed}:{name}".encode()).digest()
+    return int.from_bytes(digest[:16], "big")
+
+
+class RandomStream(random.Random):
+    """
+    A random.Random whose bits come from a numpy PCG64 generator, so the
+    same stream can be shared by scalar and vectorized code and its whole
+    state is a small JSON-friendly dict.
+    """
+
+    def seed(self, a: Any = None, version: int = 2) -> None:
+        self.numpy = np.random.Generator(np.random.PCG64(a))
+        self.gauss_next = None
+
+    def random(self) -> float:
+        return self.numpy.random()
+
+    def getrandbits(self, k: int) -> int:
+        bit_generator = self.numpy.bit_generator
+        bits, filled = 0, 0
+        while filled < k:
+            bits = (bits << 64) | int(bit_generator.random_raw())
+            filled += 64
+        return bits >> (filled - k)
+
+    def getstate(self) -> Dict[str, Any]:
+        return self.numpy.bit_generator.state
+
+    def setstate(self, state: Dict[str, Any]) -> None:
+        self.numpy.bit_generator.state = state
+        self.gauss_next = None
+
+
+class RNGService:
+    """The named random streams of one adventure seed."""
+
+    def __init__(self, seed: int, states: Dict[str, Any] | None = None):
+        self.seed = seed
+        self._states = dict(states or {})
+        self._streams: Dict[str, RandomStream] = {}
+
+    def stream(self, name: str) -> RandomStream:
+        """Returns the named stream, resuming from its saved state if it has one."""
+        stream = self._streams.get(name)
+        if stream is None:
+            stream = RandomStream(stream_seed(self.seed, name))
+            if name in self._states:
+                stream.setstate(self._states[name])
+            self._streams[name] = stream
+        return stream
+
+    def state(self) -> Dict[str, Any]:
+        """Returns the state of every stream, used or not, keyed by name."""
+        states = dict(self._states)
+        states.update({name: stream.getstate() for name, stream in self._streams.items()})
+        return states
+
+
+def _find_state(db: Session, key: str) -> WorldState | None:
+    # Rows added earlier in this session may not have been flushed yet
+    for obj in db.new:
+        if isinstance(obj, WorldState) and obj.key == key:
+            return obj
+    return db.query(WorldState).filter(WorldState.key == key).first()
+
+
+def _get_value(db: Session, key: str) -> Any:
+    state = _find_state(db, key)
+    return state.value if state else None
+
+
+def _set_value(db: Session, key: str, value: Any) -> None:
+    state = _find_state(db, key)
+    if state:
+        state.value = value
+    else:
+        db.add(WorldState(key=key, value=value))
+
+
+def get_adventure_seed(db: Session) -> int | None:
+    """Returns the adventure seed, or None if one has not been chosen yet."""
+    seed = _get_value(db, ADVENTURE_SEED_KEY)
+    return int(seed) if seed is not None else None
+
+
+def set_adventure_seed(db: Session, seed: int) -> None:
+    """
+    Sets the adventure seed and restarts every stream from it. Meant to be
+    called before a world is generated, so a seed always builds the same world.
+    """
+    _set_value(db, ADVENTURE_SEED_KEY, seed)
+    _set_value(db, RNG_STATE_KEY, {})
+    _rng_services.discard(db)
+
+
+def _load_rng_service(db: Session) -> RNGService:
+    seed = get_adventure_seed(db)
+    if seed is None:
+        seed = secrets.randbits(63)
+        _set_value(db, ADVENTURE_SEED_KEY, seed)
+    return RNGService(seed, _get_value(db, RNG_STATE_KEY))
+
+
+def _persist_rng_state(session: Session, service: RNGService) -> None:
+    if service._streams:
+        _set_value(session, RNG_STATE_KEY, service.state())
+
+
+# Draws made in a rolled-back transaction are replayed from the saved state
+_rng_services = SessionCache(RNG_SERVICE_KEY, _load_rng_service, on_commit=_persist_rng_state)
+
+
+def rng_service(db: Session) -> RNGService:
+    """
+    Returns this session's RNG service, loading the adventure seed and saved
+    stream states on first use. An adventure without a seed gets a random one.
+    """
+    return _rng_services.get(db)
+
+
+def stream(db: Session | None, name: str) -> random.Random:
+    """
+    Returns the named stream of the session's adventure. Without a session,
+    returns the global random module, so callers outside an adventure still work.
+    """
+    if db is None:
+        return random
+    return rng_service(db).stream(name)
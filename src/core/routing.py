@@ -0,0 +1,147 @@
+"""
+This module plans routes between map points over the Paths the party knows.
+
+A per-session RouteGraph holds the known and explored Paths as an undirected
+adjacency list weighted by watches. Shortest routes come from Dijkstra's
+algorithm, and each source's shortest-path tree is cached, so after a few
+journeys the graph answers most queries from memory. Any change to a Path,
+whether flushed or written with a bulk statement, drops the graph, which is
+rebuilt on next use.
+"""
+
+import heapq
+from typing import Dict, List, NamedTuple
+from sqlalchemy.orm import Session
+from database.models import Path
+from .session_cache import SessionCache
+
+# Where a session keeps its route graph
+ROUTE_GRAPH_KEY = "route_graph"
+# Path statuses that routes may follow
+TRAVERSABLE_STATUSES = ("known", "explored")
+
+
+class Leg(NamedTuple):
+    path_id: int
+    start_point_id: int
+    end_point_id: int
+    watches: int
+
+
+class RouteGraph:
+    """Known Paths as an undirected graph, with cached shortest-path trees."""
+
+    def __init__(self):
+        # Map point id -> neighbour id -> (watches, path id) of the quickest path between them
+        self.adjacency: Dict[int, Dict[int, tuple[int, int]]] = {}
+        # Source id -> (watches to each reachable point, the leg that reaches it)
+        self._trees: Dict[int, tuple[Dict[int, int], Dict[int, Leg]]] = {}
+
+    @classmethod
+    def build(cls, db: Session) -> "RouteGraph":
+        graph = cls()
+        rows = (
+            db.query(Path.id, Path.start_point_id, Path.end_point_id, Path.watches)
+            .filter(Path.status.in_(TRAVERSABLE_STATUSES))
+            .all()
+        )
+        for path_id, start, end, watches in rows:
+            graph.add(path_id, start, end, watches or 1)
+        return graph
+
+    def add(self, path_id: int, start: int, end: int, watches: int) -> None:
+        for a, b in ((start, end), (end, start)):
+            neighbours = self.adjacency.setdefault(a, {})
+            if b not in neighbours or watches < neighbours[b][0]:
+                neighbours[b] = (watches, path_id)
+        self._trees.clear()
+
+    def _tree(self, source: int) -> tuple[Dict[int, int], Dict[int, Leg]]:
+        """Runs Dijkstra's algorithm from a source, once per graph."""
+        tree = self._trees.get(source)
+        if tree is not None:
+            return tree
+        distance = {source: 0}
+        via: Dict[int, Leg] = {}
+        heap = [(0, source)]
+        while heap:
+            watches, point = heapq.heappop(heap)
+            if watches > distance[point]:
+                continue
+            for neighbour, (cost, path_id) in self.adjacency.get(point, {}).items():
+                total = watches + cost
+                if total < distance.get(neighbour, total + 1):
+                    distance[neighbour] = total
+                    via[neighbour] = Leg(path_id, point, neighbour, cost)
+                    heapq.heappush(heap, (total, neighbour))
+        self._trees[source] = distance, via
+        return distance, via
+
+    def watches_between(self, start: int, end: int) -> int | None:
+        """The watches the quickest route takes, or None if there is none."""
+        return self._tree(start)[0].get(end)
+
+    def route(self, start: int, end: int) -> List[Leg] | None:
+        """
+        Returns the legs of the quickest route from one map point to another,
+        in travel order, or None if no known route joins them.
+        """
+        distance, via = self._tree(start)
+        if end not in distance:
+            return None
+        legs = []
+        point = end
+        while point != start:
+            leg = via[point]
+            legs.append(leg)
+            point = leg.start_point_id
+        legs.reverse()
+        return legs
+
+
+def _track_path_changes(session: Session, graph: RouteGraph) -> None:
+    """Drops a session's route graph once it flushes a change to any Path."""
+    if any(
+        isinstance(obj, Path)
+        for obj in list(session.new) + list(session.dirty) + list(session.deleted)
+    ):
+        _route_graphs.discard(session)
+
+
+_route_graphs = SessionCache(ROUTE_GRAPH_KEY, RouteGraph.build, (Path,), on_flush=_track_path_changes)
+
+
+def route_graph(db: Session) -> RouteGraph:
+    """Returns this session's route graph, building it on first use."""
+    return _route_graphs.get(db)
+
+
+def find_route(db: Session, start_id: int, end_id: int) -> List[Leg] | None:
+    """
+    Plans the quickest journey between two map points. Known routes come
+    first; failing one, any direct Path between the two will do, in either
+    direction and whatever its status, since it leaves from where the
+    traveller stands.
+
+    Returns:
+        The legs of the journey in travel order, or None if it cannot be made.
+    """
+    if start_id == end_id:
+        return []
+    # Flush pending Path changes first, so the graph reflects them
+    db.flush()
+    legs = route_graph(db).route(start_id, end_id)
+    if legs is not None:
+        return legs
+    direct = (
+        db.query(Path)
+        .filter(
+            ((Path.start_point_id == start_id) & (Path.end_point_id == end_id))
+            | ((Path.start_point_id == end_id) & (Path.end_point_id == start_id))
+        )
+        .order_by(Path.watches)
+        .first()
+    )
+    if direct is None:
+        return None
+    return [Leg(direct.id, start_id, end_id, direct.watches or 1)]
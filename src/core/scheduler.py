@@ -0,0 +1,146 @@
+"""
+This module keeps the adventure's game clock and schedules tension event
+deadlines against it.
+
+Each active TensionEvent stores the absolute watch its next deadline falls on
+(due_at_watch, indexed), so advancing time only has to touch events that are
+actually due. A per-session heap mirrors the schedule for "what's next" queries
+that need no table scan; bulk statements on TensionEvents drop it.
+"""
+
+import heapq
+from typing import NamedTuple
+from sqlalchemy.orm import Session
+from database.models import GAME_CLOCK_KEY, TensionEvent, WorldState
+from .session_cache import SessionCache
+
+# Where a session keeps its deadline queue
+DEADLINE_QUEUE_KEY = "deadline_queue"
+
+
+def get_game_clock(db: Session) -> int:
+    """Returns the number of watches elapsed since the adventure began."""
+    state = db.query(WorldState).filter(WorldState.key == GAME_CLOCK_KEY).first()
+    return int(state.value) if state and state.value is not None else 0
+
+
+def set_game_clock(db: Session, watch: int) -> None:
+    """Moves the game clock to an absolute watch."""
+    state = db.query(WorldState).filter(WorldState.key == GAME_CLOCK_KEY).first()
+    if state:
+        state.value = watch
+    else:
+        db.add(WorldState(key=GAME_CLOCK_KEY, value=watch))
+
+
+class Deadline(NamedTuple):
+    due_at_watch: int
+    event_id: int
+    title: str
+
+
+class DeadlineQueue:
+    """
+    A min-heap of active tension event deadlines. Rescheduled and finished
+    events leave stale heap entries behind, which are skipped when reached.
+    """
+
+    def __init__(self):
+        self._heap: list[Deadline] = []
+        self._current: dict[int, Deadline] = {}
+
+    @classmethod
+    def build(cls, db: Session) -> "DeadlineQueue":
+        queue = cls()
+        rows = (
+            db.query(TensionEvent.due_at_watch, TensionEvent.id, TensionEvent.title)
+            .filter(
+                TensionEvent.status == "active",
+                TensionEvent.due_at_watch.is_not(None),
+            )
+            .all()
+        )
+        queue._heap = [Deadline(*row) for row in rows]
+        queue._current = {deadline.event_id: deadline for deadline in queue._heap}
+        heapq.heapify(queue._heap)
+        return queue
+
+    def schedule(self, event_id: int, due_at_watch: int, title: str) -> None:
+        deadline = Deadline(due_at_watch, event_id, title)
+        if self._current.get(event_id) == deadline:
+            return
+        self._current[event_id] = deadline
+        heapq.heappush(self._heap, deadline)
+
+    def remove(self, event_id: int) -> None:
+        self._current.pop(event_id, None)
+
+    def _drop_stale(self) -> None:
+        while self._heap and self._current.get(self._heap[0].event_id) != self._heap[0]:
+            heapq.heappop(self._heap)
+
+    def next_deadline(self) -> Deadline | None:
+        """Returns the soonest deadline, if any event is active."""
+        self._drop_stale()
+        return self._heap[0] if self._heap else None
+
+    def upcoming(self, limit: int = 3) -> list[Deadline]:
+        """Returns the soonest deadlines, soonest first."""
+        self._drop_stale()
+        return heapq.nsmallest(
+            limit,
+            (d for d in self._heap if self._current.get(d.event_id) == d),
+        )
+
+    def __len__(self) -> int:
+        return len(self._current)
+
+
+def _track_deadline_changes(session: Session, queue: DeadlineQueue) -> None:
+    """Keeps a session's deadline queue current with what it flushes."""
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, TensionEvent):
+            continue
+        if obj.status == "active" and obj.due_at_watch is not None:
+            queue.schedule(obj.id, obj.due_at_watch, obj.title)
+        else:
+            queue.remove(obj.id)
+    for obj in session.deleted:
+        if isinstance(obj, TensionEvent):
+            queue.remove(obj.id)
+
+
+_deadline_queues = SessionCache(
+    DEADLINE_QUEUE_KEY, DeadlineQueue.build, (TensionEvent,), on_flush=_track_deadline_changes
+)
+
+
+def deadline_queue(db: Session) -> DeadlineQueue:
+    """Returns this session's deadline queue, building it on first use."""
+    return _deadline_queues.get(db)
+
+
+def upcoming_deadlines(db: Session, limit: int = 3) -> list[dict]:
+    """
+    Lists the next tension event deadlines with the watches left until each.
+
+    Returns:
+        Dicts with the event id, title, due watch and watches remaining.
+    """
+    clock = get_game_clock(db)
+    return [
+        {
+            "tension_event_id": deadline.event_id,
+            "title": deadline.title,
+            "due_at_watch": deadline.due_at_watch,
+            "watches_remaining": deadline.due_at_watch - clock,
+        }
+        for deadline in deadline_queue(db).upcoming(limit)
+    ]
+
+
+def watches_until_deadline(db: Session, event: TensionEvent) -> int | None:
+    """Returns the live number of watches before an active event's next deadline."""
+    if event.status != "active" or event.due_at_watch is None:
+        return None
+    return event.due_at_watch - get_game_clock(db)
@@ -0,0 +1,95 @@
+"""
+This module keeps derived state, such as indexes and graphs over tables, in
+a session's info dict.
+
+A SessionCache builds its value on first use and listens to the session from
+then on. Flushes can keep the value current; bulk insert, update and delete
+statements on the tables it is built from drop it, unless the statement is
+marked with the CACHES_UPDATED execution option by a caller that updated the
+cache itself; and a rollback always drops it, since rolled-back changes may
+already be in it. A dropped value is rebuilt on next use.
+"""
+
+from typing import Any, Callable, Tuple
+from sqlalchemy import event as sa_event
+from sqlalchemy.orm import Session
+
+# Execution option marking a bulk statement whose caller updates the caches itself
+CACHES_UPDATED = "caches_updated"
+
+
+class SessionCache:
+    """A value kept in Session.info under a key, with the listeners that maintain it."""
+
+    def __init__(
+        self,
+        key: str,
+        build: Callable[[Session], Any],
+        models: Tuple[type, ...] = (),
+        on_flush: Callable[[Session, Any], None] | None = None,
+        on_commit: Callable[[Session, Any], None] | None = None,
+    ):
+        """
+        Args:
+            key: Where sessions keep the value.
+            build: Builds the value from a session.
+            models: The models whose bulk writes drop the value.
+            on_flush: Brings the value up to date with what a session flushed.
+            on_commit: Called with the value before a session commits.
+        """
+        self.key = key
+        self.build = build
+        self.models = models
+        self.on_flush = on_flush
+        self.on_commit = on_commit
+
+    def get(self, db: Session) -> Any:
+        """Returns this session's value, building it on first use."""
+        value = db.info.get(self.key)
+        if value is None:
+            value = self.build(db)
+            db.info[self.key] = value
+            self._listen(db)
+        return value
+
+    def peek(self, db: Session) -> Any | None:
+        """Returns this session's value if it has been built."""
+        return db.info.get(self.key)
+
+    def discard(self, db: Session) -> None:
+        """Drops this session's value, so it is rebuilt on next use."""
+        db.info.pop(self.key, None)
+
+    def _listen(self, db: Session) -> None:
+        if sa_event.contains(db, "after_rollback", self._after_rollback):
+            return
+        sa_event.listen(db, "after_rollback", self._after_rollback)
+        if self.on_flush:
+            sa_event.listen(db, "after_flush", self._after_flush)
+        if self.models:
+            sa_event.listen(db, "do_orm_execute", self._before_bulk_write)
+        if self.on_commit:
+            sa_event.listen(db, "before_commit", self._before_commit)
+
+    def _after_flush(self, session: Session, flush_context) -> None:
+        value = self.peek(session)
+        if value is not None:
+            self.on_flush(session, value)
+
+    def _before_bulk_write(self, orm_execute_state) -> None:
+        mapper = orm_execute_state.bind_mapper
+        if (
+            (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete)
+            and mapper is not None
+            and mapper.class_ in self.models
+            and not orm_execute_state.execution_options.get(CACHES_UPDATED)
+        ):
+            self.discard(orm_execute_state.session)
+
+    def _before_commit(self, session: Session) -> None:
+        value = self.peek(session)
+        if value is not None:
+            self.on_commit(session, value)
+
+    def _after_rollback(self, session: Session) -> None:
+        self.discard(session)
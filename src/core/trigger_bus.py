@@ -0,0 +1,127 @@
+"""
+This module collects the domain events a turn produces (a death, a visit, a
+delivery) and hands them to the handlers subscribed to them.
+
+While a session has an open bus, published triggers are queued, duplicates
+are dropped, and each handler receives all of its triggers in one call when
+the bus is dispatched, just before the turn commits. Without an open bus a
+trigger is dispatched as soon as it is published, so tools still work when
+called outside a turn.
+
+Handlers are registered per trigger type with subscribe(), so new kinds of
+trigger or new reactions to them need no changes in the tools that raise them.
+"""
+
+import json
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple
+from sqlalchemy import event as sa_event
+from sqlalchemy.orm import Session
+
+# Where a session keeps its open trigger bus
+TRIGGER_BUS_KEY = "trigger_bus"
+
+
+class Trigger(NamedTuple):
+    trigger_type: str
+    data: Dict[str, Any]
+
+
+TriggerHandler = Callable[[Session, List[Trigger]], None]
+
+_handlers: Dict[str, List[TriggerHandler]] = defaultdict(list)
+
+
+def subscribe(trigger_types: Iterable[str], handler: TriggerHandler) -> None:
+    """
+    Registers a handler for some trigger types. A handler is called once per
+    dispatch with every pending trigger of those types, in publish order.
+    """
+    for trigger_type in trigger_types:
+        if handler not in _handlers[trigger_type]:
+            _handlers[trigger_type].append(handler)
+
+
+def unsubscribe(trigger_types: Iterable[str], handler: TriggerHandler) -> None:
+    for trigger_type in trigger_types:
+        if handler in _handlers.get(trigger_type, []):
+            _handlers[trigger_type].remove(handler)
+
+
+class TriggerBus:
+    """The triggers published during one turn, without duplicates."""
+
+    def __init__(self):
+        self._pending: Dict[tuple, Trigger] = {}
+
+    def publish(self, trigger: Trigger) -> None:
+        data_key = json.dumps(trigger.data, sort_keys=True, default=str)
+        self._pending.setdefault((trigger.trigger_type, data_key), trigger)
+
+    def clear(self) -> None:
+        self._pending.clear()
+
+    @property
+    def pending(self) -> List[Trigger]:
+        return list(self._pending.values())
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+
+def _deliver(db: Session, triggers: List[Trigger]) -> None:
+    """Calls each subscribed handler once with the triggers it asked for."""
+    by_handler: Dict[TriggerHandler, List[Trigger]] = {}
+    for trigger in triggers:
+        for handler in _handlers.get(trigger.trigger_type, []):
+            by_handler.setdefault(handler, []).append(trigger)
+    for handler, handler_triggers in by_handler.items():
+        handler(db, handler_triggers)
+
+
+def _clear_trigger_bus(session: Session) -> None:
+    # Triggers raised by rolled-back changes never happened
+    bus = session.info.get(TRIGGER_BUS_KEY)
+    if bus is not None:
+        bus.clear()
+
+
+def open_bus(db: Session) -> TriggerBus:
+    """Starts collecting this session's triggers until dispatch() is called."""
+    bus = db.info.get(TRIGGER_BUS_KEY)
+    if bus is None:
+        bus = TriggerBus()
+        db.info[TRIGGER_BUS_KEY] = bus
+        if not sa_event.contains(db, "after_rollback", _clear_trigger_bus):
+            sa_event.listen(db, "after_rollback", _clear_trigger_bus)
+    return bus
+
+
+def publish(db: Session, trigger_type: str, data: Dict[str, Any]) -> None:
+    """
+    Raises a trigger. It is queued if the session has an open bus and handled
+    right away otherwise.
+    """
+    trigger = Trigger(trigger_type, data)
+    bus = db.info.get(TRIGGER_BUS_KEY)
+    if bus is not None:
+        bus.publish(trigger)
+    else:
+        _deliver(db, [trigger])
+
+
+def dispatch(db: Session) -> int:
+    """
+    Closes the session's bus and hands its triggers to their handlers in one
+    batched pass. Triggers published by the handlers themselves are handled
+    immediately. Committing is left to the caller.
+
+    Returns:
+        The number of distinct triggers dispatched.
+    """
+    bus = db.info.pop(TRIGGER_BUS_KEY, None)
+    if not bus:
+        return 0
+    triggers = bus.pending
+    _deliver(db, triggers)
+    return len(triggers)
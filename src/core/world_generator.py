@@ -1,8 +1,11 @@
 import random
 import json
 import datetime
+import time
+from typing import Any, Dict, NamedTuple
+import numpy as np
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
+from sqlalchemy import func, insert
 from database.models import (
     WorldState,
     MapPoint,
@@ -33,29 +36,221 @@ from .oracles import (
     SPEECH,
     VIRTUE,
     VICE,
+    OracleRoller,
 )
 from core.llm_service import LLMService
+from core.character_generator import CharacterGenerator, entity_rows
+from core.path_planner import plan_paths, watches_between
+from core.rng import WORLD_GEN, stream
+from core.scheduler import get_game_clock
+
+
+def _mentioned(names: list, text: str) -> list:
+    """Returns the names that appear in a lowercased text."""
+    return [name for name in names if name and name.lower() in text]
+
+
+def _trigger_is(trigger_type: str) -> dict:
+    return {"eq": ["trigger_type", trigger_type]}
+
+
+def _all(*predicates: dict) -> dict:
+    return {"all": list(predicates)}
+
+
+class PlannedRow(dict):
+    """A row of a WorldPlan, whose columns read and write as attributes, like a model's."""
+
+    def __getattr__(self, column: str) -> Any:
+        try:
+            return self[column]
+        except KeyError:
+            raise AttributeError(column) from None
+
+    def __setattr__(self, column: str, value: Any) -> None:
+        self[column] = value
+
+
+class WorldPlan:
+    """
+    The rows of a world being generated, held in memory until it is written.
+    Ids are handed out up front, after each table's current highest, so rows
+    can refer to each other before any of them exist; every row carries all
+    of its table's columns, so each table is written with a single insert.
+    """
+
+    # In an order their foreign keys can be inserted in
+    MODELS = (
+        WorldState, MapPoint, Location, LocationConnection,
+        GameEntity, Item, TensionEvent, ResolutionCondition,
+    )
+
+    def __init__(self, db: Session):
+        self.rows: Dict[type, list] = {model: [] for model in self.MODELS}
+        self._next_id = {
+            model: (db.query(func.max(model.id)).scalar() or 0) + 1 for model in self.MODELS
+        }
+
+    def add(self, model: type, **values) -> PlannedRow:
+        """Plans a row, filling the columns left out with their defaults."""
+        row = PlannedRow(id=self._next_id[model])
+        self._next_id[model] += 1
+        for column in model.__table__.columns:
+            if column.key == "id":
+                continue
+            if column.key in values:
+                row[column.key] = values[column.key]
+            elif column.default is None:
+                row[column.key] = None
+            elif column.default.is_callable:
+                row[column.key] = column.default.arg(None)
+            else:
+                row[column.key] = column.default.arg
+        self.rows[model].append(row)
+        return row
+
+    def world_state(self, key: str) -> Any:
+        """The value of a planned WorldState entry, if any."""
+        for row in self.rows[WorldState]:
+            if row.key == key:
+                return row.value
+        return None
+
+    def persist(self, db: Session, seconds: Dict[str, float]) -> Dict[str, int]:
+        """
+        Inserts every planned row, one statement per table, without committing.
+
+        Args:
+            seconds: Receives the time each table's insert took, by table name.
+
+        Returns:
+            The number of rows inserted into each table.
+        """
+        counts = {}
+        for model, rows in self.rows.items():
+            if not rows:
+                continue
+            started = time.perf_counter()
+            db.execute(insert(model), rows)
+            seconds[model.__tablename__] = time.perf_counter() - started
+            counts[model.__tablename__] = len(rows)
+        return counts
+
+
+class GenerationReport(NamedTuple):
+    # Table name -> rows inserted
+    rows: Dict[str, int]
+    # Phase ("llm", "planning", a table name, "paths", "commit", "total") -> seconds
+    seconds: Dict[str, float]
+
+
+def generate_paths(db: Session, oracles: OracleRoller, commit: bool = True) -> int:
+    """
+    Joins every POI into one connected network: a minimum spanning tree
+    over their positions plus paths to each POI's nearest neighbours, with
+    watches that follow the distance. All paths go in with one insert.
+    Path features are sampled from the given oracle roller.
+
+    Returns:
+        The number of paths created.
+    """
+    pois = db.query(MapPoint.id, MapPoint.position_x, MapPoint.position_y).all()
+    if len(pois) < 2:
+        return 0
+
+    ids = [poi.id for poi in pois]
+    positions = np.array([(poi.position_x or 0, poi.position_y or 0) for poi in pois], dtype=float)
+    existing = {
+        frozenset(pair)
+        for pair in db.query(Path.start_point_id, Path.end_point_id)
+    }
+    edges = [
+        (i, j) for i, j in plan_paths(positions)
+        if frozenset((ids[i], ids[j])) not in existing
+    ]
+    if not edges:
+        return 0
+
+    features = oracles.sample(PATH_FEATURES, len(edges))
+    rows = [
+        {
+            "start_point_id": ids[i],
+            "end_point_id": ids[j],
+            "status": "hidden",
+            "watches": watches_between(positions[i], positions[j]),
+            "feature": f"{feature} ({condition})",
+        }
+        for (i, j), (feature, condition) in zip(edges, features)
+    ]
+    db.execute(insert(Path), rows)
+    if commit:
+        db.commit()
+    return len(rows)
 
 
 class WorldGenerator:
     """Procedurally generates a new world state based on Cairn rules."""
 
-    def __init__(self, db_session: Session, llm_service: LLMService):
+    def __init__(self, db_session: Session, llm_service: LLMService, rng: random.Random | None = None):
         self.db = db_session
         self.llm_service = llm_service
+        # The adventure's world generation stream, so a seed always builds the same world
+        self.rng = rng or stream(db_session, WORLD_GEN)
+        self.oracles = OracleRoller(self.rng)
+        # The world being generated, while generate_new_world runs
+        self.plan: WorldPlan | None = None
+        self._llm_seconds = 0.0
+        self._clock = 0
+
+    def generate_new_world(self) -> GenerationReport:
+        """
+        Main method to orchestrate the world generation process.
 
-    def generate_new_world(self):
-        """Main method to orchestrate the world generation process."""
-        self._generate_region_theme()
-        self._generate_factions()
-        self._generate_topography_and_pois()
-        self._generate_paths()
+        The world is first built in memory as a WorldPlan, then written with
+        one bulk insert per table and a single commit, so database time grows
+        with the number of rows rather than with round trips.
+
+        Returns:
+            The rows written and the time spent in each phase.
+        """
+        started = time.perf_counter()
+        seconds: Dict[str, float] = {}
+        self.plan = WorldPlan(self.db)
+        self._llm_seconds = 0.0
+        self._clock = get_game_clock(self.db)
+        try:
+            self._generate_region_theme()
+            self._generate_factions()
+            self._generate_topography_and_pois()
+            seconds["llm"] = self._llm_seconds
+            seconds["planning"] = time.perf_counter() - started - self._llm_seconds
+
+            rows = self.plan.persist(self.db, seconds)
+            step = time.perf_counter()
+            rows["path"] = self._generate_paths(commit=False)
+            seconds["paths"] = time.perf_counter() - step
+
+            step = time.perf_counter()
+            self.db.commit()
+            seconds["commit"] = time.perf_counter() - step
+        finally:
+            self.plan = None
+        seconds["total"] = time.perf_counter() - started
+        return GenerationReport(rows, seconds)
+
+    def _generate_response(self, prompt: str) -> str:
+        """Asks the LLM, keeping count of the time spent waiting on it."""
+        started = time.perf_counter()
+        try:
+            return self.llm_service.generate_response(prompt)
+        finally:
+            self._llm_seconds += time.perf_counter() - started
 
     def _d20(self):
-        return random.randint(1, 20)
+        return self.rng.randint(1, 20)
 
     def _d6(self):
-        return random.randint(1, 6)
+        return self.rng.randint(1, 6)
 
     def _generate_region_theme(self):
         culture = CULTURE.get(self._d20(), ("Artistic", "Control"))
@@ -64,11 +259,10 @@ class WorldGenerator:
             "culture": f"{culture[0]} ({culture[1]})",
             "resources": f"{resources[0]} (Scarce: {resources[1]})",
         }
-        self.db.add(WorldState(key="region_theme", value=theme))
-        self.db.commit()
+        self.plan.add(WorldState, key="region_theme", value=theme)
 
     def _generate_factions(self):
-        num_factions = random.randint(1, 3)
+        num_factions = self.rng.randint(1, 3)
         factions = []
         for _ in range(num_factions):
             faction_type = FACTION_TYPES.get(self._d20(), ("Criminals", "Blacksmith"))
@@ -84,10 +278,9 @@ class WorldGenerator:
                     "agenda": f"{agenda} (Obstacle: {obstacle})",
                 }
             )
-        self.db.add(WorldState(key="factions", value=factions))
-        self.db.commit()
+        self.plan.add(WorldState, key="factions", value=factions)
 
-    def _enrich_regular_poi_with_llm(self, map_point: MapPoint):
+    def _enrich_regular_poi_with_llm(self, map_point: PlannedRow):
         """Uses the LLM to generate a rich description and interconnected locations for a regular POI."""
         prompt = f"""
         You are a creative, dark fantasy Game Master generating a new area for a solo RPG based on the game Cairn.
@@ -135,7 +328,7 @@ class WorldGenerator:
 
         Now, generate the JSON for the provided Point of Interest.
         """
-        llm_response_str = self.llm_service.generate_response(prompt)
+        llm_response_str = self._generate_response(prompt)
 
         try:
             # The response might be wrapped in markdown, so we need to extract the JSON
@@ -147,14 +340,13 @@ class WorldGenerator:
             # Create locations
             created_locations = {}
             for i, loc_data in enumerate(enriched_data.get("locations", [])):
-                new_loc = Location(
+                new_loc = self.plan.add(
+                    Location,
                     name=loc_data.get("name"),
                     description=loc_data.get("description"),
-                    map_point=map_point,
+                    map_point_id=map_point.id,
                     is_entry_point=(i == 0),  # First location is the entry point
                 )
-                self.db.add(new_loc)
-                self.db.flush()  # Flush to get the ID for connections
                 created_locations[new_loc.name] = new_loc
 
                 # Populate contents
@@ -162,60 +354,56 @@ class WorldGenerator:
                     # Simple check to differentiate items from entities
                     if "hp" in item_or_entity_name.lower():
                         # It's likely a creature
-                        new_entity = GameEntity(
+                        self.plan.add(
+                            GameEntity,
                             name=item_or_entity_name.split("(")[0].strip(),
                             entity_type="Monster",
                             description=item_or_entity_name,
                             current_location_id=new_loc.id,
                             current_map_point_id=map_point.id,
                         )
-                        self.db.add(new_entity)
                     else:
                         # It's likely an item
-                        new_item = Item(
+                        self.plan.add(
+                            Item,
                             name=item_or_entity_name,
                             description="An item of interest.",
                             location_id=new_loc.id,
                         )
-                        self.db.add(new_item)
 
-            # Create connections
+            # Create connections, once per pair of locations
+            connected = set()
             for source_name, dest_names in enriched_data.get("connections", {}).items():
                 source_loc = created_locations.get(source_name)
                 if source_loc:
                     for dest_name in dest_names:
                         dest_loc = created_locations.get(dest_name)
-                        if dest_loc:
-                            # Avoid duplicate connections
-                            existing = self.db.query(LocationConnection).filter(
-                                LocationConnection.source_location_id == source_loc.id,
-                                LocationConnection.destination_location_id == dest_loc.id
-                            ).first()
-                            if not existing:
-                                conn = LocationConnection(
-                                    source_location_id=source_loc.id,
-                                    destination_location_id=dest_loc.id,
-                                    description=f"A path leads from {source_name} to {dest_name}.",
-                                    is_two_way=True, # Assuming two-way for now
-                                )
-                                self.db.add(conn)
+                        if dest_loc and (source_loc.id, dest_loc.id) not in connected:
+                            connected.add((source_loc.id, dest_loc.id))
+                            self.plan.add(
+                                LocationConnection,
+                                source_location_id=source_loc.id,
+                                destination_location_id=dest_loc.id,
+                                description=f"A path leads from {source_name} to {dest_name}.",
+                                is_two_way=True, # Assuming two-way for now
+                            )
 
         except (json.JSONDecodeError, AttributeError) as e:
             print(f"Error processing LLM response for world generation: {e}")
             # Fallback to a single, simple location if enrichment fails
-            fallback_location = Location(
+            self.plan.add(
+                Location,
                 name=f"Entrance to {map_point.name}",
                 description=f"The main entrance to {map_point.name}.",
-                map_point=map_point,
+                map_point_id=map_point.id,
                 is_entry_point=True,
             )
-            self.db.add(fallback_location)
 
-    def _enrich_settlement_with_llm(self, map_point: MapPoint):
+    def _enrich_settlement_with_llm(self, map_point: PlannedRow):
         """Uses the LLM to generate a populated settlement with NPCs and tension events."""
         # Get regional context for settlement generation
-        region_theme = self.db.query(WorldState).filter(WorldState.key == "region_theme").first()
-        culture_resources = region_theme.value if region_theme else {"culture": "Artistic (Control)", "resources": "Herbs (Scarce: Medicine)"}
+        region_theme = self.plan.world_state("region_theme")
+        culture_resources = region_theme or {"culture": "Artistic (Control)", "resources": "Herbs (Scarce: Medicine)"}
         
         # Extract settlement type from the MapPoint type
         settlement_type = map_point.type.replace("Settlement - ", "")
@@ -292,22 +480,21 @@ Now generate the settlement JSON:
 """
 
         try:
-            llm_response_str = self.llm_service.generate_response(prompt)
+            llm_response_str = self._generate_response(prompt)
             json_str = llm_response_str.strip().replace("```json", "").replace("```", "").strip()
             settlement_data = json.loads(json_str)
             
             # Process settlement summary
-            self.db.query(MapPoint).filter(MapPoint.id == map_point.id).update({
-                "summary": settlement_data.get("summary", "A bustling settlement with urgent problems.")
-            })
+            map_point.summary = settlement_data.get("summary", "A bustling settlement with urgent problems.")
             
             # Create locations with settlement-specific data
             created_locations = {}
             for i, loc_data in enumerate(settlement_data.get("locations", [])):
-                new_loc = Location(
+                new_loc = self.plan.add(
+                    Location,
                     name=loc_data.get("name"),
                     description=loc_data.get("description"),
-                    map_point=map_point,
+                    map_point_id=map_point.id,
                     is_entry_point=(i == 0),  # First location is always entry point
                     contents={
                         "function": loc_data.get("function"),
@@ -315,14 +502,13 @@ Now generate the settlement JSON:
                         "raw_contents": loc_data.get("contents", [])
                     }
                 )
-                self.db.add(new_loc)
-                self.db.flush()
                 created_locations[new_loc.name] = new_loc
                 
                 # Populate location contents (NPCs, items, etc.)
                 self._populate_settlement_location_contents(new_loc, loc_data.get("contents", []))
             
-            # Create location connections
+            # Create location connections, once per pair of locations
+            connected = set()
             connections_map = settlement_data.get("connections", {})
             for source_name, destination_names in connections_map.items():
                 source_location = created_locations.get(source_name)
@@ -331,23 +517,17 @@ Now generate the settlement JSON:
                     
                 for dest_name in destination_names:
                     dest_location = created_locations.get(dest_name)
-                    if not dest_location:
+                    if not dest_location or (source_location.id, dest_location.id) in connected:
                         continue
                         
-                    # Check for existing connection to avoid duplicates
-                    existing = self.db.query(LocationConnection).filter(
-                        LocationConnection.source_location_id == source_location.id,
-                        LocationConnection.destination_location_id == dest_location.id
-                    ).first()
-                    
-                    if not existing:
-                        connection = LocationConnection(
-                            source_location_id=source_location.id,
-                            destination_location_id=dest_location.id,
-                            description=f"A path connects {source_name} to {dest_name}.",
-                            is_two_way=True
-                        )
-                        self.db.add(connection)
+                    connected.add((source_location.id, dest_location.id))
+                    self.plan.add(
+                        LocationConnection,
+                        source_location_id=source_location.id,
+                        destination_location_id=dest_location.id,
+                        description=f"A path connects {source_name} to {dest_name}.",
+                        is_two_way=True
+                    )
             
             # Create tension events
             tensions = settlement_data.get("active_tensions", [])
@@ -359,8 +539,9 @@ Now generate the settlement JSON:
             # Fallback to basic settlement
             self._create_fallback_settlement(map_point)
 
-    def _populate_settlement_location_contents(self, location: Location, contents_list: list):
+    def _populate_settlement_location_contents(self, location: PlannedRow, contents_list: list):
         """Populates a settlement location with NPCs, items, and other content."""
+        npc_descriptions = []
         for content_item in contents_list:
             content_lower = content_item.lower()
             
@@ -370,48 +551,65 @@ Now generate the settlement JSON:
                 "farmer", "scholar", "captain", "healer", "worried", "angry", 
                 "desperate", "busy", "talking", "standing", "working"
             ]):
-                self._create_settlement_npc(location, content_item)
+                npc_descriptions.append(content_item)
             
             # Detect items or atmospheric elements
             else:
                 # Store as atmospheric description in location contents
-                current_contents = location.contents if location.contents else {}
-                atmospheric = current_contents.get("atmospheric", [])
-                atmospheric.append(content_item)
-                current_contents["atmospheric"] = atmospheric
-                # Update the location contents properly
-                self.db.query(Location).filter(Location.id == location.id).update({
-                    "contents": current_contents
-                })
-
-    def _create_settlement_npc(self, location: Location, description: str):
-        """Creates an NPC GameEntity from a description string."""
-        # Extract name (first capitalized word or phrase before parentheses/commas)
-        name_parts = description.split("(")[0].split(",")[0].strip()
-        name = name_parts if name_parts else "Local Resident"
-        
-        # Basic NPC stats (settlement NPCs are generally non-hostile)
-        npc = GameEntity(
-            name=name,
+                if location.contents is None:
+                    location.contents = {}
+                location.contents.setdefault("atmospheric", []).append(content_item)
+
+        self._create_settlement_npcs(location, npc_descriptions)
+
+    def _create_settlement_npcs(self, location: Location | PlannedRow, descriptions: list):
+        """Creates an NPC GameEntity with rolled stats from each description string."""
+        names = []
+        for description in descriptions:
+            # Extract name (first capitalized word or phrase before parentheses/commas)
+            name_parts = description.split("(")[0].split(",")[0].strip()
+            names.append(name_parts if name_parts else "Local Resident")
+        self._insert_npcs(location, len(descriptions), name=names, description=list(descriptions))
+
+    def populate_npcs(self, location: Location, count: int) -> int:
+        """
+        Fills a location with generated NPCs, rolled and inserted in bulk.
+
+        Returns:
+            The number of NPCs created.
+        """
+        return self._insert_npcs(location, count)
+
+    def _insert_npcs(self, location: Location | PlannedRow, count: int, **fields) -> int:
+        """Inserts rolled NPCs, or adds them to the world being planned if there is one."""
+        if count <= 0:
+            return 0
+        columns = CharacterGenerator(self.rng).generate_characters(count, details=False)
+        if "description" not in fields:
+            fields["description"] = [
+                f"A {physique.lower()} {background.lower()} with a {speech.lower()} voice."
+                for physique, background, speech in zip(
+                    columns["physique"], columns["background"], columns["speech"]
+                )
+            ]
+        # Settlement NPCs are generally non-hostile
+        rows = entity_rows(
+            columns,
             entity_type="NPC",
-            description=description,
             current_location_id=location.id,
             current_map_point_id=location.map_point_id,
             disposition="neutral",
             is_hostile=False,
-            hp=3,
-            max_hp=3,
-            strength=10,
-            max_strength=10,
-            dexterity=10,
-            max_dexterity=10,
-            willpower=10,
-            max_willpower=10
+            **fields,
         )
-        
-        self.db.add(npc)
+        if self.plan is not None:
+            for row in rows:
+                self.plan.add(GameEntity, **row)
+        else:
+            self.db.execute(insert(GameEntity), rows)
+        return count
 
-    def _create_tension_event_from_data(self, tension_data: dict, map_point: MapPoint, created_locations: dict):
+    def _create_tension_event_from_data(self, tension_data: dict, map_point: PlannedRow, created_locations: dict):
         """Creates a TensionEvent and ResolutionConditions from settlement data."""
         urgency_to_watches = {
             "immediate": 2,
@@ -423,7 +621,9 @@ Now generate the settlement JSON:
         urgency = tension_data.get("urgency", "urgent")
         deadline_watches = urgency_to_watches.get(urgency, 4)
         
-        tension_event = TensionEvent(
+        # Bulk inserts skip the ORM's before_insert hook, so the deadline is scheduled here
+        tension_event = self.plan.add(
+            TensionEvent,
             title=tension_data.get("title"),
             description=tension_data.get("description"),
             source_type="settlement_problem",
@@ -436,49 +636,94 @@ Now generate the settlement JSON:
             max_severity=5,
             deadline_watches=deadline_watches,
             watches_remaining=deadline_watches,
+            due_at_watch=self._clock + deadline_watches,
             status="active",
             origin_map_point_id=map_point.id
         )
         
-        self.db.add(tension_event)
-        self.db.flush()
+        # Resolution conditions are written against the settlement's real names
+        npcs = [
+            npc for npc in self.plan.rows[GameEntity]
+            if npc.current_map_point_id == map_point.id and npc.entity_type == "NPC"
+        ]
+        source_location = created_locations.get(tension_data.get("source_location"))
+        context = {
+            "location_names": list(created_locations),
+            "npc_names": [npc.name for npc in npcs],
+            "source_location_name": source_location.name if source_location else None,
+            "source_npc_names": [
+                npc.name for npc in npcs
+                if source_location and npc.current_location_id == source_location.id
+            ],
+        }
         
         # Create resolution conditions for each potential solution
         solutions = tension_data.get("potential_solutions", [])
         for solution in solutions:
-            condition = self._create_resolution_condition_from_solution(tension_event.id, solution)
-            self.db.add(condition)
+            condition = self._create_resolution_condition_from_solution(
+                tension_event.id, solution, context
+            )
+            self.plan.add(
+                ResolutionCondition,
+                tension_event_id=condition.tension_event_id,
+                condition_type=condition.condition_type,
+                description=condition.description,
+                target_data=condition.target_data,
+                is_met=condition.is_met,
+            )
 
-    def _create_resolution_condition_from_solution(self, tension_event_id: int, solution_description: str) -> ResolutionCondition:
-        """Creates a ResolutionCondition from a solution description."""
+    def _create_resolution_condition_from_solution(
+        self, tension_event_id: int, solution_description: str, context: dict | None = None
+    ) -> ResolutionCondition:
+        """
+        Creates a ResolutionCondition from a solution description.
+        
+        The condition carries a predicate (see core.predicates) over the triggers
+        that would meet it, built from the settlement's locations and NPCs, so it
+        can be resolved without an LLM call. Solutions that name nothing known
+        stay custom conditions with only a description.
+        """
         solution_lower = solution_description.lower()
+        context = context or {}
+        locations = context.get("location_names", [])
+        npcs = context.get("npc_names", [])
+        mentioned_locations = _mentioned(locations, solution_lower)
+        mentioned_npcs = _mentioned(npcs, solution_lower)
+        source_location = context.get("source_location_name")
         
+        condition_type, predicate = "custom", None
         # Parse solution type from description
         if "kill" in solution_lower or "defeat" in solution_lower or "eliminate" in solution_lower:
-            return ResolutionCondition(
-                tension_event_id=tension_event_id,
-                condition_type="entity_death",
-                description=solution_description,
-                target_data={"entity_name": "threatening creature"},
-                is_met=False
-            )
+            condition_type = "entity_death"
+            if mentioned_npcs:
+                predicate = _all(_trigger_is("entity_death"), {"in": ["entity_name", mentioned_npcs]})
+            else:
+                # Any hostile creature slain in (or near) the troubled place
+                scope = mentioned_locations or ([source_location] if source_location else locations)
+                parts = [_trigger_is("entity_death"), {"eq": ["is_hostile", True]}]
+                if scope:
+                    parts.append({"in": ["location_name", scope]})
+                predicate = _all(*parts)
         elif "deliver" in solution_lower or "bring" in solution_lower or "find" in solution_lower:
-            return ResolutionCondition(
-                tension_event_id=tension_event_id,
-                condition_type="item_delivery",
-                description=solution_description,
-                target_data={"item_name": "needed item", "receiver_name": "requesting NPC"},
-                is_met=False
-            )
+            condition_type = "item_delivery"
+            receivers = mentioned_npcs or context.get("source_npc_names") or npcs
+            if receivers:
+                predicate = _all(_trigger_is("item_delivery"), {"in": ["receiver_name", receivers]})
         elif "visit" in solution_lower or "go to" in solution_lower or "travel" in solution_lower:
-            return ResolutionCondition(
-                tension_event_id=tension_event_id,
-                condition_type="location_visit",
-                description=solution_description,
-                target_data={"location_name": "target location"},
-                is_met=False
-            )
-        else:
+            condition_type = "location_visit"
+            destinations = mentioned_locations or ([source_location] if source_location else [])
+            if destinations:
+                predicate = _all(_trigger_is("location_visit"), {"in": ["location_name", destinations]})
+        elif mentioned_locations or mentioned_npcs:
+            # Complex solutions are met by reaching what they name
+            alternatives = []
+            if mentioned_locations:
+                alternatives.append(_all(_trigger_is("location_visit"), {"in": ["location_name", mentioned_locations]}))
+            if mentioned_npcs:
+                alternatives.append(_all(_trigger_is("item_delivery"), {"in": ["receiver_name", mentioned_npcs]}))
+            predicate = {"any": alternatives}
+        
+        if predicate is None:
             # Generic condition for complex solutions
             return ResolutionCondition(
                 tension_event_id=tension_event_id,
@@ -487,24 +732,31 @@ Now generate the settlement JSON:
                 target_data={"description": solution_description},
                 is_met=False
             )
+        return ResolutionCondition(
+            tension_event_id=tension_event_id,
+            condition_type=condition_type,
+            description=solution_description,
+            target_data={"description": solution_description, "predicate": predicate},
+            is_met=False
+        )
 
-    def _create_fallback_settlement(self, map_point: MapPoint):
+    def _create_fallback_settlement(self, map_point: PlannedRow):
         """Creates a basic settlement if LLM generation fails."""
         map_point.summary = f"A small {map_point.type.lower()} with urgent problems that need attention."
         
         # Create basic entry location
-        entry_location = Location(
+        entry_location = self.plan.add(
+            Location,
             name=f"Entrance to {map_point.name}",
             description=f"The main entrance to {map_point.name}. People move about with worried expressions.",
-            map_point=map_point,
+            map_point_id=map_point.id,
             is_entry_point=True,
             contents={"function": "Entry point", "current_situation": "Travelers arrive seeking help"}
         )
-        self.db.add(entry_location)
-        self.db.flush()
         
         # Create a basic NPC with a problem
-        worried_elder = GameEntity(
+        self.plan.add(
+            GameEntity,
             name="Worried Elder",
             entity_type="NPC",
             description="An elderly resident with deep concern etched on their weathered face",
@@ -515,19 +767,18 @@ Now generate the settlement JSON:
             hp=2, max_hp=2, strength=8, max_strength=8,
             dexterity=8, max_dexterity=8, willpower=12, max_willpower=12
         )
-        self.db.add(worried_elder)
         
         # Create a basic tension event
-        basic_tension = TensionEvent(
+        self.plan.add(
+            TensionEvent,
             title="Settlement in Crisis",
             description="The settlement faces an urgent problem that requires outside help.",
             source_type="settlement_problem",
             source_data={"settlement_id": map_point.id, "urgency_level": "urgent"},
             severity_level=1, max_severity=5,
-            deadline_watches=4, watches_remaining=4,
+            deadline_watches=4, watches_remaining=4, due_at_watch=self._clock + 4,
             status="active", origin_map_point_id=map_point.id
         )
-        self.db.add(basic_tension)
 
 
     def _generate_topography_and_pois(self):
@@ -539,98 +790,51 @@ Now generate the settlement JSON:
         settlement_details = SETTLEMENTS.get(settlement_roll, ("Hamlet", "High Population Density"))
         settlement_name = f"{settlement_details[0]} of the {EASY_TERRAIN.get(self._d20(), ('Valleys', 'Titanic Gate'))[1]}"
         
-        starting_settlement = MapPoint(
+        starting_settlement = self.plan.add(
+            MapPoint,
             name=settlement_name,
             type=f"Settlement - {settlement_details[0]}",
             description=f"{settlement_details[0]} - {settlement_details[1]}",
             status="explored",  # This makes it visible and the starting point
-            position_x=random.randint(200, 400),  # Center-ish position
-            position_y=random.randint(200, 300),
+            position_x=self.rng.randint(200, 400),  # Center-ish position
+            position_y=self.rng.randint(200, 300),
         )
         
-        self.db.add(starting_settlement)
-        self.db.flush()
-        
         # Use specialized settlement enrichment
         self._enrich_settlement_with_llm(starting_settlement)
         pois.append(starting_settlement)
         
         # Generate remaining POIs (2-7 additional ones)
-        remaining_pois = random.randint(2, 7)
-        for i in range(remaining_pois):
-            poi_type_roll = self._d6()
-            poi_type = POI_DIE_DROP.get(poi_type_roll, "Curiosity")
-
+        remaining_pois = self.rng.randint(2, 7)
+        # Types and terrains are rolled for every POI at once
+        poi_types = self.oracles.sample(POI_DIE_DROP, remaining_pois)
+        terrains = self.oracles.sample(EASY_TERRAIN, remaining_pois)
+        for poi_type, terrain in zip(poi_types, terrains):
             if "Settlement" in poi_type:
-                poi_details = SETTLEMENTS.get(
-                    self._d20(), ("Hamlet", "High Population Density")
-                )
+                poi_details = self.oracles.roll_on_table(SETTLEMENTS)
             elif "Curiosity" in poi_type:
-                poi_details = CURIOSITIES.get(
-                    self._d20(), ("Broken Tower", "Ancient Trash Heap")
-                )
+                poi_details = self.oracles.roll_on_table(CURIOSITIES)
             elif "Lair" in poi_type:
-                poi_details = LAIRS.get(
-                    self._d20(), ("Collapsed Mine", "Baited Entrance")
-                )
+                poi_details = self.oracles.roll_on_table(LAIRS)
             else:  # Dungeon or Waypoint
-                poi_details = DUNGEONS.get(self._d20(), ("Cave", "Buried"))
+                poi_details = self.oracles.roll_on_table(DUNGEONS)
 
-            poi_name = f"{poi_details[0]} of the {EASY_TERRAIN.get(self._d20(), ('Valleys', 'Titanic Gate'))[1]}"
-            new_poi = MapPoint(
+            poi_name = f"{poi_details[0]} of the {terrain[1]}"
+            new_poi = self.plan.add(
+                MapPoint,
                 name=poi_name,
                 type=poi_type,
                 description=f"{poi_details[0]} - {poi_details[1]}",
                 status="hidden",
-                position_x=random.randint(50, 750),
-                position_y=random.randint(50, 450),
+                position_x=self.rng.randint(50, 750),
+                position_y=self.rng.randint(50, 450),
             )
-            self.db.add(new_poi)
-            self.db.flush()
 
             # Use regular POI enrichment for non-settlements
             self._enrich_regular_poi_with_llm(new_poi)
             pois.append(new_poi)
 
-        self.db.commit()
-
-
-    def _generate_paths(self):
-        pois = self.db.query(MapPoint).all()
-        if len(pois) < 2:
-            return
 
-        for i in range(len(pois)):
-            # Create 1-2 paths from each POI to others
-            for _ in range(random.randint(1, 2)):
-                start_poi = pois[i]
-                end_poi = random.choice(pois)
-                if start_poi.id == end_poi.id:
-                    continue
-
-                # Avoid duplicate paths
-                existing_path = (
-                    self.db.query(Path)
-                    .filter(
-                        or_(
-                            and_(Path.start_point_id == start_poi.id, Path.end_point_id == end_poi.id),
-                            and_(Path.start_point_id == end_poi.id, Path.end_point_id == start_poi.id)
-                        )
-                    )
-                    .first()
-                )
-                if existing_path:
-                    continue
-
-                feature, condition = PATH_FEATURES.get(
-                    self._d20(), ("Twisted", "Thick Evening Mist")
-                )
-                new_path = Path(
-                    start_point_id=start_poi.id,
-                    end_point_id=end_poi.id,
-                    status="hidden",
-                    watches=random.randint(1, 3),
-                    feature=f"{feature} ({condition})",
-                )
-                self.db.add(new_path)
-        self.db.commit()
+    def _generate_paths(self, commit: bool = True) -> int:
+        """Joins every POI into one connected network of paths."""
+        return generate_paths(self.db, self.oracles, commit)
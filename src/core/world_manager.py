@@ -4,6 +4,7 @@ Manages the state of the world, including map points and their connections.
 
 from sqlalchemy.orm import Session
 from database import models
+from . import navigation
 
 
 class WorldManager:
@@ -16,7 +17,8 @@ class WorldManager:
         self, character_id: int, new_location_id: int
     ) -> dict:
         """
-        Moves a character to a new location, updating their current position.
+        Moves a character to a location reachable from their current one,
+        within the same MapPoint, updating their current position.
 
         Args:
             character_id: The ID of the character to move.
@@ -35,8 +37,13 @@ class WorldManager:
         if not new_location:
             return {"error": f"Location with ID {new_location_id} not found."}
 
-        # Check for a valid connection if we want to enforce it
-        # For now, we'll allow free movement to any known location.
+        current = character.current_location
+        if current is not None:
+            location_map = navigation.location_map(self.db, current.map_point_id)
+            if new_location.id not in location_map.names:
+                return {"error": f"{new_location.name} is not in the same area as {current.name}."}
+            if location_map.route(current.id, new_location.id) is None:
+                return {"error": f"{new_location.name} cannot be reached from {current.name}."}
 
         character.current_location_id = new_location.id
 
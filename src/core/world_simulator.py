@@ -0,0 +1,200 @@
+"""
+This module fast-forwards the whole world by a number of watches without any
+LLM calls, to pre-age a new world or catch it up after a long absence.
+
+The simulation is event-driven. Instead of stepping watch by watch it jumps
+straight to the next thing that happens, which is either a tension event
+deadline (from the scheduler's deadline queue) or a wandering hostile entity
+reaching the end of the Path it is travelling. Tensions escalate and fail
+exactly as they do in play, failures apply their default consequences, and
+hostile entities roam between map points. Everything random comes from the
+adventure's simulation stream, or from an explicit seed, so the same seed on
+the same world gives the same result.
+A single summary log entry narrates what happened once the run is over.
+"""
+
+import time
+import heapq
+from typing import List, NamedTuple
+from sqlalchemy.orm import Session
+from database.models import GameEntity, Location, LogEntry, Path, TensionEvent
+from .condition_tracker import ConditionTracker
+from .rng import SIMULATION, RandomStream, stream, stream_seed
+from .scheduler import deadline_queue, get_game_clock
+from .consequences import apply_default_consequence
+
+
+class SimulationReport(NamedTuple):
+    watches: int
+    seconds: float
+    escalations: int
+    failures: int
+    moves: int
+    consequences: List[str]
+    summary: str
+
+    @property
+    def watches_per_second(self) -> float:
+        return self.watches / self.seconds if self.seconds else float("inf")
+
+
+class WorldSimulator:
+    """Advances tensions and wandering hostile entities over many watches."""
+
+    def __init__(self, db: Session, seed: int | None = None):
+        self.db = db
+        # A seed gets its own simulation stream, so vectorized draws are seeded too
+        self.rng = RandomStream(stream_seed(seed, SIMULATION)) if seed is not None else stream(db, SIMULATION)
+        self.tracker = ConditionTracker(db)
+        self._paths_from: dict[int, list[tuple[int, int]]] = {}
+        self._entry_locations: dict[int, Location] = {}
+        # (arrival watch, entity id, destination map point id)
+        self._arrivals: list[tuple[int, int, int]] = []
+        self._roaming: dict[int, GameEntity] = {}
+        # entity id -> (map point id, location id) reached during the run
+        self._positions: dict[int, tuple[int, int | None]] = {}
+
+    def fast_forward(self, watches: int) -> SimulationReport:
+        """
+        Simulates the given number of watches and commits the result.
+
+        Returns:
+            A report of what happened, including how long the run took.
+        """
+        started = time.perf_counter()
+        self._load_map()
+        queue = deadline_queue(self.db)
+        clock = get_game_clock(self.db)
+        end = clock + watches
+        for entity in self._wanderers():
+            self._depart(entity, clock)
+        self.db.flush()
+
+        escalations, failures, moves = 0, 0, 0
+        consequences: List[str] = []
+        changed_titles: dict[str, str] = {}
+        # Schedule any events that have no deadline yet
+        self.tracker.advance_time(watches=0, commit=False)
+        while True:
+            upcoming = [end]
+            next_deadline = queue.next_deadline()
+            if next_deadline is not None:
+                upcoming.append(next_deadline.due_at_watch)
+            if self._arrivals:
+                upcoming.append(self._arrivals[0][0])
+            now = max(clock, min(upcoming))
+
+            failed_now = 0
+            for event in self.tracker.advance_time(watches=now - clock, commit=False):
+                if event.status == "failed":
+                    failed_now += 1
+                    changed_titles[event.title] = "failed"
+                    consequence = apply_default_consequence(
+                        self.db, event, self._consequence_location(event), self.rng
+                    )
+                    if consequence:
+                        consequences.append(consequence)
+                else:
+                    escalations += 1
+                    changed_titles[event.title] = f"severity {event.severity_level}"
+            failures += failed_now
+            clock = now
+
+            while self._arrivals and self._arrivals[0][0] <= clock:
+                _, entity_id, destination_id = heapq.heappop(self._arrivals)
+                entry = self._entry_locations.get(destination_id)
+                self._positions[entity_id] = (destination_id, entry.id if entry else None)
+                moves += 1
+                self._depart(self._roaming[entity_id], clock, destination_id)
+
+            if failed_now:
+                # Hostile entities spawned by failures start wandering too
+                self.db.flush()
+                for entity in self._wanderers(exclude_scheduled=True):
+                    self._depart(entity, clock)
+
+            if clock >= end:
+                break
+
+        # Positions are kept in memory during the run and written back once
+        for entity_id, (map_point_id, location_id) in self._positions.items():
+            entity = self._roaming[entity_id]
+            entity.current_map_point_id = map_point_id
+            entity.current_location_id = location_id
+
+        seconds = time.perf_counter() - started
+        summary = self._summarize(watches, changed_titles, consequences, moves)
+        self.db.add(LogEntry(
+            source="Warden",
+            content=summary,
+            metadata_dict={"simulated_watches": watches},
+        ))
+        self.db.commit()
+        return SimulationReport(
+            watches, seconds, escalations, failures, moves, consequences, summary
+        )
+
+    def _load_map(self) -> None:
+        """Loads every path, in both directions, and every entry location once."""
+        self._paths_from = {}
+        for path in self.db.query(Path).order_by(Path.id):
+            self._paths_from.setdefault(path.start_point_id, []).append(
+                (path.end_point_id, max(1, path.watches or 1))
+            )
+            self._paths_from.setdefault(path.end_point_id, []).append(
+                (path.start_point_id, max(1, path.watches or 1))
+            )
+        self._entry_locations = {
+            location.map_point_id: location
+            for location in self.db.query(Location).filter(Location.is_entry_point == True)  # noqa: E712
+        }
+
+    def _wanderers(self, exclude_scheduled: bool = False) -> List[GameEntity]:
+        """Returns the living hostile entities that roam the map, in id order."""
+        query = self.db.query(GameEntity).filter(
+            GameEntity.is_hostile == True,  # noqa: E712
+            GameEntity.is_retired == False,  # noqa: E712
+            GameEntity.entity_type != "Character",
+            GameEntity.current_map_point_id.is_not(None),
+        )
+        if exclude_scheduled:
+            query = query.filter(GameEntity.id.not_in(list(self._roaming)))
+        return query.order_by(GameEntity.id).all()
+
+    def _depart(self, entity: GameEntity, clock: int, map_point_id: int | None = None) -> None:
+        """Sends an entity down a random path out of its map point."""
+        routes = self._paths_from.get(map_point_id or entity.current_map_point_id)
+        if not routes:
+            return
+        destination_id, watches = self.rng.choice(routes)
+        self._roaming[entity.id] = entity
+        heapq.heappush(self._arrivals, (clock + watches, entity.id, destination_id))
+
+    def _consequence_location(self, event: TensionEvent) -> Location | None:
+        """Where a failed event's consequences appear: its origin, else the player."""
+        if event.origin_map_point_id in self._entry_locations:
+            return self._entry_locations[event.origin_map_point_id]
+        player = (
+            self.db.query(GameEntity)
+            .filter(
+                GameEntity.entity_type == "Character",
+                GameEntity.is_retired == False,  # noqa: E712
+                GameEntity.current_location_id.is_not(None),
+            )
+            .first()
+        )
+        return player.current_location if player else None
+
+    def _summarize(self, watches: int, changed_titles: dict, consequences: List[str], moves: int) -> str:
+        lines = [f"**While {watches} watch{'es' if watches != 1 else ''} passed:**"]
+        for title, outcome in changed_titles.items():
+            if outcome == "failed":
+                lines.append(f"- {title} spiraled out of control.")
+            else:
+                lines.append(f"- {title} grew more urgent ({outcome}).")
+        lines.extend(f"- {consequence}" for consequence in consequences)
+        if moves:
+            lines.append(f"- Hostile creatures roamed the paths ({moves} journeys).")
+        if len(lines) == 1:
+            lines.append("- The world held its breath; nothing of note changed.")
+        return "\n".join(lines)
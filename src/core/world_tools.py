@@ -1,13 +1,15 @@
-import random
-import re
-import json
 from typing import Dict, Any
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from database import models
 from .oracles import OracleRoller
 from .condition_tracker import ConditionTracker
-import datetime
+from . import relationships, trigger_bus
+from . import combat
+from .dice import ENHANCED_DAMAGE, IMPAIRED_DAMAGE, compile_dice
+from . import consequences
+from . import rng as adventure_rng
+from . import navigation, routing
 
 """
 This module defines the "World Tools" that the AI Warden can use to interact
@@ -40,35 +42,23 @@ def _find_entity_by_name(db: Session, name: str) -> models.GameEntity | None:
 # --- Dice Rolling Tools ---
 
 
-def roll_dice(dice_string: str) -> Dict[str, Any]:
+def roll_dice(dice_string: str, db: Session | None = None) -> Dict[str, Any]:
     """
-    Rolls dice based on a standard dice string format (e.g., '1d6', '2d8+2', '1d20-1') or a fixed number.
+    Rolls dice based on a standard dice string format (e.g., '1d6', '2d8+2', '1d20-1', '1d6+1d4'), keeping the highest or lowest dice ('2d20kh1' for advantage, '2d20kl1' for disadvantage), or a fixed number.
 
     Args:
         dice_string: The dice to roll, in standard notation, or a string representing an integer.
+        db: The database session, whose adventure seed the dice are drawn from.
 
     Returns:
         A dictionary containing the total result and the individual rolls.
     """
-    dice_string = dice_string.lower().replace(" ", "")
-    if dice_string.isdigit():
-        total = int(dice_string)
-        return {"total": total, "rolls": [total], "modifier": 0, "final_result": total}
-
-    match = re.match(r"(\d+)d(\d+)([+-]\d+)?", dice_string)
-    if not match:
+    expression = compile_dice(dice_string)
+    if expression is None:
         return {
-            "error": "Invalid dice string format. Use format like '1d6' or '2d8+2'."
+            "error": "Invalid dice string format. Use format like '1d6', '2d8+2' or '2d20kh1'."
         }
-
-    num_dice, die_size, modifier_str = match.groups()
-    num_dice, die_size = int(num_dice), int(die_size)
-    modifier = int(modifier_str) if modifier_str else 0
-
-    rolls = [random.randint(1, die_size) for _ in range(num_dice)]
-    total = sum(rolls) + modifier
-
-    return {"total": total, "rolls": rolls, "modifier": modifier, "final_result": total}
+    return expression.roll(adventure_rng.stream(db, adventure_rng.DICE))
 
 
 # --- Character & Entity Tools ---
@@ -105,7 +95,13 @@ def get_character_sheet(db: Session, character_name: str) -> Dict[str, Any]:
     }
 
 
-def deal_damage(db: Session, attacker_name: str, target_name: str) -> Dict[str, Any]:
+def deal_damage(
+    db: Session,
+    attacker_name: str,
+    target_name: str,
+    impaired: bool = False,
+    enhanced: bool = False,
+) -> Dict[str, Any]:
     """
     Resolves an attack from an attacker to a target.
 
@@ -116,6 +112,8 @@ def deal_damage(db: Session, attacker_name: str, target_name: str) -> Dict[str,
         db: The database session.
         attacker_name: The name of the entity making the attack.
         target_name: The exact name of the target receiving damage.
+        impaired: The attack is weakened (e.g. through cover or while blinded) and deals 1d4 damage.
+        enhanced: The attack has the upper hand (e.g. the target is helpless) and deals 1d12 damage.
 
     Returns:
         A dictionary confirming the action and showing the target's new state.
@@ -129,72 +127,19 @@ def deal_damage(db: Session, attacker_name: str, target_name: str) -> Dict[str,
     if not target:
         return {"error": f"Target '{target_name}' not found."}
 
-    # Determine damage amount by rolling attacker's weapon dice
-    try:
-        # The 'attacks' attribute is stored as a JSON string in the DB
-        attacks_list = json.loads(attacker.attacks)
-        # Assuming the first attack in the list is the primary one
-        attack_info = attacks_list[0]
-        damage_dice = attack_info.get(
-            "damage", "1d4"
-        )  # Default to 1d4 if no damage specified
-    except (IndexError, TypeError, KeyError, json.JSONDecodeError):
-        damage_dice = "1d4"  # Default if attacks are missing or malformed
-
-    damage_roll_result = roll_dice(damage_dice)
-    damage_amount = damage_roll_result.get("total", 0)
-
-    original_hp = target.hp
-    original_strength = target.strength
-    received_scar = None
-
-    # Check for a Scar before applying damage
-    if original_hp > 0 and (original_hp - damage_amount) == 0:
-        scar_description = (
-            "A nasty gash across the face, a constant reminder of this day."
-        )
-        target.scars = (
-            f"{target.scars}\n{scar_description}" if target.scars else scar_description
-        )
-        target.max_hp = max(0, target.max_hp - 1)
-        received_scar = scar_description
-
-    # Apply damage to HP first
-    hp_damage = min(original_hp, damage_amount)
-    new_hp = original_hp - hp_damage
-    target.hp = new_hp
-    remaining_damage = damage_amount - hp_damage
-
-    # Apply remaining damage to Strength
-    if remaining_damage > 0:
-        target.strength -= remaining_damage
-
-    result = {
-        "attacker_name": attacker.name,
-        "target_name": target.name,
-        "damage_roll": damage_dice,
-        "damage_taken": damage_amount,
-        "hp_lost": hp_damage,
-        "strength_lost": original_strength - target.strength,
-        "new_hp": target.hp,
-        "new_strength": target.strength,
-        "received_scar": received_scar,
-        "is_dead": False,
-    }
+    # Roll the attacker's primary weapon from its compiled attack profile
+    attack = combat.attack_profile_for(attacker).primary
+    damage_dice, damage = attack.damage_dice, attack.damage
+    if impaired != enhanced:
+        damage_dice = IMPAIRED_DAMAGE if impaired else ENHANCED_DAMAGE
+        damage = compile_dice(damage_dice)
+    damage_amount = damage.roll(adventure_rng.stream(db, adventure_rng.COMBAT))["total"]
 
-    # Check for death
-    if target.strength <= 0:
-        target.is_retired = True
-        result["is_dead"] = True
-        result["final_state"] = f"{target.name} has been slain."
-        
-        # Check tension event conditions for entity death
-        condition_tracker = ConditionTracker(db)
-        condition_tracker.check_all_conditions("entity_death", {
-            "entity_name": target.name,
-            "entity_id": target.id,
-            "killed_by": attacker.name
-        })
+    result = combat.apply_damage(attacker.name, target, damage_dice, damage_amount)
+
+    if result["is_dead"]:
+        # Raise the death for tension event conditions
+        trigger_bus.publish(db, "entity_death", combat.death_trigger(target, attacker.name))
 
     print(f"Attack result: {result}")
     return result
@@ -381,7 +326,7 @@ def give_item(db: Session, giver_name: str, receiver_name: str, item_name: str)
         return {"error": f"{giver_name} doesn't have {item_name}."}
     
     item.owner_entity_id = receiver.id
-    db.commit()
+    db.flush()
     
     # Update NPC relationships based on the gift
     player = _find_entity_by_name(db, "player")
@@ -399,9 +344,8 @@ def give_item(db: Session, giver_name: str, receiver_name: str, item_name: str)
                 f"Pleased to help by giving {item_name}"
             )
     
-    # Check tension event conditions for item delivery
-    condition_tracker = ConditionTracker(db)
-    condition_tracker.check_all_conditions("item_delivery", {
+    # Raise the delivery for tension event conditions
+    trigger_bus.publish(db, "item_delivery", {
         "giver_name": giver_name,
         "receiver_name": receiver_name,
         "item_name": item_name,
@@ -463,9 +407,8 @@ def add_item_to_inventory(
         db.add(new_item)
         message = f"Added {quantity}x {item_name} to {character_name}'s inventory."
 
-    # Check tension event conditions for item received
-    condition_tracker = ConditionTracker(db)
-    condition_tracker.check_all_conditions("item_received", {
+    # Raise the receipt for tension event conditions
+    trigger_bus.publish(db, "item_received", {
         "recipient_name": character_name,
         "recipient_id": entity.id,
         "item_name": item_name,
@@ -538,12 +481,11 @@ def look_around(db: Session, player: models.GameEntity) -> None:
     if items:
         narrative += f"\n\nOn the ground, you notice: {', '.join(items)}."
 
-    # Get connections to other locations within the same MapPoint
-    connections = location.connections_from
-    if connections:
-        connected_locations = [
-            conn.destination_location.name for conn in connections
-        ]
+    # Get connections to other locations within the same MapPoint, either way
+    location_map = navigation.location_map(db, location.map_point_id)
+    exits = location_map.exits.get(location.id)
+    if exits:
+        connected_locations = [location_map.names[exit_id] for exit_id in exits]
         narrative += f"\n\nFrom here, you can go to: {', '.join(connected_locations)}."
 
     # If this is an entry point, also show paths to other MapPoints
@@ -555,7 +497,7 @@ def look_around(db: Session, player: models.GameEntity) -> None:
                 available_paths = [path.end_point.name for path in paths]
                 narrative += f"\n\nYou can travel to other areas: {', '.join(available_paths)}."
 
-    if not entities and not items and not connections:
+    if not entities and not items and not exits:
         narrative += "\n\nThe area seems quiet and isolated."
 
     log_entry = models.LogEntry(source="Warden", content=narrative)
@@ -599,12 +541,13 @@ def move_character(
     db: Session, character_name: str, new_location_name: str
 ) -> Dict[str, Any]:
     """
-    Moves a character to a new location.
+    Moves a character to another location in the same area, passing through
+    as many connected locations as it takes to get there.
 
     Args:
         db: The database session.
         character_name: The name of the character to move.
-        new_location_name: The name of the location to move to.
+        new_location_name: The name of a location reachable from the character's current one.
 
     Returns:
         A dictionary indicating the result of the move.
@@ -613,26 +556,34 @@ def move_character(
     if not character:
         return {"error": f"Character '{character_name}' not found."}
 
-    new_location = (
-        db.query(models.Location)
-        .filter(func.lower(models.Location.name) == new_location_name.lower())
-        .first()
-    )
-    if not new_location:
-        return {"error": f"Location '{new_location_name}' not found."}
-
-    character.current_location_id = new_location.id
-    db.commit()
+    current = character.current_location
+    if not current:
+        return {"error": f"Character '{character_name}' is not at a valid location."}
 
-    # Check tension event conditions for location visit
-    condition_tracker = ConditionTracker(db)
-    condition_tracker.check_all_conditions("location_visit", {
-        "character_name": character.name,
-        "character_id": character.id,
-        "location_name": new_location.name,
-        "location_id": new_location.id,
-        "map_point_name": new_location.map_point.name if new_location.map_point else None
-    })
+    # Only the locations of the current MapPoint are looked at
+    location_map = navigation.location_map(db, current.map_point_id)
+    new_location_id = location_map.find(new_location_name)
+    if new_location_id is None:
+        return {"error": f"Location '{new_location_name}' not found here."}
+    steps = location_map.route(current.id, new_location_id)
+    if steps is None:
+        return {"error": f"{location_map.names[new_location_id]} cannot be reached from {current.name}."}
+
+    map_point_name = current.map_point.name if current.map_point else None
+    new_location = current
+    for location_id in steps:
+        new_location = db.get(models.Location, location_id)
+        character.current_location = new_location
+        db.flush()
+
+        # Raise each visit on the way for tension event conditions
+        trigger_bus.publish(db, "location_visit", {
+            "character_name": character.name,
+            "character_id": character.id,
+            "location_name": location_map.names[location_id],
+            "location_id": location_id,
+            "map_point_name": map_point_name
+        })
 
     # Describe the new location to the player
     look_around(db, character)
@@ -641,6 +592,7 @@ def move_character(
         "success": True,
         "character_name": character.name,
         "new_location_name": new_location.name,
+        "route": [current.name] + [location_map.names[location_id] for location_id in steps],
     }
 
 
@@ -649,12 +601,12 @@ def roll_wilderness_event(db: Session) -> Dict[str, Any]:
     Rolls on the wilderness event table and returns the result.
 
     Args:
-        db: The database session (not used directly, but required for tool signature).
+        db: The database session, whose adventure seed the oracle is rolled from.
 
     Returns:
         A dictionary containing the wilderness event description.
     """
-    oracle_roller = OracleRoller()
+    oracle_roller = OracleRoller(adventure_rng.stream(db, adventure_rng.ORACLES))
     event = oracle_roller.roll_wilderness_event()
     return {"event_description": event}
 
@@ -679,7 +631,7 @@ def roll_saving_throw(db: Session, character_name: str, stat: str) -> Dict[str,
     if stat_value is None:
         return {"error": f"Invalid stat '{stat}' for {character_name}."}
 
-    roll = random.randint(1, 20)
+    roll = adventure_rng.stream(db, adventure_rng.DICE).randint(1, 20)
     success = roll <= stat_value
 
     return {
@@ -694,64 +646,6 @@ def roll_saving_throw(db: Session, character_name: str, stat: str) -> Dict[str,
 # --- NPC Relationship Management Tools ---
 
 
-def _get_npc_relationship(npc: models.GameEntity) -> Dict[str, Any]:
-    """Helper function to parse NPC relationship data from bond field"""
-    if not npc.bond:
-        # Initialize default relationship
-        return {
-            "relationship_level": 0,
-            "relationship_type": "neutral",
-            "history": [],
-            "trust_level": "cautious",
-            "fear_level": "none"
-        }
-    
-    try:
-        return json.loads(npc.bond)
-    except (json.JSONDecodeError, TypeError):
-        # If bond contains old-style text, preserve it in history
-        return {
-            "relationship_level": 0,
-            "relationship_type": "neutral", 
-            "history": [{"action": "initial_bond", "impact": 0, "description": npc.bond}],
-            "trust_level": "cautious",
-            "fear_level": "none"
-        }
-
-
-def _set_npc_relationship(npc: models.GameEntity, relationship_data: Dict[str, Any]) -> None:
-    """Helper function to save NPC relationship data to bond field"""
-    npc.bond = json.dumps(relationship_data)
-
-
-def _get_relationship_type(level: int) -> str:
-    """Convert relationship level to descriptive type"""
-    if level <= -3:
-        return random.choice(["enemy", "rival", "nemesis"])
-    elif level <= -1:
-        return random.choice(["suspicious", "resentful", "disappointed"])
-    elif level == 0:
-        return random.choice(["indifferent", "professional", "cautious"])
-    elif level <= 2:
-        return random.choice(["respectful", "grateful", "fond"])
-    else:
-        return random.choice(["devoted", "loyal", "protective"])
-
-
-def _get_trust_level(relationship_level: int, fear_level: str) -> str:
-    """Determine trust level based on relationship and fear"""
-    if fear_level in ["afraid", "terrified"]:
-        return "distrustful"
-    elif relationship_level <= -2:
-        return "distrustful"
-    elif relationship_level <= 0:
-        return "cautious"
-    elif relationship_level <= 2:
-        return "trusting"
-    else:
-        return "devoted"
-
-
 def update_npc_relationship(
     db: Session, 
     npc_name: str, 
@@ -778,69 +672,23 @@ def update_npc_relationship(
     if not npc or npc.entity_type not in ["NPC", "Character"]:
         return {"error": f"NPC '{npc_name}' not found."}
     
-    # Get current relationship
-    relationship = _get_npc_relationship(npc)
-    
-    # Update relationship level
-    old_level = relationship["relationship_level"]
-    new_level = max(-5, min(5, old_level + impact))
-    relationship["relationship_level"] = new_level
-    
-    # Update relationship type
-    relationship["relationship_type"] = _get_relationship_type(new_level)
-    
-    # Handle fear changes
-    if fear_change == "increase":
-        fear_levels = ["none", "wary", "afraid", "terrified"]
-        current_index = fear_levels.index(relationship.get("fear_level", "none"))
-        relationship["fear_level"] = fear_levels[min(3, current_index + 1)]
-    elif fear_change == "decrease":
-        fear_levels = ["none", "wary", "afraid", "terrified"]
-        current_index = fear_levels.index(relationship.get("fear_level", "none"))
-        relationship["fear_level"] = fear_levels[max(0, current_index - 1)]
-    
-    # Update trust level
-    relationship["trust_level"] = _get_trust_level(new_level, relationship["fear_level"])
-    
-    # Add to history
-    relationship["history"].append({
-        "action": action_type,
-        "impact": impact,
-        "description": description,
-        "timestamp": datetime.datetime.utcnow().isoformat()
-    })
-    
-    # Keep only last 10 history entries
-    relationship["history"] = relationship["history"][-10:]
-    
-    # Update disposition based on relationship level
-    if new_level <= -3:
-        npc.disposition = "hostile"
-        npc.is_hostile = True
-    elif new_level <= -1:
-        npc.disposition = "unfriendly"
-        npc.is_hostile = False
-    elif new_level <= 2:
-        npc.disposition = "friendly"
-        npc.is_hostile = False
-    else:
-        npc.disposition = "allied"
-        npc.is_hostile = False
-    
-    # Save relationship data
-    _set_npc_relationship(npc, relationship)
+    relationship = relationships.apply_relationship_change(
+        db, [npc.id], action_type, impact, description, fear_change
+    )[npc.id]
     db.commit()
     
+    old_level = relationship["old_level"]
+    new_level = relationship["level"]
     return {
         "success": True,
         "npc_name": npc.name,
         "old_level": old_level,
         "new_level": new_level,
-        "relationship_type": relationship["relationship_type"],
-        "trust_level": relationship["trust_level"],
-        "fear_level": relationship["fear_level"],
-        "disposition": npc.disposition,
-        "message": f"{npc.name}'s relationship changed from {old_level} to {new_level} ({relationship['relationship_type']})"
+        "relationship_type": relationship["type"],
+        "trust_level": relationship["trust"],
+        "fear_level": relationship["fear"],
+        "disposition": relationship["disposition"],
+        "message": f"{npc.name}'s relationship changed from {old_level} to {new_level} ({relationship['type']})"
     }
 
 
@@ -859,17 +707,64 @@ def get_npc_relationship_info(db: Session, npc_name: str) -> Dict[str, Any]:
     if not npc or npc.entity_type not in ["NPC", "Character"]:
         return {"error": f"NPC '{npc_name}' not found."}
     
-    relationship = _get_npc_relationship(npc)
+    relationship = relationships.get_relationship(db, npc.id)
     
     return {
         "npc_name": npc.name,
-        "relationship_level": relationship["relationship_level"],
-        "relationship_type": relationship["relationship_type"],
-        "trust_level": relationship["trust_level"],
-        "fear_level": relationship["fear_level"],
+        "relationship_level": relationship["level"],
+        "relationship_type": relationship["type"],
+        "trust_level": relationship["trust"],
+        "fear_level": relationship["fear"],
         "disposition": npc.disposition,
         "is_hostile": npc.is_hostile,
-        "recent_history": relationship["history"][-3:] if relationship["history"] else []
+        "recent_history": relationships.recent_events(db, npc.id, limit=3)
+    }
+
+
+def list_npcs_by_relationship(
+    db: Session,
+    min_fear_level: str = None,
+    trust_level: str = None,
+    min_relationship_level: int = None,
+    max_relationship_level: int = None,
+) -> Dict[str, Any]:
+    """
+    Lists the living NPCs whose relationship with the player matches the filters,
+    e.g. every NPC who fears the player or every NPC who trusts them.
+    
+    Args:
+        db: The database session.
+        min_fear_level: Only NPCs at least this afraid ("wary", "afraid", "terrified").
+        trust_level: Only NPCs with this trust level ("distrustful", "cautious", "trusting", "devoted").
+        min_relationship_level: Only NPCs with at least this relationship level (-5 to +5).
+        max_relationship_level: Only NPCs with at most this relationship level (-5 to +5).
+        
+    Returns:
+        A dictionary with the matching NPCs and their relationship information.
+    """
+    if min_fear_level and min_fear_level not in relationships.FEAR_LEVELS:
+        return {"error": f"Unknown fear level '{min_fear_level}'."}
+    
+    matches = relationships.find_npcs_by_relationship(
+        db,
+        min_fear=min_fear_level,
+        trust=trust_level,
+        min_level=min_relationship_level,
+        max_level=max_relationship_level,
+    )
+    return {
+        "npcs": [
+            {
+                "npc_name": npc.name,
+                "relationship_level": relationship["level"],
+                "relationship_type": relationship["type"],
+                "trust_level": relationship["trust"],
+                "fear_level": relationship["fear"],
+                "disposition": npc.disposition,
+            }
+            for npc, relationship in matches
+        ],
+        "count": len(matches),
     }
 
 
@@ -878,7 +773,8 @@ def get_npc_relationship_info(db: Session, npc_name: str) -> Dict[str, Any]:
 
 def travel_to_map_point(db: Session, character_name: str, destination_name: str) -> Dict[str, Any]:
     """
-    Moves a character to a different MapPoint, advancing time based on the path's watch cost.
+    Moves a character to a different MapPoint along the quickest known route,
+    which may take several paths, advancing time once by the whole journey's watch cost.
 
     Args:
         db: The database session.
@@ -904,18 +800,14 @@ def travel_to_map_point(db: Session, character_name: str, destination_name: str)
     if not destination:
         return {"error": f"Destination '{destination_name}' not found."}
     
-    # Find the path between current and destination MapPoints
-    path = (
-        db.query(models.Path)
-        .filter(
-            models.Path.start_point_id == character.current_map_point.id,
-            models.Path.end_point_id == destination.id
-        )
-        .first()
-    )
-    
-    if not path:
-        return {"error": f"No path found from {character.current_map_point.name} to {destination_name}."}
+    origin = character.current_map_point
+    if origin.id == destination.id:
+        return {"error": f"{character.name} is already at {destination.name}."}
+
+    legs = routing.find_route(db, origin.id, destination.id)
+    if not legs:
+        return {"error": f"No known route from {origin.name} to {destination_name}."}
+    watches = sum(leg.watches for leg in legs)
     
     # Find the entry point location at the destination
     entry_location = (
@@ -930,16 +822,27 @@ def travel_to_map_point(db: Session, character_name: str, destination_name: str)
     if not entry_location:
         return {"error": f"No entry point found at {destination_name}."}
     
-    # Move the character
+    # Move the character; every path walked is now explored
     character.current_location_id = entry_location.id
     character.current_map_point_id = destination.id
-    
-    # Advance time by the path's watch cost
+    for path in db.query(models.Path).filter(models.Path.id.in_([leg.path_id for leg in legs])):
+        if path.status != "explored":
+            path.status = "explored"
+
+    # Advance time once by the whole journey's watch cost
     condition_tracker = ConditionTracker(db)
-    escalated_events = condition_tracker.advance_time(watches=path.watches)
-    
+    escalated_events = condition_tracker.advance_time(watches=watches)
+
     # Build response message
-    message = f"{character.name} travels to {destination.name}. **Time passes: {path.watches} watch{'es' if path.watches != 1 else ''}**"
+    stops = [leg.end_point_id for leg in legs[:-1]]
+    names = dict(
+        db.query(models.MapPoint.id, models.MapPoint.name).filter(models.MapPoint.id.in_(stops))
+    ) if stops else {}
+    route = [origin.name] + [names[stop] for stop in stops] + [destination.name]
+    message = f"{character.name} travels to {destination.name}"
+    if stops:
+        message += f" by way of {', '.join(route[1:-1])}"
+    message += f". **Time passes: {watches} watch{'es' if watches != 1 else ''}**"
     
     # Handle tension escalations
     escalation_messages = []
@@ -961,7 +864,8 @@ def travel_to_map_point(db: Session, character_name: str, destination_name: str)
         "success": True,
         "message": message,
         "destination": destination.name,
-        "time_advanced": path.watches,
+        "route": route,
+        "time_advanced": watches,
         "escalated_events": len(escalated_events)
     }
 
@@ -997,23 +901,11 @@ def _apply_tension_failure_consequences(db: Session, failed_event: models.Tensio
         
         # Parse the LLM response and execute consequences
         # For now, apply a simple default consequence based on severity
-        if failed_event.max_severity >= 4:
-            # High severity: spawn hostile entity
-            spawn_hostile_entity(
-                db,
-                entity_name=f"Consequence of {failed_event.title}",
-                description=f"A hostile presence manifested by the failure of {failed_event.title}"
-            )
-        elif failed_event.max_severity >= 2:
-            # Medium severity: create cascading event
-            create_cascading_tension_event(
-                db,
-                title=f"Aftermath of {failed_event.title}",
-                description=f"The failure of {failed_event.title} has created new problems.",
-                source_event_id=failed_event.id,
-                severity_level=1,
-                deadline_watches=3
-            )
+        player = _find_entity_by_name(db, "player")
+        consequences.apply_default_consequence(
+            db, failed_event, player.current_location if player else None,
+            adventure_rng.stream(db, adventure_rng.CONSEQUENCES),
+        )
         
         # Log the consequence application
         log_entry = models.LogEntry(
@@ -1074,27 +966,10 @@ def spawn_hostile_entity(
         return {"error": "Could not determine spawn location."}
     
     # Create the hostile entity
-    new_entity = models.GameEntity(
-        name=entity_name,
-        entity_type=entity_type,
-        hp=random.randint(3, 8),
-        max_hp=random.randint(3, 8),
-        strength=random.randint(8, 12),
-        max_strength=random.randint(8, 12),
-        dexterity=random.randint(8, 12),
-        max_dexterity=random.randint(8, 12),
-        willpower=random.randint(8, 12),
-        max_willpower=random.randint(8, 12),
-        armor=random.randint(0, 2),
-        disposition="hostile",
-        is_hostile=True,
-        description=description,
-        current_location_id=target_location.id,
-        current_map_point_id=target_location.map_point_id,
-        attacks='[{"name": "Attack", "damage": "1d6"}]'
+    consequences.create_hostile_entity(
+        db, entity_name, entity_type, target_location, description,
+        adventure_rng.stream(db, adventure_rng.CONSEQUENCES),
     )
-    
-    db.add(new_entity)
     db.commit()
     
     return {
@@ -1163,19 +1038,9 @@ def create_cascading_tension_event(
     Returns:
         A dictionary confirming the new tension event was created.
     """
-    new_event = models.TensionEvent(
-        title=title,
-        description=description,
-        source_type="cascading_failure",
-        source_data=json.dumps({"source_event_id": source_event_id}),
-        severity_level=severity_level,
-        max_severity=5,
-        deadline_watches=deadline_watches,
-        watches_remaining=deadline_watches,
-        status="active"
+    consequences.create_cascading_event(
+        db, title, description, source_event_id, severity_level, deadline_watches
     )
-    
-    db.add(new_event)
     db.commit()
     
     return {
@@ -1,5 +1,7 @@
 import datetime
 from sqlalchemy import (
+    DDL,
+    event,
     Column,
     Integer,
     String,
@@ -8,6 +10,7 @@ from sqlalchemy import (
     ForeignKey,
     DateTime,
     JSON,
+    select,
 )
 from sqlalchemy.orm import relationship, DeclarativeBase
 
@@ -16,6 +19,10 @@ class Base(DeclarativeBase):
     pass
 
 
+# WorldState key holding the absolute number of watches elapsed in the adventure
+GAME_CLOCK_KEY = "game_clock"
+
+
 class WorldState(Base):
     __tablename__ = "world_state"
 
@@ -59,6 +66,9 @@ class GameEntity(Base):
     current_location = relationship("Location", back_populates="entities")
 
     items = relationship("Item", back_populates="owner")
+    npc_relationship = relationship(
+        "NPCRelationship", back_populates="npc", uselist=False
+    )
 
 
 class Item(Base):
@@ -89,6 +99,45 @@ class LogEntry(Base):
     involved_entities = Column(JSON)
 
 
+# Full-text index over the adventure log, kept in sync with log_entry by triggers.
+# Alembic creates it for existing databases; these hooks cover create_all().
+LOG_ENTRY_FTS_DDL = [
+    (
+        "CREATE VIRTUAL TABLE IF NOT EXISTS log_entry_fts USING fts5(content, "
+        "content='log_entry', content_rowid='id', tokenize='porter unicode61')"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS log_entry_fts_ai AFTER INSERT ON log_entry "
+        "BEGIN INSERT INTO log_entry_fts(rowid, content) "
+        "VALUES (new.id, new.content); END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS log_entry_fts_ad AFTER DELETE ON log_entry "
+        "BEGIN INSERT INTO log_entry_fts(log_entry_fts, rowid, content) "
+        "VALUES ('delete', old.id, old.content); END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS log_entry_fts_au "
+        "AFTER UPDATE OF content ON log_entry "
+        "BEGIN INSERT INTO log_entry_fts(log_entry_fts, rowid, content) "
+        "VALUES ('delete', old.id, old.content); "
+        "INSERT INTO log_entry_fts(rowid, content) VALUES (new.id, new.content); END"
+    ),
+]
+
+for _statement in LOG_ENTRY_FTS_DDL:
+    event.listen(
+        LogEntry.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="sqlite"),
+    )
+event.listen(
+    LogEntry.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS log_entry_fts").execute_if(dialect="sqlite"),
+)
+
+
 class MapPoint(Base):
     __tablename__ = "map_point"
 
@@ -199,7 +248,10 @@ class TensionEvent(Base):
     severity_level = Column(Integer, default=1)  # 1-5 scale
     max_severity = Column(Integer, default=5)
     deadline_watches = Column(Integer, nullable=False)
+    # Watches left when the deadline was last scheduled; see due_at_watch
     watches_remaining = Column(Integer, nullable=False)
+    # Game clock watch at which the next deadline falls, set on insert
+    due_at_watch = Column(Integer, index=True)
     
     status = Column(String, default="active")  # "active", "resolved", "failed", "escalated"
     resolution_method = Column(String)  # Track how it was resolved for consequences
@@ -215,6 +267,16 @@ class TensionEvent(Base):
     conditions = relationship("ResolutionCondition", back_populates="tension_event", cascade="all, delete-orphan")
 
 
+@event.listens_for(TensionEvent, "before_insert")
+def _schedule_new_tension_event(mapper, connection, target):
+    """Places a new event's first deadline on the game clock."""
+    if target.due_at_watch is None and target.watches_remaining is not None:
+        clock = connection.execute(
+            select(WorldState.value).where(WorldState.key == GAME_CLOCK_KEY)
+        ).scalar()
+        target.due_at_watch = int(clock or 0) + target.watches_remaining
+
+
 class ResolutionCondition(Base):
     __tablename__ = "resolution_condition"
     
@@ -226,9 +288,34 @@ class ResolutionCondition(Base):
     
     # Flexible target data structure
     target_data = Column(JSON, nullable=False)  # {"item_name": "Healing Herb", "target_entity_id": 123}
+    # or {"description": ..., "predicate": {...}}; see core.predicates
     
     is_met = Column(Boolean, default=False)
     met_at = Column(DateTime)
     
     # Relationships
     tension_event = relationship("TensionEvent", back_populates="conditions")
+
+
+class NPCRelationship(Base):
+    __tablename__ = "npc_relationship"
+
+    npc_id = Column(Integer, ForeignKey("game_entity.id"), primary_key=True)
+    level = Column(Integer, nullable=False, default=0, index=True)  # -5 to +5
+    type = Column(String, nullable=False, default="neutral", index=True)
+    trust = Column(String, nullable=False, default="cautious", index=True)
+    fear = Column(String, nullable=False, default="none", index=True)
+
+    npc = relationship("GameEntity", back_populates="npc_relationship")
+
+
+class RelationshipEvent(Base):
+    __tablename__ = "relationship_event"
+
+    # Append-only history of what changed an NPC's relationship
+    id = Column(Integer, primary_key=True)
+    npc_id = Column(Integer, ForeignKey("game_entity.id"), nullable=False, index=True)
+    action = Column(String, nullable=False)
+    impact = Column(Integer, nullable=False, default=0)
+    description = Column(Text)
+    created_at = Column(DateTime, default=datetime.datetime.utcnow)
@@ -4,6 +4,7 @@ This module provides the UI for the character creation screen.
 
 import streamlit as st
 from core.character_generator import CharacterGenerator
+from core.rng import CHARACTERS, stream
 from core.world_tools import look_around
 
 from database.models import GameEntity, Item, Location, MapPoint
@@ -14,7 +15,8 @@ def render_character_creation_view(db):
     st.title("Create Your Character")
 
     if "character_sheet" not in st.session_state:
-        st.session_state.character_sheet = CharacterGenerator().generate_character()
+        st.session_state.character_sheet = CharacterGenerator(stream(db, CHARACTERS)).generate_character()
+        db.commit()  # Save the stream's state so a re-roll gives a new character
 
     character_sheet = st.session_state.character_sheet
 
@@ -57,7 +59,8 @@ def render_character_creation_view(db):
 
     col1, col2 = st.columns(2)
     if col1.button("Generate / Re-roll Character", use_container_width=True):
-        st.session_state.character_sheet = CharacterGenerator().generate_character()
+        st.session_state.character_sheet = CharacterGenerator(stream(db, CHARACTERS)).generate_character()
+        db.commit()
         st.rerun()
 
     if col2.button("Accept & Begin Adventure", use_container_width=True):
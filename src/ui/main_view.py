@@ -3,6 +3,11 @@ import graphviz
 from sqlalchemy.orm import Session
 from database.models import LogEntry, MapPoint, Path
 
+# Number of log entries loaded per page of the session view
+LOG_PAGE_SIZE = 50
+# Most log entries kept in session state; pages furthest from view are dropped
+LOG_WINDOW_MAX_ENTRIES = 4 * LOG_PAGE_SIZE
+
 
 def render_main_view(db: Session):
     """Renders the main adventure log and context view."""
@@ -76,20 +81,186 @@ def _render_session_view(db: Session):
     """Renders the chat-style log of game events."""
     st.subheader("Session View")
     log_container = st.container(border=True, height=400)
-    log_entries = db.query(LogEntry).order_by(LogEntry.created_at.asc()).all()
-    for entry in log_entries:
-        with log_container.chat_message(name=entry.source.lower()):
-            st.markdown(entry.content)
-            if entry.metadata_dict and entry.metadata_dict.get("requires_saving_throw"):
-                if st.button("Roll Saving Throw", key=f"saving_throw_{entry.id}"):
+    window = _get_log_window(db)
+
+    if window["has_older"]:
+        if log_container.button("Load older entries", key="load_older_log_entries"):
+            _load_older_entries(db, window)
+            st.rerun()
+
+    for entry in window["entries"].values():
+        with log_container.chat_message(name=entry["source"].lower()):
+            st.markdown(entry["content"])
+            if entry["requires_saving_throw"]:
+                if st.button("Roll Saving Throw", key=f"saving_throw_{entry['id']}"):
                     st.session_state.orchestrator.handle_player_input(
                         "roll saving throw", db
                     )
+                    _show_latest_entries()
                     st.rerun()
 
+    if window["has_newer"]:
+        if log_container.button("Load newer entries", key="load_newer_log_entries"):
+            _load_newer_entries(db, window)
+            st.rerun()
+
+
+def _get_log_window(db: Session) -> dict:
+    """
+    Returns the cached log window for the active adventure, fetching only the
+    entries written since the previous rerun.
+    """
+    db_path = st.session_state.get("active_db_path")
+    window = st.session_state.get("log_window")
+    if not window or window["db_path"] != db_path:
+        window = _new_log_window(db_path)
+        st.session_state["log_window"] = window
+    _refresh_log_window(db, window)
+    return window
+
+
+def _new_log_window(db_path: str | None) -> dict:
+    """Creates an empty log window. Entries are kept in ascending id order."""
+    return {
+        "db_path": db_path,
+        "entries": {},
+        "oldest_id": None,
+        "newest_id": None,
+        "has_older": False,
+        "has_newer": False,
+    }
+
+
+def _show_latest_entries() -> None:
+    """Drops a window scrolled back into history, so the next rerun shows the latest turn."""
+    window = st.session_state.get("log_window")
+    if window and window["has_newer"]:
+        del st.session_state["log_window"]
+
+
+def _snapshot_log_entry(entry: LogEntry) -> dict:
+    """Copies the fields needed for rendering so the window outlives the session."""
+    return {
+        "id": entry.id,
+        "source": entry.source,
+        "content": entry.content,
+        "requires_saving_throw": bool(
+            entry.metadata_dict and entry.metadata_dict.get("requires_saving_throw")
+        ),
+    }
+
+
+def _fetch_log_page(
+    db: Session,
+    before_id: int | None = None,
+    after_id: int | None = None,
+    limit: int | None = LOG_PAGE_SIZE,
+) -> tuple[list[dict], bool]:
+    """
+    Fetches a page of log entries using keyset pagination on LogEntry.id.
+
+    Args:
+        db: The database session.
+        before_id: Only return entries older than this id (the newest of them).
+        after_id: Only return entries newer than this id (the oldest of them).
+        limit: The page size, or None for every entry after after_id.
+
+    Returns:
+        The entries in ascending id order, and whether more entries remain in
+        the direction of paging: older ones, or newer ones after after_id.
+    """
+    if after_id is not None:
+        query = (
+            db.query(LogEntry)
+            .filter(LogEntry.id > after_id)
+            .order_by(LogEntry.id.asc())
+        )
+        if limit is None:
+            return [_snapshot_log_entry(e) for e in query.all()], False
+        entries = query.limit(limit + 1).all()
+        return [_snapshot_log_entry(e) for e in entries[:limit]], len(entries) > limit
+
+    query = db.query(LogEntry)
+    if before_id is not None:
+        query = query.filter(LogEntry.id < before_id)
+    # Fetch one extra row to learn whether another page exists
+    entries = query.order_by(LogEntry.id.desc()).limit(limit + 1).all()
+    has_older = len(entries) > limit
+    entries = entries[:limit]
+    entries.reverse()
+    return [_snapshot_log_entry(e) for e in entries], has_older
+
+
+def _refresh_log_window(db: Session, window: dict) -> None:
+    """Loads the newest page on first use, then only entries added since."""
+    if window["has_newer"]:
+        # Scrolled back into history; newer entries wait for "Load newer entries"
+        return
+    if window["newest_id"] is None:
+        entries, has_older = _fetch_log_page(db)
+        window["has_older"] = has_older
+    else:
+        entries, _ = _fetch_log_page(db, after_id=window["newest_id"], limit=None)
+
+    for entry in entries:
+        window["entries"][entry["id"]] = entry
+    if entries:
+        window["newest_id"] = entries[-1]["id"]
+        if window["oldest_id"] is None:
+            window["oldest_id"] = entries[0]["id"]
+        _trim_log_window(window, keep_newest=True)
+
+
+def _load_older_entries(db: Session, window: dict) -> None:
+    """Prepends the page of entries preceding the oldest one in the window."""
+    if window["oldest_id"] is None:
+        return
+    entries, has_older = _fetch_log_page(db, before_id=window["oldest_id"])
+    window["has_older"] = has_older
+    if entries:
+        window["entries"] = {
+            **{entry["id"]: entry for entry in entries},
+            **window["entries"],
+        }
+        window["oldest_id"] = entries[0]["id"]
+        _trim_log_window(window, keep_newest=False)
+
+
+def _load_newer_entries(db: Session, window: dict) -> None:
+    """Appends the page of entries following the newest one in the window."""
+    if window["newest_id"] is None:
+        return
+    entries, has_newer = _fetch_log_page(db, after_id=window["newest_id"])
+    window["has_newer"] = has_newer
+    for entry in entries:
+        window["entries"][entry["id"]] = entry
+    if entries:
+        window["newest_id"] = entries[-1]["id"]
+        _trim_log_window(window, keep_newest=True)
+
+
+def _trim_log_window(window: dict, keep_newest: bool) -> None:
+    """
+    Drops entries beyond LOG_WINDOW_MAX_ENTRIES from the end of the window
+    furthest from the page just loaded, so they can be paged back in later.
+    """
+    excess = len(window["entries"]) - LOG_WINDOW_MAX_ENTRIES
+    if excess <= 0:
+        return
+    ids = list(window["entries"])
+    if keep_newest:
+        dropped, window["oldest_id"] = ids[:excess], ids[excess]
+        window["has_older"] = True
+    else:
+        dropped, window["newest_id"] = ids[-excess:], ids[-excess - 1]
+        window["has_newer"] = True
+    for entry_id in dropped:
+        del window["entries"][entry_id]
+
 
 def _render_user_input(db: Session):
     """Renders the user input bar."""
     if prompt := st.chat_input("What do you do?"):
         st.session_state.orchestrator.handle_player_input(prompt, db)
+        _show_latest_entries()
         st.rerun()
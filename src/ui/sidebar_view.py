@@ -1,6 +1,7 @@
 import streamlit as st
 from sqlalchemy.orm import Session
 from database.models import GameEntity
+from core.scheduler import upcoming_deadlines
 
 
 def render_sidebar(character: GameEntity, db: Session):
@@ -11,6 +12,7 @@ def render_sidebar(character: GameEntity, db: Session):
 
         _render_vitals(character)
         _render_inventory(character, db)
+        _render_upcoming_deadlines(db)
         _render_game_controls()
 
 
@@ -54,17 +56,70 @@ def _render_inventory(character: GameEntity, db: Session):
         col1.write(slot_text)
 
 
+def _render_upcoming_deadlines(db: Session):
+    """Lists the tension events that will escalate soonest."""
+    deadlines = upcoming_deadlines(db)
+    if not deadlines:
+        return
+    st.header("Upcoming Deadlines")
+    deadlines_container = st.container(border=True)
+    for deadline in deadlines:
+        watches = deadline["watches_remaining"]
+        deadlines_container.write(
+            f"{deadline['title']}: {watches} watch{'es' if watches != 1 else ''}"
+        )
+
+
 def _render_game_controls():
     """Renders the game control buttons."""
     st.header("Game Controls")
     st.button("Save Game (autosaved)", use_container_width=True, disabled=True)
+    if "rag_service" in st.session_state:
+        if st.button("Rebuild Memory Index", use_container_width=True):
+            indexed = st.session_state.rag_service.reindex()
+            st.toast(f"Memory rebuilt from {indexed} log entries.")
+    if "indexing_worker" in st.session_state:
+        _render_memory_freshness(st.session_state.indexing_worker.freshness())
+    if "orchestrator" in st.session_state:
+        _render_retrieval_stats(st.session_state.orchestrator.last_retrieval_stats)
     if st.button("Exit to Main Menu", use_container_width=True):
         st.session_state["game_active"] = False
+        if "indexing_worker" in st.session_state:
+            st.session_state.indexing_worker.stop()
         # Clean up session state before going to launcher
-        for key in ["character_id", "active_db_path", "orchestrator"]:
+        for key in [
+            "character_id",
+            "active_db_path",
+            "orchestrator",
+            "rag_service",
+            "indexing_worker",
+            "log_window",
+        ]:
             if key in st.session_state:
                 del st.session_state[key]
         from database.database import dispose_engine
 
         dispose_engine()
         st.rerun()
+
+
+def _render_memory_freshness(freshness: dict):
+    """Shows how far the memory index trails the adventure log."""
+    lag = freshness["last_lag_seconds"]
+    lag_text = f"{lag:.1f}s" if lag is not None else "n/a"
+    st.caption(
+        f"Memory lag: {lag_text} ({freshness['pending']} pending, "
+        f"{freshness['indexed']} indexed)"
+    )
+
+
+def _render_retrieval_stats(stats: dict | None):
+    """Shows what the last turn recalled from the memory index."""
+    if not stats:
+        return
+    if stats["skipped"]:
+        st.caption(f"Memory recall skipped after {stats['latency_ms']} ms")
+    else:
+        st.caption(
+            f"Memory recall: {stats['hits']} hits in {stats['latency_ms']} ms"
+        )
@@ -2,7 +2,14 @@
 Tests for the character_generator module.
 """
 
+import random
+from unittest.mock import Mock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
 from core.character_generator import CharacterGenerator
+from core.rng import RNGService
+from core.world_generator import WorldGenerator
+from database.models import Base, GameEntity, Location, MapPoint
 
 
 def test_generate_character():
@@ -35,3 +42,47 @@ def test_generate_character():
     assert 3 <= character_sheet["willpower"] <= 18
     assert 1 <= character_sheet["hp"] <= 6
     assert 12 <= character_sheet["age"] <= 50
+
+
+def test_generate_characters_in_bulk():
+    """Bulk generation returns stat-accurate columns and honours its seed."""
+    generator = CharacterGenerator()
+    columns = generator.generate_characters(500, seed=3)
+
+    assert set(columns) == set(generator.generate_character())
+    assert all(len(values) == 500 for values in columns.values())
+    assert all(3 <= value <= 18 for value in columns["strength"] + columns["willpower"])
+    assert all(1 <= value <= 6 for value in columns["hp"])
+    assert all(12 <= value <= 50 for value in columns["age"])
+    assert len(set(columns["background"])) > 10
+    assert columns == generator.generate_characters(500, seed=3)
+
+    # Without a seed, a plain random.Random generator still decides the rolls
+    assert CharacterGenerator(random.Random(4)).generate_characters(20) == CharacterGenerator(
+        random.Random(4)
+    ).generate_characters(20)
+    light = generator.generate_characters(10, seed=3, details=False)
+    assert "starting_gear" not in light and len(light["name"]) == 10
+
+
+def test_populate_npcs_inserts_rolled_rows():
+    """A location is filled with NPCs in one bulk insert."""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    point = MapPoint(name="Market Town", status="explored")
+    location = Location(name="Market Square", description="", map_point=point)
+    db.add_all([point, location])
+    db.flush()
+
+    world_generator = WorldGenerator(db, Mock(), rng=RNGService(1).stream("world_gen"))
+    assert world_generator.populate_npcs(location, 200) == 200
+    world_generator._create_settlement_npcs(location, ["Elder Mara (worried)"])
+    db.commit()
+
+    npcs = db.query(GameEntity).filter_by(current_location_id=location.id).all()
+    assert len(npcs) == 201
+    assert all(npc.entity_type == "NPC" and npc.hp == npc.max_hp for npc in npcs)
+    assert len({npc.strength for npc in npcs}) > 5
+    assert npcs[-1].name == "Elder Mara" and npcs[-1].description == "Elder Mara (worried)"
+    db.close()
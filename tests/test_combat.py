@@ -0,0 +1,193 @@
+"""
+Tests for the combat rules and compiled attack profiles.
+"""
+
+import json
+from collections import OrderedDict
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from database.models import Base, GameEntity, Location, MapPoint
+from core import combat, rng, world_tools
+import numpy as np
+from core.dice import DiceExpression, DiceTerm, compile_dice, roll_batch
+
+# In-memory SQLite for testing
+engine = create_engine("sqlite:///:memory:")
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+def test_compile_dice():
+    """Dice strings are parsed once into reusable expressions."""
+    assert compile_dice("2d8+2") == DiceExpression((DiceTerm(2, 8),), 2)
+    assert compile_dice("1D20 - 1") == DiceExpression((DiceTerm(1, 20),), -1)
+    assert compile_dice("3").roll()["total"] == 3
+    assert compile_dice("a sharp stick") is None
+    assert compile_dice("1d6") is compile_dice("1d6")
+
+
+def test_compile_dice_expressions():
+    """Sums, keep highest/lowest, annotations and Cairn damage modes."""
+    assert compile_dice("1d6+1d4-1") == DiceExpression((DiceTerm(1, 6), DiceTerm(1, 4)), -1)
+    assert compile_dice("d8 - 1d4 + 2") == DiceExpression((DiceTerm(1, 8), DiceTerm(1, 4, sign=-1)), 2)
+    assert compile_dice("2d20kh1") == DiceExpression((DiceTerm(2, 20, keep=1),), 0)
+    assert compile_dice("4d6kl3") == DiceExpression((DiceTerm(4, 6, keep=-3),), 0)
+    assert compile_dice("1d8 (slashing)") == compile_dice("1d8")
+    for invalid in ("1d6x", "0d6", "2d6kh3", "1d6+", "1d0"):
+        assert compile_dice(invalid) is None
+    assert compile_dice("2d8+2", impaired=True) == compile_dice("1d4")
+    assert compile_dice("1d6", enhanced=True) == compile_dice("1d12")
+    assert compile_dice("1d6", impaired=True, enhanced=True) == compile_dice("1d6")
+
+    advantage = compile_dice("2d20kh1").roll()
+    assert advantage["total"] == max(advantage["rolls"])
+    assert advantage["dropped"] == [min(advantage["rolls"])]
+
+
+def test_roll_batch_stays_in_range():
+    """Batched rolls vectorize across expressions and repetitions."""
+    expressions = [compile_dice(s) for s in ("2d20kh1", "1d6+1d6+1", "3", "1d4-1d4")]
+    totals = roll_batch(expressions, 2000, np.random.default_rng(7))
+    assert totals.shape == (4, 2000)
+    for expression, row in zip(expressions, totals):
+        assert expression.minimum <= row.min() and row.max() <= expression.maximum
+    assert totals[0].mean() > 13  # advantage beats a plain d20's 10.5
+    assert set(totals[2]) == {3}
+    assert compile_dice("1d6").roll_many(5).shape == (5,)
+
+
+def test_attack_profile_reads_both_encodings():
+    """Double-encoded attack strings and plain lists compile to the same profile."""
+    attacks = [{"name": "Spear", "damage": "1d8"}]
+
+    from_list = combat.compile_attack_profile(attacks)
+    from_string = combat.compile_attack_profile(json.dumps(attacks))
+
+    assert from_list == from_string
+    assert from_list.primary.name == "Spear"
+    assert from_list.primary.damage == DiceExpression((DiceTerm(1, 8),), 0)
+    assert combat.compile_attack_profile(None) == combat.DEFAULT_PROFILE
+    assert combat.compile_attack_profile("not json") == combat.DEFAULT_PROFILE
+
+
+def test_attack_profile_is_cached_per_entity(db_session, monkeypatch):
+    """Repeated swings reuse the profile until the entity's attacks change."""
+    compiled = []
+    original = combat.compile_attack_profile
+
+    def counting_compile(raw):
+        compiled.append(raw)
+        return original(raw)
+
+    monkeypatch.setattr(combat, "compile_attack_profile", counting_compile)
+    monkeypatch.setattr(combat, "_profile_cache", OrderedDict())
+    attacker = GameEntity(
+        name="Bandit", entity_type="NPC", hp=5, strength=10,
+        attacks=[{"name": "Club", "damage": "1d6"}],
+    )
+    target = GameEntity(name="Straw Dummy", entity_type="NPC", hp=100, strength=100)
+    db_session.add_all([attacker, target])
+    db_session.commit()
+
+    for _ in range(5):
+        result = world_tools.deal_damage(db_session, "Bandit", "Straw Dummy")
+        assert result["damage_roll"] == "1d6"
+    assert len(compiled) == 1
+
+    attacker.attacks = [{"name": "Axe", "damage": "1d10"}]
+    db_session.commit()
+    result = world_tools.deal_damage(db_session, "Bandit", "Straw Dummy")
+
+    assert result["damage_roll"] == "1d10"
+    assert len(compiled) == 2
+
+
+def _ambush(db_session, hostiles, player_hp=10, player_strength=10, damage="1d4"):
+    map_point = MapPoint(name="Gallows Hill", status="known")
+    location = Location(name="Crossroads", map_point=map_point)
+    player = GameEntity(
+        name="Player", entity_type="Character", hp=player_hp, max_hp=player_hp,
+        strength=player_strength, current_location=location,
+    )
+    bandits = [
+        GameEntity(
+            name=f"Bandit {i}", entity_type="Monster", hp=4, strength=8,
+            is_hostile=True, current_location=location,
+            attacks=[{"name": "Knife", "damage": damage}],
+        )
+        for i in range(hostiles)
+    ]
+    db_session.add_all([map_point, location, player, *bandits])
+    db_session.commit()
+    return player, bandits
+
+
+def test_combat_round_uses_one_query_and_one_flush(db_session):
+    """A large ambush is resolved in memory, not with a round trip per attacker."""
+    player, _ = _ambush(db_session, hostiles=50, player_hp=1000, player_strength=10)
+    db_session.refresh(player)
+    rng.rng_service(db_session)  # Loaded once per session, not per round
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        combat_round = combat.resolve_combat_round(db_session, player)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert len(combat_round["attacks"]) == 50
+    assert sum(s.lstrip().upper().startswith("SELECT") for s in statements) == 1
+    assert sum(s.lstrip().upper().startswith("UPDATE") for s in statements) == 1
+    damage = sum(attack["damage_taken"] for attack in combat_round["attacks"])
+    assert player.hp == 1000 - damage
+
+
+def test_combat_round_applies_cairn_damage_rules(db_session):
+    """Damage overflows into Strength, and the round ends when the target dies."""
+    player, _ = _ambush(
+        db_session, hostiles=5, player_hp=2, player_strength=3, damage="3"
+    )
+
+    combat_round = combat.resolve_combat_round(db_session, player)
+    db_session.commit()
+
+    first, second = combat_round["attacks"]
+    assert (first["hp_lost"], first["strength_lost"]) == (2, 1)
+    assert (second["hp_lost"], second["strength_lost"]) == (0, 3)
+    assert second["is_dead"] and combat_round["is_dead"]
+    assert player.is_retired is True
+
+
+def test_exact_zero_hp_leaves_a_scar():
+    """A hit that takes HP to exactly zero scars the target."""
+    target = GameEntity(name="Player", hp=3, max_hp=3, strength=10)
+
+    result = combat.apply_damage("Wolf", target, "3", 3)
+
+    assert result["received_scar"] == combat.SCAR_DESCRIPTION
+    assert target.max_hp == 2 and target.hp == 0 and target.strength == 10
+
+
+def test_armor_is_subtracted_from_damage():
+    """Armor soaks damage, up to Cairn's limit of 3."""
+    target = GameEntity(name="Knight", hp=4, max_hp=4, strength=10, armor=5)
+
+    result = combat.apply_damage("Ogre", target, "1d10", 5)
+
+    assert (result["armor"], result["damage_taken"]) == (3, 2)
+    assert target.hp == 2
+    assert combat.apply_damage("Ogre", target, "1d10", 2)["damage_taken"] == 0
@@ -5,9 +5,25 @@ Tests for the ConditionTracker service.
 import pytest
 import datetime
 from unittest.mock import Mock
-from sqlalchemy.orm import Session
-from core.condition_tracker import ConditionTracker
-from database.models import TensionEvent, ResolutionCondition, LogEntry
+from sqlalchemy import create_engine, event as sa_event, insert
+from sqlalchemy.orm import Session, sessionmaker
+from core.condition_tracker import ConditionTracker, CONDITION_INDEX_KEY
+from database.models import Base, TensionEvent, ResolutionCondition, LogEntry
+
+# In-memory SQLite for the index tests
+engine = create_engine("sqlite:///:memory:")
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
 
 
 class TestConditionTracker:
@@ -154,6 +170,7 @@ class TestConditionTracker:
         mock_db.query.return_value = mock_query
         mock_filter = Mock()
         mock_query.filter.return_value = mock_filter
+        mock_filter.execution_options.return_value = mock_filter
         
         tracker = ConditionTracker(mock_db)
         
@@ -170,9 +187,104 @@ class TestConditionTracker:
         mock_db.query.assert_called()
         mock_filter.update.assert_called_once()
         
-        # Verify log entry was added
+        # Verify log entry was added; the turn commits it
         mock_db.add.assert_called()
-        mock_db.commit.assert_called()
+        mock_db.flush.assert_called()
+        mock_db.commit.assert_not_called()
+
+
+def _add_event(db_session, title, *conditions):
+    event = TensionEvent(
+        title=title, description=title, source_type="world_event",
+        deadline_watches=3, watches_remaining=3,
+        conditions=[
+            ResolutionCondition(
+                condition_type=condition_type, description=description,
+                target_data=target_data, is_met=False,
+            )
+            for condition_type, description, target_data in conditions
+        ],
+    )
+    db_session.add(event)
+    db_session.commit()
+    return event
+
+
+def test_index_dispatches_only_matching_conditions(db_session):
+    """A trigger loads only the conditions indexed under its key."""
+    wolf = _add_event(
+        db_session, "Wolves", ("entity_death", "Kill the wolf", {"entity_name": "Grey Wolf"})
+    )
+    for i in range(20):
+        _add_event(
+            db_session, f"Errand {i}",
+            ("item_delivery", "Deliver", {"item_name": f"Herb {i}", "receiver_name": "Elder"}),
+        )
+    tracker = ConditionTracker(db_session)
+    tracker.check_all_conditions("location_visit", {"location_name": "Nowhere"})
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    sa_event.listen(engine, "before_cursor_execute", record)
+    try:
+        tracker.check_all_conditions("entity_death", {"entity_name": "Bandit", "entity_id": 99})
+        assert statements == []
+        tracker.check_all_conditions("entity_death", {"entity_name": "grey wolf", "entity_id": 1})
+    finally:
+        sa_event.remove(engine, "before_cursor_execute", record)
+
+    db_session.refresh(wolf)
+    assert wolf.status == "resolved"
+    assert len(db_session.info[CONDITION_INDEX_KEY]) == 20
+
+
+def test_index_follows_new_and_failed_events(db_session):
+    """Conditions added or abandoned after the index is built are kept in step."""
+    tracker = ConditionTracker(db_session)
+    tracker.check_all_conditions("location_visit", {"location_name": "Nowhere"})
+
+    mill = _add_event(
+        db_session, "Mill",
+        ("location_visit", "Visit the mill", {"location_name": "Old Mill"}),
+        ("item_received", "Get the key", {"item_name": "Key", "recipient_name": "Player"}),
+    )
+    cellar = _add_event(
+        db_session, "Cellar", ("location_visit", "Visit the mill", {"location_name": "Old Mill"})
+    )
+    db_session.query(TensionEvent).filter_by(id=cellar.id).update(
+        {"watches_remaining": 0, "due_at_watch": 0, "severity_level": 5}
+    )
+    tracker.escalate_tension_events()
+
+    tracker.check_all_conditions("location_visit", {"location_name": "Old Mill"})
+    db_session.refresh(mill)
+    assert mill.status == "active"
+    tracker.check_all_conditions("item_received", {"item_name": "key", "recipient_name": "player"})
+
+    db_session.refresh(mill)
+    db_session.refresh(cellar)
+    assert mill.status == "resolved"
+    assert cellar.status == "failed"
+    assert not cellar.conditions[0].is_met
+
+
+def test_index_follows_bulk_inserted_conditions(db_session):
+    """Conditions written with a bulk statement, as world generation does, can be met."""
+    tracker = ConditionTracker(db_session)
+    tracker.check_all_conditions("location_visit", {"location_name": "Nowhere"})
+
+    mill = _add_event(db_session, "Mill")
+    db_session.execute(insert(ResolutionCondition), [{
+        "tension_event_id": mill.id, "condition_type": "location_visit",
+        "description": "Visit the mill", "target_data": {"location_name": "Old Mill"},
+        "is_met": False,
+    }])
+    tracker.check_all_conditions("location_visit", {"location_name": "Old Mill"})
+
+    db_session.refresh(mill)
+    assert mill.status == "resolved"
 
 
 if __name__ == "__main__":
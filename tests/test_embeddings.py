@@ -0,0 +1,56 @@
+"""
+Tests for the embedding backends.
+"""
+
+import math
+from unittest.mock import Mock
+from core.embeddings import CachedEmbeddings, HashingEmbeddings, create_embeddings
+
+
+def test_hashing_embeddings_are_normalized_and_deterministic():
+    """Local vectors have unit length and do not depend on the process."""
+    embeddings = HashingEmbeddings(dimensions=64)
+    first = embeddings.embed_query("The mill burns at midnight.")
+    second = embeddings.embed_documents(["The mill burns at midnight."])[0]
+
+    assert len(first) == 64
+    assert math.isclose(sum(v * v for v in first), 1.0)
+    assert first == second
+
+
+def test_hashing_embeddings_rank_shared_words_higher():
+    """Texts sharing words are closer than unrelated texts."""
+    embeddings = HashingEmbeddings()
+    query = embeddings.embed_query("the reeve and the mill")
+    related, unrelated = embeddings.embed_documents(
+        ["The reeve guards the old mill.", "Crows circle a distant hill."]
+    )
+
+    def dot(a, b):
+        return sum(x * y for x, y in zip(a, b))
+
+    assert dot(query, related) > dot(query, unrelated)
+
+
+def test_cached_embeddings_batches_and_deduplicates():
+    """Only unseen texts reach the backend, in batches of the configured size."""
+    backend = Mock()
+    backend.embed_documents.side_effect = lambda texts: [[float(len(t))] for t in texts]
+    cached = CachedEmbeddings(backend, batch_size=2, name="mock")
+
+    vectors = cached.embed_documents(["a", "bb", "a", "ccc"])
+    assert vectors == [[1.0], [2.0], [1.0], [3.0]]
+    assert [len(c.args[0]) for c in backend.embed_documents.call_args_list] == [2, 1]
+
+    cached.embed_documents(["bb", "ccc"])
+    assert backend.embed_documents.call_count == 2
+
+
+def test_create_embeddings_defaults_to_local_without_api_key(monkeypatch):
+    """Without a Google API key the service falls back to the local backend."""
+    monkeypatch.delenv("GOOGLE_API_KEY", raising=False)
+    monkeypatch.delenv("SCAW_EMBEDDINGS", raising=False)
+
+    embeddings = create_embeddings()
+
+    assert embeddings.backend_name.startswith("local-hashing")
@@ -0,0 +1,92 @@
+"""
+Tests for the Monte Carlo encounter simulator.
+"""
+
+import random
+import pytest
+import numpy as np
+from core import encounters
+from core.dice import compile_dice
+from core.encounters import THREAT_TIERS, StatBlock, scale_threat, simulate_encounter
+from database.models import GameEntity
+
+
+def _block(name, hp, strength, armor, damage):
+    return StatBlock(name, hp, strength, armor, compile_dice(damage))
+
+
+def test_fixed_damage_follows_the_combat_rules():
+    hero = _block("Hero", 5, 10, 1, "4")
+    wolf = _block("Wolf", 3, 5, 0, "3")
+    report = simulate_encounter(hero, [wolf], fights=10)
+    # The hero's first hit overflows into Strength, the second kills;
+    # the wolf's single bite is softened by Armor
+    assert report.win_rate == 1.0 and report.death_rate == 0.0
+    assert report.expected_rounds == 2
+    assert report.scar_distribution == {0: 1.0}
+    assert report.enemy_deaths == {1: 1.0}
+
+
+def test_exact_zero_hp_scars_and_strength_loss_kills():
+    hero = _block("Hero", 2, 3, 0, "1")
+    wolf = _block("Wolf", 10, 10, 0, "2")
+    # The first bite leaves a Scar at exactly 0 HP...
+    report = simulate_encounter(hero, [wolf], fights=10, max_rounds=1)
+    assert report.death_rate == 0.0 and report.scar_distribution == {1: 1.0}
+    # ...and the next two overflow into Strength until it is gone
+    report = simulate_encounter(hero, [wolf], fights=10)
+    assert report.death_rate == 1.0 and report.expected_rounds == 3
+    assert report.enemy_deaths == {0: 1.0}
+
+
+def test_armor_can_make_a_stalemate():
+    hero = _block("Knight", 5, 10, 3, "1d2")
+    golem = _block("Golem", 5, 10, 3, "1d3")
+    report = simulate_encounter(hero, [golem], fights=100, max_rounds=7)
+    assert report.stalemate_rate == 1.0
+    assert report.expected_rounds == 7
+
+
+def test_many_fights_are_reproducible():
+    hero = StatBlock.from_entity(GameEntity(
+        id=10_001, name="Hero", hp=6, strength=12, armor=1,
+        attacks=[{"name": "Sword", "damage": "1d8"}],
+    ))
+    bandits = [_block(f"Bandit {i}", 4, 10, 0, "1d6") for i in range(3)]
+    first = simulate_encounter(hero, bandits, 100_000, np.random.default_rng(4))
+    second = simulate_encounter(hero, bandits, 100_000, np.random.default_rng(4))
+    assert first == second
+    assert first.win_rate + first.death_rate + first.stalemate_rate == pytest.approx(1.0)
+    assert 0 < first.death_rate < 1
+    assert sum(first.enemy_deaths.values()) == pytest.approx(1.0)
+
+
+def test_threats_scale_with_the_hero():
+    novice = _block("Novice", 2, 8, 0, "1d4")
+    champion = _block("Champion", 18, 18, 3, "1d12")
+    weak_tier, _ = scale_threat(novice, "Horror", 0.1, random.Random(1))
+    strong_tier, stats = scale_threat(champion, "Horror", 0.1, random.Random(1))
+    assert THREAT_TIERS.index(weak_tier) < THREAT_TIERS.index(strong_tier)
+    assert stats.armor == strong_tier.armor
+
+
+
+def test_plain_random_seeds_the_simulated_fights(monkeypatch):
+    death_rates = []
+
+    def recording(*args, **kwargs):
+        report = simulate_encounter(*args, **kwargs)
+        death_rates.append(report.death_rate)
+        return report
+
+    monkeypatch.setattr(encounters, "simulate_encounter", recording)
+    hero = _block("Hero", 6, 12, 1, "1d8")
+    scale_threat(hero, "Horror", 0.5, random.Random(2))
+    first = list(death_rates)
+    death_rates.clear()
+    scale_threat(hero, "Horror", 0.5, random.Random(2))
+    assert first and death_rates == first
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,116 @@
+"""
+Tests for the background IndexingWorker.
+"""
+
+import pytest
+from unittest.mock import Mock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from database.models import Base, LogEntry
+from core.embeddings import HashingEmbeddings
+from core.indexing_worker import IndexingWorker
+from core.orchestrator import WardenOrchestrator
+from core.rag_service import RAGService
+
+# In-memory SQLite for testing
+engine = create_engine("sqlite:///:memory:")
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+def test_worker_batches_entries_and_reports_lag():
+    """Queued entries are indexed together and the lag is recorded."""
+    rag_service = Mock()
+    worker = IndexingWorker(rag_service, batch_size=10, flush_interval=0.05)
+    entries = [Mock(id=i, content=f"Entry {i}", source="Warden") for i in range(3)]
+
+    worker.submit(entries)
+    worker.start()
+    worker.wait_until_idle()
+    worker.stop()
+
+    indexed = rag_service.index_entries.call_args.args[0]
+    assert [entry.id for entry in indexed] == [0, 1, 2]
+    freshness = worker.freshness()
+    assert freshness["indexed"] == 3
+    assert freshness["pending"] == 0
+    assert freshness["last_lag_seconds"] >= 0
+
+
+def test_worker_retries_and_survives_indexing_errors():
+    """A batch that keeps failing is counted and held back; the worker keeps running."""
+    rag_service = Mock()
+
+    def index_entries(batch):
+        if batch[0].id == 1:
+            raise RuntimeError("offline")
+
+    rag_service.index_entries.side_effect = index_entries
+    worker = IndexingWorker(rag_service, batch_size=1, flush_interval=0, retry_delay=0).start()
+
+    worker.submit([Mock(id=1, content="a", source="Warden")])
+    worker.wait_until_idle()
+    worker.submit([Mock(id=2, content="b", source="Warden")])
+    worker.wait_until_idle()
+    worker.stop()
+
+    assert rag_service.index_entries.call_count == 3 + 1
+    rag_service.mark_unindexed.assert_called_once_with([1])
+    assert worker.freshness()["failed"] == 1
+    assert worker.freshness()["indexed"] == 1
+
+
+def test_transient_errors_are_retried():
+    rag_service = Mock()
+    rag_service.index_entries.side_effect = [RuntimeError("busy"), None]
+    worker = IndexingWorker(rag_service, flush_interval=0, retry_delay=0).start()
+
+    worker.submit([Mock(id=1, content="a", source="Warden")])
+    worker.wait_until_idle()
+    worker.stop()
+
+    assert worker.freshness()["indexed"] == 1 and worker.freshness()["failed"] == 0
+    rag_service.mark_unindexed.assert_not_called()
+
+
+def test_failed_entries_are_indexed_on_the_next_load(db_session, tmp_path):
+    """The high-water mark stays below a failed entry, so loading the log catches it up."""
+    rag_service = RAGService(db_session, str(tmp_path / "memory"), HashingEmbeddings())
+    entries = [LogEntry(source="Warden", content=text) for text in ("The ferry sank.", "The bell tolled.")]
+    db_session.add_all(entries)
+    db_session.commit()
+
+    rag_service.mark_unindexed([entries[0].id])
+    rag_service.index_entries([entries[1]])
+    assert rag_service.high_water_mark == entries[0].id - 1
+
+    assert rag_service.load_adventure_log() == 2
+    assert rag_service.high_water_mark == entries[1].id
+    assert "The ferry sank." in rag_service.search("ferry")
+
+
+def test_turn_log_entries_become_searchable(db_session, tmp_path):
+    """The orchestrator hands each turn's entries to the worker after committing."""
+    rag_service = RAGService(db_session, str(tmp_path / "memory"), HashingEmbeddings())
+    worker = IndexingWorker(rag_service, flush_interval=0).start()
+    llm_service = Mock()
+    llm_service.choose_tool.return_value = None
+    llm_service.generate_response.return_value = "The mill wheel creaks in the dark."
+    orchestrator = WardenOrchestrator(llm_service, db_session, indexing_worker=worker)
+
+    orchestrator.handle_player_input("I listen at the mill door.", db_session)
+    worker.wait_until_idle()
+    worker.stop()
+
+    assert rag_service.high_water_mark == db_session.query(LogEntry).count() == 2
+    assert "The mill wheel creaks in the dark." in rag_service.search("mill wheel")
@@ -0,0 +1,23 @@
+"""
+Tests for the prompt helpers in the LLMService module.
+"""
+
+from core.llm_service import CHARS_PER_TOKEN, fit_memories
+
+
+def test_fit_memories_keeps_everything_within_allowance():
+    """Memories that fit the allowance are passed through unchanged."""
+    memories = ["The mill burns.", "The Reeve weeps."]
+    assert fit_memories(memories, token_allowance=100) == memories
+
+
+def test_fit_memories_trims_to_allowance():
+    """The memory that crosses the allowance is cut short and later ones dropped."""
+    memories = ["a" * 30, "b" * 30, "c" * 30]
+
+    fitted = fit_memories(memories, token_allowance=10)
+
+    assert fitted[0] == memories[0]
+    assert fitted[1].startswith("b") and fitted[1].endswith("...")
+    assert len(fitted) == 2
+    assert sum(len(memory) for memory in fitted) <= 10 * CHARS_PER_TOKEN
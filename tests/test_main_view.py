@@ -0,0 +1,122 @@
+"""
+Tests for the windowed adventure log in the main view.
+"""
+
+import pytest
+import ui.main_view
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from database.models import Base, LogEntry
+from ui.main_view import (
+    _fetch_log_page,
+    _load_newer_entries,
+    _load_older_entries,
+    _new_log_window,
+    _refresh_log_window,
+)
+
+# In-memory SQLite for testing
+engine = create_engine("sqlite:///:memory:")
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+def _add_entries(db_session, count, start=0):
+    db_session.add_all(
+        [LogEntry(source="Warden", content=f"Entry {start + i}") for i in range(count)]
+    )
+    db_session.commit()
+
+
+def test_fetch_log_page_returns_newest_entries_in_order(db_session):
+    """The first page holds the newest entries, oldest first."""
+    _add_entries(db_session, 5)
+
+    entries, has_older = _fetch_log_page(db_session, limit=3)
+
+    assert [e["content"] for e in entries] == ["Entry 2", "Entry 3", "Entry 4"]
+    assert has_older is True
+
+
+def test_fetch_log_page_keyset_before_id(db_session):
+    """Paging backwards continues from the given id."""
+    _add_entries(db_session, 5)
+    newest, _ = _fetch_log_page(db_session, limit=3)
+
+    older, has_older = _fetch_log_page(db_session, before_id=newest[0]["id"], limit=3)
+
+    assert [e["content"] for e in older] == ["Entry 0", "Entry 1"]
+    assert has_older is False
+
+
+def test_log_window_refresh_only_appends_new_entries(db_session):
+    """Refreshing the window picks up entries committed since the last rerun."""
+    _add_entries(db_session, 3)
+    window = _new_log_window("test.db")
+    _refresh_log_window(db_session, window)
+    assert len(window["entries"]) == 3
+
+    _add_entries(db_session, 2, start=3)
+    _refresh_log_window(db_session, window)
+
+    contents = [e["content"] for e in window["entries"].values()]
+    assert contents == ["Entry 0", "Entry 1", "Entry 2", "Entry 3", "Entry 4"]
+
+
+def test_load_older_entries_prepends_page(db_session):
+    """Loading older entries extends the window at the top."""
+    _add_entries(db_session, 5)
+    window = _new_log_window("test.db")
+    entries, has_older = _fetch_log_page(db_session, limit=2)
+    window["entries"] = {e["id"]: e for e in entries}
+    window["oldest_id"], window["newest_id"] = entries[0]["id"], entries[-1]["id"]
+    window["has_older"] = has_older
+
+    _load_older_entries(db_session, window)
+
+    contents = [e["content"] for e in window["entries"].values()]
+    assert contents == ["Entry 0", "Entry 1", "Entry 2", "Entry 3", "Entry 4"]
+    assert window["oldest_id"] == min(window["entries"])
+    assert window["has_older"] is False
+
+
+def test_log_window_is_capped_at_the_end_away_from_view(db_session, monkeypatch):
+    """The window drops the pages furthest from the entries just loaded."""
+    monkeypatch.setattr(ui.main_view, "LOG_WINDOW_MAX_ENTRIES", 4)
+    _add_entries(db_session, 3)
+    window = _new_log_window("test.db")
+    _refresh_log_window(db_session, window)
+
+    _add_entries(db_session, 3, start=3)
+    _refresh_log_window(db_session, window)
+    contents = [e["content"] for e in window["entries"].values()]
+    assert contents == ["Entry 2", "Entry 3", "Entry 4", "Entry 5"]
+    assert window["oldest_id"] == min(window["entries"])
+    assert window["has_older"] is True
+
+    _load_older_entries(db_session, window)
+    contents = [e["content"] for e in window["entries"].values()]
+    assert contents == ["Entry 0", "Entry 1", "Entry 2", "Entry 3"]
+    assert window["newest_id"] == max(window["entries"])
+    assert window["has_newer"] is True
+
+    # While scrolled back, new turns wait instead of growing the window
+    _add_entries(db_session, 1, start=6)
+    _refresh_log_window(db_session, window)
+    assert len(window["entries"]) == 4
+
+    _load_newer_entries(db_session, window)
+    contents = [e["content"] for e in window["entries"].values()]
+    assert contents == ["Entry 3", "Entry 4", "Entry 5", "Entry 6"]
+    assert window["has_newer"] is False
+    assert window["has_older"] is True
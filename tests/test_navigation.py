@@ -0,0 +1,94 @@
+"""
+Tests for movement between the locations of a MapPoint.
+"""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from core import navigation, world_tools
+from core.world_manager import WorldManager
+from database.models import Base, GameEntity, Location, LocationConnection, MapPoint
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def keep(db_session):
+    """Gate <-> Hall <-> Stair -> Cellar, plus a Crypt with no way in, and a village with its own Hall."""
+    keep = MapPoint(name="Keep", status="explored")
+    rooms = {name: Location(name=name, map_point=keep) for name in ("Gate", "Hall", "Stair", "Cellar", "Crypt")}
+    village = MapPoint(name="Village", status="known")
+    db_session.add_all([
+        keep, village,
+        Location(name="Hall", map_point=village),
+        Location(name="Square", map_point=village),
+        LocationConnection(source_location=rooms["Gate"], destination_location=rooms["Hall"], is_two_way=True),
+        LocationConnection(source_location=rooms["Stair"], destination_location=rooms["Hall"], is_two_way=True),
+        LocationConnection(source_location=rooms["Stair"], destination_location=rooms["Cellar"], is_two_way=False),
+        GameEntity(name="Hero", entity_type="Character", current_location=rooms["Gate"]),
+    ])
+    db_session.commit()
+    return rooms
+
+
+def test_move_routes_through_connected_rooms(db_session, keep):
+    result = world_tools.move_character(db_session, "Hero", "cellar")
+    assert result["success"]
+    assert result["route"] == ["Gate", "Hall", "Stair", "Cellar"]
+    hero = db_session.query(GameEntity).filter_by(name="Hero").one()
+    assert hero.current_location is keep["Cellar"]
+
+    # The way down is one-way, and the Crypt is never reachable
+    assert "cannot be reached" in world_tools.move_character(db_session, "Hero", "Gate")["error"]
+    assert "cannot be reached" in world_tools.move_character(db_session, "Hero", "Crypt")["error"]
+
+
+def test_names_resolve_within_the_current_map_point(db_session, keep):
+    result = world_tools.move_character(db_session, "Hero", "Hall")
+    assert result["success"] and result["route"] == ["Gate", "Hall"]
+    assert db_session.query(GameEntity).filter_by(name="Hero").one().current_location is keep["Hall"]
+    assert "not found" in world_tools.move_character(db_session, "Hero", "Square")["error"]
+    # Only the keep's map was ever built
+    assert list(navigation.navigation_index(db_session).maps) == [keep["Gate"].map_point_id]
+
+
+def test_connection_changes_reach_the_index(db_session, keep):
+    location_map = navigation.location_map(db_session, keep["Gate"].map_point_id)
+    assert location_map.route(keep["Gate"].id, keep["Crypt"].id) is None
+
+    # Moving about leaves the map alone...
+    world_tools.move_character(db_session, "Hero", "Hall")
+    assert navigation.location_map(db_session, keep["Gate"].map_point_id) is location_map
+
+    # ...while a new connection rebuilds it
+    db_session.add(LocationConnection(source_location=keep["Cellar"], destination_location=keep["Crypt"]))
+    db_session.commit()
+    location_map = navigation.location_map(db_session, keep["Gate"].map_point_id)
+    assert [location_map.names[i] for i in location_map.route(keep["Gate"].id, keep["Crypt"].id)] == [
+        "Hall", "Stair", "Cellar", "Crypt"
+    ]
+
+
+def test_world_manager_refuses_unconnected_moves(db_session, keep):
+    manager = WorldManager(db_session)
+    hero = db_session.query(GameEntity).filter_by(name="Hero").one()
+    square = db_session.query(Location).filter_by(name="Square").one()
+    assert "error" in manager.move_character_to_location(hero.id, square.id)
+    assert "error" in manager.move_character_to_location(hero.id, keep["Crypt"].id)
+    assert manager.move_character_to_location(hero.id, keep["Stair"].id)["success"]
+
+    # A map point without any connections is open ground
+    hero.current_location = square
+    hall = db_session.query(Location).filter_by(name="Hall", map_point_id=square.map_point_id).one()
+    assert manager.move_character_to_location(hero.id, hall.id)["success"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -1,8 +1,13 @@
 import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from database.models import Base, GameEntity
-from core.world_tools import update_npc_relationship, get_npc_relationship_info
+from database.models import Base, GameEntity, NPCRelationship, RelationshipEvent
+from core.relationships import apply_relationship_change
+from core.world_tools import (
+    update_npc_relationship,
+    get_npc_relationship_info,
+    list_npcs_by_relationship,
+)
 
 
 @pytest.fixture
@@ -99,3 +104,68 @@ def test_relationship_bounds(db_session):
     assert info["relationship_level"] == -5  # Should be capped at -5
     assert info["disposition"] == "hostile"
     assert npc.is_hostile == True
+
+
+def _make_npcs(db_session, *names):
+    npcs = [GameEntity(name=name, entity_type="NPC", disposition="neutral") for name in names]
+    db_session.add_all(npcs)
+    db_session.commit()
+    return npcs
+
+
+def test_relationship_is_stored_in_tables(db_session):
+    """Updates write the relationship table and history, leaving bond untouched."""
+    (npc,) = _make_npcs(db_session, "Old Hettie")
+    npc.bond = "Owes the baker a favour"
+    db_session.commit()
+
+    for _ in range(12):
+        update_npc_relationship(db_session, "Old Hettie", "helped", 1, "Helped again")
+
+    assert npc.bond == "Owes the baker a favour"
+    assert db_session.get(NPCRelationship, npc.id).level == 5
+    # The history is append-only rather than capped
+    assert db_session.query(RelationshipEvent).filter_by(npc_id=npc.id).count() == 12
+    assert len(get_npc_relationship_info(db_session, "Old Hettie")["recent_history"]) == 3
+
+
+def test_bulk_relationship_change(db_session):
+    """One change can be applied to several NPCs, updating their disposition."""
+    reeve, miller, crow = _make_npcs(db_session, "Reeve", "Miller", "Crow-Witch")
+    apply_relationship_change(db_session, [reeve.id], "insulted", -2, "Rude words")
+
+    results = apply_relationship_change(
+        db_session, [reeve.id, miller.id], "witnessed_violence", -1,
+        "Saw the fight", fear_change="increase"
+    )
+    db_session.commit()
+
+    assert results[reeve.id]["old_level"] == -2
+    assert results[reeve.id]["level"] == -3
+    assert results[miller.id]["level"] == -1
+    assert reeve.is_hostile is True and reeve.disposition == "hostile"
+    assert miller.disposition == "unfriendly"
+    assert crow.disposition == "neutral"
+
+
+def test_list_npcs_by_relationship(db_session):
+    """NPCs can be found by fear and level, including ones with no stored row."""
+    reeve, miller, _ = _make_npcs(db_session, "Reeve", "Miller", "Crow-Witch")
+    for _ in range(2):
+        update_npc_relationship(
+            db_session, "Reeve", "threatened", -1, "Threatened", fear_change="increase"
+        )
+    update_npc_relationship(
+        db_session, "Miller", "threatened", 0, "Glared", fear_change="increase"
+    )
+
+    afraid = list_npcs_by_relationship(db_session, min_fear_level="afraid")
+    wary = list_npcs_by_relationship(db_session, min_fear_level="wary")
+    neutral = list_npcs_by_relationship(
+        db_session, min_relationship_level=0, max_relationship_level=0
+    )
+
+    assert [npc["npc_name"] for npc in afraid["npcs"]] == ["Reeve"]
+    assert [npc["npc_name"] for npc in wary["npcs"]] == ["Reeve", "Miller"]
+    assert [npc["npc_name"] for npc in neutral["npcs"]] == ["Miller", "Crow-Witch"]
+    assert "error" in list_npcs_by_relationship(db_session, min_fear_level="bold")
@@ -0,0 +1,71 @@
+"""
+Tests for the compiled oracle tables.
+"""
+
+import json
+import random
+import pytest
+import numpy as np
+from core import oracle_tables
+from core.oracle_tables import compile_table, get_table, load_tables
+from core.oracles import EASY_TERRAIN, POI_DIE_DROP, TERRAIN_DIE_DROP, OracleRoller
+from core.rng import RNGService
+
+
+def test_die_drops_are_merged_into_weighted_results():
+    table = get_table("TERRAIN_DIE_DROP")
+    assert table.results == ("Easy", "Tough", "Perilous")
+    assert oracle_tables.compiled(TERRAIN_DIE_DROP) is table
+
+    drawn = table.sample_indices(60000, np.random.default_rng(1))
+    frequencies = np.bincount(drawn, minlength=3) / len(drawn)
+    assert np.allclose(frequencies, [3 / 6, 2 / 6, 1 / 6], atol=0.01)
+
+
+def test_uniform_tables_reach_every_result():
+    table = get_table("EASY_TERRAIN")
+    assert table.uniform and len(table) == 20
+    assert set(table.sample(2000, np.random.default_rng(2))) == set(EASY_TERRAIN.values())
+    # Tuples stay whole when sampled in bulk
+    assert all(isinstance(result, tuple) for result in table.sample(5))
+
+
+def test_missing_faces_roll_none_like_a_dict_lookup():
+    table = compile_table("gappy", {1: "Rain", 2: "Rain", 4: "Snow"})
+    assert table.results == ("Rain", None, "Snow")
+    with pytest.raises(ValueError):
+        compile_table("empty", {})
+
+
+def test_roller_draws_from_its_stream():
+    first = OracleRoller(RNGService(8).stream("oracles"))
+    second = OracleRoller(RNGService(8).stream("oracles"))
+    assert first.sample(POI_DIE_DROP, 50) == second.sample(POI_DIE_DROP, 50)
+    assert first.roll_on_table("SETTLEMENTS") == second.roll_on_table("SETTLEMENTS")
+    assert first.roll_wilderness_event() == second.roll_wilderness_event()
+
+
+def test_plain_random_seeds_bulk_samples():
+    first = OracleRoller(random.Random(9)).sample(POI_DIE_DROP, 50)
+    assert OracleRoller(random.Random(9)).sample(POI_DIE_DROP, 50) == first
+    random.seed(9)
+    first = get_table("EASY_TERRAIN").sample(50)
+    random.seed(9)
+    assert get_table("EASY_TERRAIN").sample(50) == first
+
+
+def test_custom_tables_load_from_data_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(oracle_tables, "_tables", {})
+    path = tmp_path / "weather.json"
+    path.write_text(json.dumps({
+        "WEATHER": {"1": "Clear", "2": "Clear", "3": "Fog"},
+        "OMINOUS_SOUNDS": ["Howling", "Bells", "Silence"],
+    }))
+
+    assert load_tables(str(path)) == ["WEATHER", "OMINOUS_SOUNDS"]
+    assert get_table("WEATHER").results == ("Clear", "Fog")
+    assert OracleRoller().roll_on_table("OMINOUS_SOUNDS") in {"Howling", "Bells", "Silence"}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -2,6 +2,8 @@
 Tests for the WardenOrchestrator.
 """
 
+import time
+import threading
 import pytest
 from unittest.mock import Mock
 from sqlalchemy import create_engine
@@ -41,6 +43,16 @@ def orchestrator(mock_llm_service, db_session):
     return WardenOrchestrator(mock_llm_service, db_session)
 
 
+def test_tools_are_only_world_tools(orchestrator):
+    """Helpers imported into world_tools are not offered to the LLM."""
+    assert "attack_profile_for" not in orchestrator.available_tools
+    assert "apply_damage" not in orchestrator.available_tools
+    assert "death_trigger" not in orchestrator.available_tools
+    assert "apply_default_consequence" not in orchestrator.available_tools
+    assert "create_hostile_entity" not in orchestrator.available_tools
+    assert "roll_dice" in orchestrator.available_tools
+
+
 def test_handle_input_no_tool_chosen(orchestrator, db_session):
     """Tests that a generic response is generated if the LLM doesn't choose a tool."""
     orchestrator.handle_player_input("Hello?", db_session)
@@ -111,3 +123,85 @@ def test_npc_reaction(orchestrator, db_session):
     # Verify narrative was generated
     orchestrator.llm_service.generate_response.assert_called_once()
     assert db_session.query(LogEntry).filter_by(source="Warden").count() == 1
+
+
+def test_retrieved_memories_reach_the_narrative(mock_llm_service, db_session):
+    """Recalled log entries are passed to the narrative and recorded on the turn."""
+    rag_service = Mock()
+    rag_service.hybrid_search.return_value = [
+        {"log_entry_id": 7, "content": "The Reeve hid grain in the mill."}
+    ]
+    mock_llm_service.choose_tool.return_value = {
+        "name": "roll_dice",
+        "arguments": {"dice_string": "1d6"},
+    }
+    orchestrator = WardenOrchestrator(
+        mock_llm_service, db_session, rag_service=rag_service
+    )
+
+    orchestrator.handle_player_input("Roll a d6", db_session)
+
+    _, kwargs = mock_llm_service.synthesize_narrative.call_args
+    assert kwargs["memories"] == ["The Reeve hid grain in the mill."]
+    _, search_kwargs = rag_service.hybrid_search.call_args
+    assert search_kwargs["exclude_ids"] == {1}
+    warden_log = db_session.query(LogEntry).filter_by(source="Warden").one()
+    assert warden_log.metadata_dict["retrieval"]["hits"] == 1
+    assert warden_log.metadata_dict["retrieval"]["skipped"] is False
+
+
+def test_slow_retrieval_is_skipped(mock_llm_service, db_session):
+    """Retrieval that overruns the latency budget does not hold up the turn."""
+    release = threading.Event()
+    rag_service = Mock()
+
+    def slow_search(*args, **kwargs):
+        release.wait(5)
+        return [{"log_entry_id": 7, "content": "Too late."}]
+
+    rag_service.hybrid_search.side_effect = slow_search
+    mock_llm_service.choose_tool.return_value = {
+        "name": "roll_dice",
+        "arguments": {"dice_string": "1d6"},
+    }
+    orchestrator = WardenOrchestrator(
+        mock_llm_service, db_session, rag_service=rag_service, retrieval_budget=0.05
+    )
+
+    started_at = time.monotonic()
+    orchestrator.handle_player_input("Roll a d6", db_session)
+    release.set()
+
+    assert time.monotonic() - started_at < 2
+    _, kwargs = mock_llm_service.synthesize_narrative.call_args
+    assert kwargs["memories"] == []
+    assert orchestrator.last_retrieval_stats["skipped"] is True
+
+
+def test_retrieval_waits_for_an_overrunning_search(mock_llm_service, db_session):
+    """No second search starts on the shared session while one is still running."""
+    release = threading.Event()
+    rag_service = Mock()
+
+    def slow_search(*args, **kwargs):
+        release.wait(5)
+        return []
+
+    rag_service.hybrid_search.side_effect = slow_search
+    mock_llm_service.choose_tool.return_value = {
+        "name": "roll_dice",
+        "arguments": {"dice_string": "1d6"},
+    }
+    orchestrator = WardenOrchestrator(
+        mock_llm_service, db_session, rag_service=rag_service, retrieval_budget=0.05
+    )
+
+    orchestrator.handle_player_input("Roll a d6", db_session)
+    orchestrator.handle_player_input("Roll again", db_session)
+    assert rag_service.hybrid_search.call_count == 1
+    assert orchestrator.last_retrieval_stats["skipped"] is True
+
+    release.set()
+    orchestrator._retrieval_future.result(timeout=5)
+    orchestrator.handle_player_input("And once more", db_session)
+    assert rag_service.hybrid_search.call_count == 2
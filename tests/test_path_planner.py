@@ -0,0 +1,90 @@
+"""
+Tests for spatial path planning.
+"""
+
+import math
+import itertools
+import pytest
+import numpy as np
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from core.path_planner import minimum_spanning_tree, plan_paths, watches_between
+from core.rng import RNGService
+from core.oracles import OracleRoller
+from core.world_generator import generate_paths
+from database.models import Base, MapPoint, Path
+
+
+def _length(points, edges):
+    return sum(math.dist(points[i], points[j]) for i, j in edges)
+
+
+def _connected(n, edges):
+    parent = list(range(n))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in edges:
+        parent[find(i)] = find(j)
+    return len({find(i) for i in range(n)}) == 1
+
+
+def test_spanning_tree_is_minimal():
+    points = np.random.default_rng(5).uniform(0, 100, size=(9, 2))
+    tree = minimum_spanning_tree(points)
+    assert len(tree) == 8 and _connected(9, tree)
+
+    # Kruskal over every pair gives the same total length
+    pairs = sorted(itertools.combinations(range(9), 2), key=lambda e: math.dist(points[e[0]], points[e[1]]))
+    kruskal, groups = [], list(range(9))
+    for i, j in pairs:
+        gi, gj = groups[i], groups[j]
+        if gi != gj:
+            kruskal.append((i, j))
+            groups = [gi if g == gj else g for g in groups]
+    assert _length(points, tree) == pytest.approx(_length(points, kruskal))
+
+
+def test_planned_network_is_connected_and_has_loops():
+    points = np.random.default_rng(6).uniform(0, 5000, size=(3000, 2))
+    edges = plan_paths(points, extra_neighbours=2)
+    assert _connected(3000, edges)
+    assert len(edges) > 3000  # More than a tree
+    assert len(set(edges)) == len(edges) and all(i < j for i, j in edges)
+    assert watches_between((0, 0), (0, 10)) == 1
+    assert watches_between((0, 0), (400, 0)) == 3
+
+
+def test_generate_paths_joins_every_poi_with_one_insert():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    rng = np.random.default_rng(7)
+    db.add_all([
+        MapPoint(name=f"POI {i}", status="hidden", position_x=int(x), position_y=int(y))
+        for i, (x, y) in enumerate(rng.uniform(0, 2000, size=(400, 2)))
+    ])
+    db.commit()
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda c, cur, statement, *a: statements.append(statement))
+
+    generate_paths(db, OracleRoller(RNGService(2).stream("world_gen")))
+
+    paths = db.query(Path).all()
+    ids = {point.id: i for i, point in enumerate(db.query(MapPoint).order_by(MapPoint.id))}
+    assert _connected(400, [(ids[p.start_point_id], ids[p.end_point_id]) for p in paths])
+    assert sum(s.startswith("INSERT INTO path") for s in statements) == 1
+    longest = max(paths, key=lambda p: math.dist(
+        (p.start_point.position_x, p.start_point.position_y),
+        (p.end_point.position_x, p.end_point.position_y),
+    ))
+    assert longest.watches == max(p.watches for p in paths) and all(p.feature for p in paths)
+    db.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,185 @@
+"""
+Tests for the resolution condition predicate language.
+"""
+
+import pytest
+from unittest.mock import Mock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from core import predicates
+from core.condition_tracker import ConditionTracker
+from core.predicates import compile_predicate, index_keys, trigger_index_keys
+from core.world_generator import WorldGenerator
+from database.models import Base, ResolutionCondition, TensionEvent
+
+# In-memory SQLite for testing
+engine = create_engine("sqlite:///:memory:")
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+DELIVER_TO_ELDER = {
+    "all": [
+        {"eq": ["trigger_type", "item_delivery"]},
+        {"any": [
+            {"ieq": ["receiver_name", "Elder Mara"]},
+            {"in": ["receiver_name", ["Captain Rell", "Sister Ona"]]},
+        ]},
+    ]
+}
+
+
+def test_compiled_predicate_semantics():
+    predicate = compile_predicate(DELIVER_TO_ELDER)
+    assert predicate("item_delivery", {"receiver_name": "elder mara", "item_name": "Herbs"})
+    assert predicate("item_delivery", {"receiver_name": "SISTER ONA"})
+    assert not predicate("item_received", {"receiver_name": "Elder Mara"})
+    assert not predicate("item_delivery", {"receiver_name": "Stranger"})
+    assert not predicate("item_delivery", {})
+
+    with pytest.raises(ValueError):
+        compile_predicate({"near": ["location_name", "Mill"]})
+    with pytest.raises(ValueError):
+        compile_predicate({"eq": "location_name"})
+
+
+def test_index_keys_cover_every_match():
+    keys = index_keys(DELIVER_TO_ELDER)
+    assert keys == {
+        ("item_delivery", ("receiver_name", name))
+        for name in ("elder mara", "captain rell", "sister ona")
+    }
+    assert set(trigger_index_keys("item_delivery", {"receiver_name": "Elder Mara"})) & keys
+    assert index_keys({"ieq": ["killed_by", "Player"]}) == {(None, ("killed_by", "player"))}
+    assert index_keys({"any": [DELIVER_TO_ELDER, {"eq": ["is_hostile", True]}]}) >= keys
+
+
+@pytest.mark.parametrize("spec", [
+    DELIVER_TO_ELDER,
+    {"ieq": ["trigger_type", "Entity_Death"]},
+    {"eq": ["trigger_type", "Entity_Death"]},
+    {"in": ["trigger_type", ["ENTITY_DEATH", "item_delivery"]]},
+    {"ieq": ["quantity", "3"]},
+    {"ieq": ["is_hostile", "True"]},
+    {"ieq": ["killed_by", ""]},
+    {"eq": ["killed_by", None]},
+    {"in": ["killed_by", ["Player", None]]},
+    {"all": [{"ieq": ["trigger_type", "ITEM_DELIVERY"]}, {"ieq": ["quantity", "3"]}]},
+])
+def test_index_keys_reach_every_trigger_the_predicate_accepts(spec):
+    """A trigger the predicate accepts is always looked up under one of its keys."""
+    triggers = [
+        ("entity_death", {"entity_name": "Wolf", "killed_by": "player"}),
+        ("entity_death", {"entity_name": "Wolf"}),
+        ("Entity_Death", {"killed_by": ""}),
+        ("item_delivery", {"receiver_name": "Elder Mara", "quantity": 3}),
+        ("item_delivery", {"receiver_name": "Sister Ona", "is_hostile": True}),
+        ("item_delivery", {"quantity": 0, "tags": ["herbs"]}),
+    ]
+    predicate = compile_predicate(spec)
+    keys = index_keys(spec)
+    accepted = [(t, d) for t, d in triggers if predicate(t, d)]
+    assert accepted
+    for trigger_type, data in accepted:
+        assert keys & set(trigger_index_keys(trigger_type, data)), (trigger_type, data)
+
+
+def test_predicate_conditions_resolve_through_the_index(db_session, monkeypatch):
+    """Custom conditions with a predicate are met by ordinary triggers."""
+    monkeypatch.setattr(predicates, "_predicate_cache", predicates.OrderedDict())
+    event = TensionEvent(
+        title="Sick Elder", description="", source_type="settlement_problem",
+        deadline_watches=4, watches_remaining=4,
+        conditions=[
+            ResolutionCondition(
+                condition_type="custom", description="Bring medicine to the elder",
+                target_data={"description": "", "predicate": DELIVER_TO_ELDER},
+            ),
+        ],
+    )
+    db_session.add(event)
+    db_session.commit()
+
+    tracker = ConditionTracker(db_session)
+    tracker.check_all_conditions("item_delivery", {"receiver_name": "Guard", "item_name": "Herbs"})
+    db_session.refresh(event)
+    assert event.status == "active"
+
+    tracker.check_all_conditions("item_delivery", {"receiver_name": "Captain Rell", "item_name": "Herbs"})
+    db_session.refresh(event)
+    assert event.status == "resolved"
+    assert len(predicates._predicate_cache) == 1
+
+
+def test_unhashable_operands_never_match_and_never_break_dispatch(db_session, monkeypatch):
+    monkeypatch.setattr(predicates, "_predicate_cache", predicates.OrderedDict())
+    for spec in ({"eq": ["x", [1, 2]]}, {"ieq": ["x", {"a": 1}]}, {"in": ["x", [[1], 2]]}):
+        with pytest.raises(ValueError):
+            compile_predicate(spec)
+
+    event = TensionEvent(
+        title="Sick Elder", description="", source_type="settlement_problem",
+        deadline_watches=4, watches_remaining=4,
+        conditions=[
+            ResolutionCondition(
+                condition_type="custom", description="Malformed",
+                target_data={"description": "", "predicate": {"eq": ["receiver_name", ["Elder Mara"]]}},
+            ),
+            ResolutionCondition(
+                condition_type="custom", description="Bring medicine to the elder",
+                target_data={"description": "", "predicate": DELIVER_TO_ELDER},
+            ),
+        ],
+    )
+    db_session.add(event)
+    db_session.commit()
+
+    ConditionTracker(db_session).check_all_conditions("item_delivery", {"receiver_name": "Elder Mara"})
+    db_session.refresh(event)
+    assert [c.is_met for c in event.conditions] == [False, True]
+
+
+def test_generator_writes_predicates_from_settlement_names():
+    generator = WorldGenerator(Mock(), Mock())
+    context = {
+        "location_names": ["The Drowned Mill", "Market Square"],
+        "npc_names": ["Elder Mara", "Captain Rell"],
+        "source_location_name": "The Drowned Mill",
+        "source_npc_names": ["Elder Mara"],
+    }
+
+    kill = generator._create_resolution_condition_from_solution(1, "Defeat the thing in the weir", context)
+    assert kill.condition_type == "entity_death"
+    assert compile_predicate(kill.target_data["predicate"])(
+        "entity_death", {"entity_name": "Weir Hag", "is_hostile": True, "location_name": "The Drowned Mill"}
+    )
+
+    deliver = generator._create_resolution_condition_from_solution(1, "Bring dry grain", context)
+    assert compile_predicate(deliver.target_data["predicate"])(
+        "item_delivery", {"receiver_name": "Elder Mara", "item_name": "Grain"}
+    )
+
+    custom = generator._create_resolution_condition_from_solution(
+        1, "Convince Captain Rell to open the granary", context
+    )
+    assert custom.condition_type == "custom"
+    assert compile_predicate(custom.target_data["predicate"])(
+        "item_delivery", {"receiver_name": "captain rell"}
+    )
+
+    vague = generator._create_resolution_condition_from_solution(1, "Pray for rain", context)
+    assert vague.target_data == {"description": "Pray for rain"}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
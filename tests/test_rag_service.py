@@ -0,0 +1,183 @@
+"""
+Tests for the RAGService indexing of the adventure log.
+"""
+
+import pytest
+import concurrent.futures
+from sqlalchemy import create_engine, event as sa_event
+from sqlalchemy.orm import sessionmaker
+from database.models import Base, LogEntry
+from core.embeddings import HashingEmbeddings
+from core.rag_service import RAGService, index_directory_for
+
+# In-memory SQLite for testing
+engine = create_engine("sqlite:///:memory:")
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def rag_service(db_session, tmp_path):
+    """A RAGService backed by local embeddings and a temporary index directory."""
+    return RAGService(
+        db_session, str(tmp_path / "adventure_memory"), HashingEmbeddings()
+    )
+
+
+def _add_entries(db_session, *contents):
+    db_session.add_all([LogEntry(source="Warden", content=c) for c in contents])
+    db_session.commit()
+
+
+def test_index_directory_for():
+    """Each adventure database gets its own index directory."""
+    assert index_directory_for("adventures/My_Game.db") == "adventures/My_Game_memory"
+
+
+def test_load_adventure_log_is_incremental(rag_service, db_session):
+    """Reloading only embeds entries written since the previous load."""
+    _add_entries(db_session, "The mill burns.", "The Reeve weeps.")
+    assert rag_service.load_adventure_log() == 2
+    assert rag_service.load_adventure_log() == 0
+
+    _add_entries(db_session, "Crows gather at dusk.")
+    assert rag_service.load_adventure_log() == 1
+    assert len(rag_service.vector_store.get()["ids"]) == 3
+
+
+def test_high_water_mark_persists_across_instances(rag_service, db_session):
+    """A new service for the same adventure resumes from the stored mark."""
+    _add_entries(db_session, "The mill burns.")
+    rag_service.load_adventure_log()
+
+    reopened = RAGService(
+        db_session, rag_service.persist_directory, HashingEmbeddings()
+    )
+
+    assert reopened.high_water_mark == rag_service.high_water_mark
+    assert reopened.load_adventure_log() == 0
+
+
+def test_reindex_rebuilds_without_duplicates(rag_service, db_session):
+    """Reindexing rebuilds the index from scratch with one document per entry."""
+    _add_entries(db_session, "The mill burns.", "The Reeve weeps.")
+    rag_service.load_adventure_log()
+
+    assert rag_service.reindex() == 2
+    assert sorted(rag_service.vector_store.get()["ids"]) == ["log-1", "log-2"]
+
+
+def test_switching_embedding_backend_resets_index(rag_service, db_session):
+    """An index built in another vector space is rebuilt rather than reused."""
+    _add_entries(db_session, "The mill burns.")
+    rag_service.load_adventure_log()
+
+    reopened = RAGService(
+        db_session, rag_service.persist_directory, HashingEmbeddings(dimensions=64)
+    )
+
+    assert reopened.high_water_mark == 0
+    assert reopened.load_adventure_log() == 1
+
+
+def test_search_finds_matching_entry(rag_service, db_session):
+    """Local embeddings retrieve the entry that shares the query's words."""
+    _add_entries(
+        db_session,
+        "The Reeve says the mill wheel was sabotaged at night.",
+        "A crow pecks at a corpse on the road.",
+        "The innkeeper serves thin stew.",
+    )
+    rag_service.load_adventure_log()
+
+    results = rag_service.search("What did the Reeve say about the mill?", limit=1)
+
+    assert results == ["The Reeve says the mill wheel was sabotaged at night."]
+
+
+def test_full_text_index_follows_log_entry_changes(rag_service, db_session):
+    """Triggers keep the full-text index in step with inserts, updates and deletes."""
+    _add_entries(db_session, "The mill burns.", "The Reeve weeps.")
+    assert [i for i, _ in rag_service.lexical_search("mill")] == [1]
+
+    entry = db_session.get(LogEntry, 1)
+    entry.content = "The granary burns."
+    db_session.commit()
+    assert rag_service.lexical_search("mill") == []
+    assert [i for i, _ in rag_service.lexical_search("granary")] == [1]
+
+    db_session.delete(entry)
+    db_session.commit()
+    assert rag_service.lexical_search("granary") == []
+
+
+def test_hybrid_search_finds_exact_names(rag_service, db_session):
+    """A named NPC is found by its exact name and ranked first."""
+    _add_entries(
+        db_session,
+        "Rain falls on the crossroads.",
+        "Old Hettie says the Reeve hid grain in the mill.",
+        "A crow watches from the fence.",
+    )
+    rag_service.load_adventure_log()
+
+    results = rag_service.hybrid_search("What did Hettie say about the mill?")
+
+    assert results[0]["log_entry_id"] == 2
+    assert set(results[0]["matched_by"]) == {"lexical", "vector"}
+    excluded = rag_service.hybrid_search("Hettie", exclude_ids={2})
+    assert all(hit["log_entry_id"] != 2 for hit in excluded)
+
+
+def test_hybrid_search_falls_back_to_full_text(rag_service, db_session, monkeypatch):
+    """When embeddings fail, the full-text ranking is still returned."""
+    _add_entries(db_session, "The mill burns.", "The Reeve weeps.")
+
+    def unavailable(*args, **kwargs):
+        raise ConnectionError("embedding service unreachable")
+
+    monkeypatch.setattr(rag_service.vector_store, "similarity_search", unavailable)
+
+    results = rag_service.hybrid_search("Reeve")
+
+    assert [hit["log_entry_id"] for hit in results] == [2]
+    assert results[0]["matched_by"] == ["lexical"]
+
+
+def test_searches_on_other_threads_use_their_own_sessions(tmp_path):
+    """Searching from a worker thread never touches the caller's session."""
+    file_engine = create_engine(
+        f"sqlite:///{tmp_path / 'adventure.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(bind=file_engine)
+    db_session = sessionmaker(bind=file_engine)()
+    _add_entries(db_session, "The mill burns.", "The Reeve weeps.")
+    rag_service = RAGService(db_session, str(tmp_path / "memory"), HashingEmbeddings())
+    executed_on_caller_session = []
+    sa_event.listen(
+        db_session, "do_orm_execute", lambda state: executed_on_caller_session.append(state)
+    )
+    rag_service.load_adventure_log()
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        searches = [
+            executor.submit(rag_service.hybrid_search, "mill", 1) for _ in range(8)
+        ]
+        assert rag_service.reindex() == 2
+        results = [future.result(timeout=10) for future in searches]
+
+    assert all(hits[0]["log_entry_id"] == 1 for hits in results)
+    assert executed_on_caller_session == []
+    db_session.close()
+    file_engine.dispose()
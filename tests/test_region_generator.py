@@ -0,0 +1,77 @@
+"""
+Tests for large-region world generation.
+"""
+
+import math
+import pytest
+import numpy as np
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from core.region_generator import REGIONS_KEY, TERRAIN_TABLES, RegionGenerator, poisson_disk
+from core.rng import RNGService
+from database.models import Base, MapPoint, Path, WorldState
+
+
+def test_poisson_points_keep_their_distance():
+    grid = poisson_disk(600, 400, 25, np.random.default_rng(1))
+    points = grid.points
+    distance = np.hypot(points[:, None, 0] - points[None, :, 0], points[:, None, 1] - points[None, :, 1])
+    np.fill_diagonal(distance, np.inf)
+    assert distance.min() >= 25
+    assert len(points) > 150  # The map is filled, not sparsely sampled
+    assert ((points >= 0) & (points < (600, 400))).all()
+    assert len(poisson_disk(600, 400, 25, np.random.default_rng(1), max_points=40)) == 40
+
+
+def test_grid_queries_match_brute_force():
+    grid = poisson_disk(500, 500, 20, np.random.default_rng(2))
+    points = grid.points
+    for x, y in np.random.default_rng(3).uniform(-50, 550, size=(50, 2)):
+        distance = np.hypot(points[:, 0] - x, points[:, 1] - y)
+        assert grid.nearest(x, y) == int(np.argmin(distance))
+        assert sorted(grid.within(x, y, 45)) == np.flatnonzero(distance <= 45).tolist()
+
+
+def test_generate_fills_a_connected_region_in_bulk():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda c, cur, statement, *a: statements.append(statement))
+
+    report = RegionGenerator(db, RNGService(4).stream("world_gen")).generate(
+        width=1500, height=1000, min_distance=50, regions=4
+    )
+
+    points = db.query(MapPoint).order_by(MapPoint.id).all()
+    assert report.pois == len(points) > 200
+    assert report.paths == db.query(Path).count() >= len(points) - 1
+    assert sum(s.startswith("INSERT INTO map_point") for s in statements) == 1
+    assert sum(s.startswith("INSERT INTO path") for s in statements) == 1
+
+    # Every POI is reachable from the first
+    neighbours = {p.id: set() for p in points}
+    for path in db.query(Path):
+        neighbours[path.start_point_id].add(path.end_point_id)
+        neighbours[path.end_point_id].add(path.start_point_id)
+    reached, frontier = {points[0].id}, [points[0].id]
+    while frontier:
+        for other in neighbours[frontier.pop()] - reached:
+            reached.add(other)
+            frontier.append(other)
+    assert len(reached) == len(points)
+
+    assert sum(r.poi_count for r in report.regions) == report.pois
+    assert all(r.terrain in TERRAIN_TABLES for r in report.regions)
+    settlements = [p for p in points if p.type.startswith("Settlement")]
+    assert len(settlements) >= len(report.regions)
+    for region in report.regions:
+        nearest = min(points, key=lambda p: math.dist(region.center, (p.position_x, p.position_y)))
+        assert nearest.type.startswith("Settlement")
+    recorded = db.query(WorldState).filter(WorldState.key == REGIONS_KEY).one().value
+    assert [r["name"] for r in recorded] == [r.name for r in report.regions]
+    db.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
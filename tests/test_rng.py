@@ -0,0 +1,88 @@
+"""
+Tests for the adventure's seeded random streams.
+"""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from core import rng, world_tools
+from core.character_generator import CharacterGenerator
+from core.dice import compile_dice
+from database.models import Base, WorldState
+
+
+@pytest.fixture(scope="function")
+def session_factory():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+def _draws(stream, n=5):
+    return [stream.randint(1, 1000) for _ in range(n)]
+
+
+def test_streams_are_reproducible_and_independent():
+    first, second = rng.RNGService(42), rng.RNGService(42)
+    assert _draws(first.stream(rng.COMBAT)) == _draws(second.stream(rng.COMBAT))
+
+    # Drawing from one stream never shifts another
+    _draws(first.stream(rng.ORACLES), 50)
+    assert _draws(first.stream(rng.DICE)) == _draws(second.stream(rng.DICE))
+    assert _draws(rng.RNGService(43).stream(rng.DICE)) != _draws(rng.RNGService(42).stream(rng.DICE))
+
+    # The numpy side of a stream shares its state
+    vectorized = rng.RNGService(7).stream(rng.COMBAT)
+    assert compile_dice("3d6").roll_many(100, vectorized.numpy).shape == (100,)
+    assert 1 <= vectorized.randint(1, 6) <= 6
+
+
+def test_stream_state_survives_a_reload(session_factory):
+    expected = _draws(rng.RNGService(99).stream(rng.ORACLES), 6)
+
+    db = session_factory()
+    rng.set_adventure_seed(db, 99)
+    assert _draws(rng.stream(db, rng.ORACLES), 3) == expected[:3]
+    db.commit()
+    db.close()
+
+    db = session_factory()
+    assert rng.get_adventure_seed(db) == 99
+    assert _draws(rng.stream(db, rng.ORACLES), 3) == expected[3:]
+    db.close()
+
+
+def test_rolled_back_draws_are_replayed(session_factory):
+    db = session_factory()
+    rng.set_adventure_seed(db, 5)
+    db.commit()
+
+    undone = _draws(rng.stream(db, rng.DICE))
+    db.add(WorldState(key="scratch", value=1))
+    db.flush()
+    db.rollback()
+    assert _draws(rng.stream(db, rng.DICE)) == undone
+    db.close()
+
+
+def test_rollers_follow_the_adventure_seed(session_factory):
+    results = []
+    for _ in range(2):
+        db = session_factory()
+        rng.set_adventure_seed(db, 2024)
+        results.append((
+            CharacterGenerator(rng.stream(db, rng.CHARACTERS)).generate_character()["name"],
+            [world_tools.roll_dice("4d6kh3", db)["total"] for _ in range(5)],
+            world_tools.roll_wilderness_event(db)["event_description"],
+        ))
+        db.rollback()
+        db.close()
+    assert results[0] == results[1]
+
+    # Without a session the tools fall back to the global random module
+    assert 1 <= world_tools.roll_dice("1d6")["total"] <= 6
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,93 @@
+"""
+Tests for multi-hop route planning over Paths.
+"""
+
+import pytest
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from core import routing
+from core.scheduler import get_game_clock
+from core.world_tools import travel_to_map_point
+from database.models import Base, GameEntity, Location, MapPoint, Path
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def world(db_session):
+    """Four map points: Ford -1- Mill -2- Tower, Ford -5- Tower, and a hidden path to the Cave."""
+    points = {}
+    for name in ("Ford", "Mill", "Tower", "Cave"):
+        point = MapPoint(name=name, status="known")
+        point.locations.append(Location(name=f"{name} Gate", is_entry_point=True))
+        points[name] = point
+    db_session.add_all(points.values())
+    db_session.add_all([
+        Path(start_point=points["Ford"], end_point=points["Mill"], watches=1, status="known"),
+        Path(start_point=points["Tower"], end_point=points["Mill"], watches=2, status="explored"),
+        Path(start_point=points["Ford"], end_point=points["Tower"], watches=5, status="known"),
+        Path(start_point=points["Cave"], end_point=points["Tower"], watches=1, status="hidden"),
+    ])
+    hero = GameEntity(
+        name="Hero", entity_type="Character", hp=5, strength=10,
+        current_map_point=points["Ford"], current_location=points["Ford"].locations[0],
+    )
+    db_session.add(hero)
+    db_session.commit()
+    return points
+
+
+def test_quickest_route_takes_several_legs(db_session, world):
+    legs = routing.find_route(db_session, world["Ford"].id, world["Tower"].id)
+    assert [leg.end_point_id for leg in legs] == [world["Mill"].id, world["Tower"].id]
+    assert sum(leg.watches for leg in legs) == 3
+    # Hidden paths are only taken as a direct first step, in either direction
+    assert routing.find_route(db_session, world["Ford"].id, world["Cave"].id) is None
+    assert len(routing.find_route(db_session, world["Tower"].id, world["Cave"].id)) == 1
+
+
+def test_path_changes_invalidate_the_cached_graph(db_session, world):
+    ford, tower = world["Ford"].id, world["Tower"].id
+    assert routing.route_graph(db_session).watches_between(ford, tower) == 3
+
+    mill_road = db_session.query(Path).filter(Path.watches == 1, Path.status == "known").one()
+    mill_road.status = "hidden"
+    db_session.flush()
+    assert routing.route_graph(db_session).watches_between(ford, tower) == 5
+
+    db_session.execute(insert(Path), [
+        {"start_point_id": ford, "end_point_id": tower, "watches": 2, "status": "known"}
+    ])
+    assert routing.route_graph(db_session).watches_between(ford, tower) == 2
+
+    db_session.rollback()
+    assert routing.route_graph(db_session).watches_between(ford, tower) == 3
+
+
+def test_travel_makes_the_whole_journey_in_one_call(db_session, world):
+    result = travel_to_map_point(db_session, "Hero", "tower")
+
+    assert result["success"]
+    assert result["route"] == ["Ford", "Mill", "Tower"]
+    assert result["time_advanced"] == 3 and get_game_clock(db_session) == 3
+    hero = db_session.query(GameEntity).filter_by(name="Hero").one()
+    assert hero.current_map_point_id == world["Tower"].id
+    assert hero.current_location.name == "Tower Gate"
+    statuses = {p.watches: p.status for p in db_session.query(Path) if "Cave" not in (p.start_point.name, p.end_point.name)}
+    assert statuses == {1: "explored", 2: "explored", 5: "known"}
+
+    # The hidden path out of the Tower is walkable from there, and becomes explored
+    assert travel_to_map_point(db_session, "Hero", "Cave")["time_advanced"] == 1
+    assert routing.route_graph(db_session).watches_between(world["Ford"].id, world["Cave"].id) == 4
+    assert "error" in travel_to_map_point(db_session, "Hero", "Cave")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
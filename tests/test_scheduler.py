@@ -0,0 +1,116 @@
+"""
+Test the game clock and tension event deadline scheduling.
+"""
+
+import pytest
+from sqlalchemy import create_engine, event as sa_event, insert
+from sqlalchemy.orm import sessionmaker
+from database.models import Base, TensionEvent
+from core.condition_tracker import ConditionTracker
+from core.scheduler import (
+    DeadlineQueue,
+    deadline_queue,
+    get_game_clock,
+    upcoming_deadlines,
+    watches_until_deadline,
+)
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db_session(engine):
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    yield session
+    session.close()
+
+
+def _add_event(db, title, watches):
+    event = TensionEvent(
+        title=title, description="", source_type="test",
+        deadline_watches=watches, watches_remaining=watches,
+    )
+    db.add(event)
+    db.commit()
+    return event
+
+
+def test_deadline_queue_orders_and_skips_stale_entries():
+    """The soonest live deadline comes first; rescheduled entries are ignored."""
+    queue = DeadlineQueue()
+    queue.schedule(1, 5, "Flood")
+    queue.schedule(2, 3, "Raid")
+    queue.schedule(3, 8, "Plague")
+    queue.schedule(2, 9, "Raid")
+    queue.remove(3)
+
+    assert queue.next_deadline().event_id == 1
+    assert [d.event_id for d in queue.upcoming(5)] == [1, 2]
+    assert len(queue) == 2
+
+
+def test_advance_time_only_touches_due_events(engine, db_session):
+    """Events whose deadline is still ahead are neither read nor written."""
+    soon = _add_event(db_session, "Soon", 1)
+    late = [_add_event(db_session, f"Late {i}", 10) for i in range(5)]
+
+    updates = []
+
+    def record(conn, cursor, statement, *args):
+        if statement.startswith("UPDATE tension_event"):
+            updates.append(statement)
+
+    sa_event.listen(engine, "before_cursor_execute", record)
+    try:
+        escalated = ConditionTracker(db_session).advance_time(watches=1)
+    finally:
+        sa_event.remove(engine, "before_cursor_execute", record)
+
+    assert escalated == [soon]
+    assert len(updates) == 1
+    assert get_game_clock(db_session) == 1
+    for event in late:
+        db_session.refresh(event)
+        assert event.watches_remaining == 10
+        assert watches_until_deadline(db_session, event) == 9
+
+
+def test_upcoming_deadlines_follow_the_clock(db_session):
+    """The deadline queue tracks new, escalated and failed events."""
+    flood = _add_event(db_session, "Flood", 2)
+    raid = _add_event(db_session, "Raid", 3)
+    assert [d["title"] for d in upcoming_deadlines(db_session)] == ["Flood", "Raid"]
+
+    ConditionTracker(db_session).advance_time(watches=2)
+    deadlines = upcoming_deadlines(db_session)
+    assert [(d["title"], d["watches_remaining"]) for d in deadlines] == [
+        ("Raid", 1), ("Flood", 2)
+    ]
+
+    flood.status = "resolved"
+    db_session.commit()
+    assert [d["tension_event_id"] for d in upcoming_deadlines(db_session)] == [raid.id]
+    assert len(deadline_queue(db_session)) == 1
+
+
+def test_bulk_inserted_events_reach_the_deadline_queue(db_session):
+    """Events written with a bulk statement, as world generation does, are scheduled."""
+    _add_event(db_session, "Flood", 4)
+    assert [d["title"] for d in upcoming_deadlines(db_session)] == ["Flood"]
+
+    db_session.execute(insert(TensionEvent), [{
+        "title": "Raid", "description": "", "source_type": "test", "status": "active",
+        "deadline_watches": 2, "watches_remaining": 2, "due_at_watch": 2,
+    }])
+    assert [d["title"] for d in upcoming_deadlines(db_session)] == ["Raid", "Flood"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,83 @@
+"""
+Tests for caches kept in a session's info dict.
+"""
+
+import pytest
+from sqlalchemy import create_engine, insert, update
+from sqlalchemy.orm import sessionmaker
+from core.session_cache import CACHES_UPDATED, SessionCache
+from database.models import Base, MapPoint, WorldState
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def _count_cache(**kwargs):
+    """A cache of the MapPoint count that records how often it is built."""
+    builds = []
+
+    def build(db):
+        builds.append(1)
+        return {"count": db.query(MapPoint).count()}
+
+    return SessionCache("map_point_count", build, (MapPoint,), **kwargs), builds
+
+
+def test_value_is_built_once_and_kept_current_by_flushes(db_session):
+    def on_flush(session, value):
+        value["count"] += sum(isinstance(obj, MapPoint) for obj in session.new)
+
+    cache, builds = _count_cache(on_flush=on_flush)
+    assert cache.get(db_session) == {"count": 0}
+
+    db_session.add(MapPoint(name="Ford", status="hidden"))
+    db_session.flush()
+    assert cache.get(db_session) == {"count": 1}
+    assert cache.get(db_session) is cache.peek(db_session)
+    assert len(builds) == 1
+
+
+def test_bulk_writes_and_rollbacks_drop_the_value(db_session):
+    cache, builds = _count_cache()
+    cache.get(db_session)
+
+    db_session.execute(insert(WorldState), [{"key": "other", "value": 1}])
+    assert cache.peek(db_session) is not None
+
+    db_session.execute(
+        update(MapPoint).execution_options(**{CACHES_UPDATED: True}), {"status": "known"}
+    )
+    assert cache.peek(db_session) is not None
+
+    db_session.execute(insert(MapPoint), [
+        {"name": "Ford", "status": "hidden"}, {"name": "Tower", "status": "hidden"}
+    ])
+    assert cache.peek(db_session) is None
+    assert cache.get(db_session) == {"count": 2}
+
+    db_session.rollback()
+    assert cache.peek(db_session) is None
+    assert cache.get(db_session) == {"count": 0}
+    assert len(builds) == 3
+
+
+def test_on_commit_sees_the_value(db_session):
+    committed = []
+    cache, _ = _count_cache(on_commit=lambda session, value: committed.append(value["count"]))
+    db_session.commit()
+    cache.get(db_session)
+    cache.discard(db_session)
+    cache.get(db_session)
+    db_session.commit()
+    assert committed == [0]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -8,7 +8,8 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from database.models import Base, TensionEvent, ResolutionCondition, GameEntity, LogEntry
 from core.world_tools import make_camp, travel_to_map_point
-from core.condition_tracker import ConditionTracker
+from core.condition_tracker import ConditionTracker, advance_event_clock
+from core.scheduler import watches_until_deadline
 import datetime
 
 
@@ -75,8 +76,10 @@ def test_condition_tracker_advance_time(db_session, sample_tension_event):
     # Refresh the event from database
     db_session.refresh(sample_tension_event)
     
-    # Should have 1 watch remaining
-    assert sample_tension_event.watches_remaining == 1
+    # Should have 1 watch remaining; events that are not yet due are not
+    # written, their countdown is read off the game clock
+    assert watches_until_deadline(db_session, sample_tension_event) == 1
+    assert sample_tension_event.due_at_watch == 2
     assert len(escalated_events) == 0  # No escalation yet
 
 
@@ -145,7 +148,7 @@ def test_make_camp_with_escalation(mock_llm_service, db_session, sample_characte
     
     # Check that the tension event was affected
     db_session.refresh(sample_tension_event)
-    assert sample_tension_event.watches_remaining == 1
+    assert watches_until_deadline(db_session, sample_tension_event) == 1
 
 
 def test_multiple_escalations(db_session):
@@ -203,5 +206,51 @@ def test_escalation_logging(db_session, sample_tension_event):
     assert len(escalation_logs) > 0
 
 
+def test_advance_event_clock_closed_form():
+    """The clock after many watches matches stepping through them one at a time."""
+    for deadline in range(1, 5):
+        for remaining in range(1, deadline + 1):
+            for watches in range(0, 15):
+                severity, left, failed = 1, remaining, False
+                for _ in range(watches):
+                    left -= 1
+                    if left <= 0:
+                        if severity >= 4:
+                            failed = True
+                            break
+                        severity, left = severity + 1, deadline
+                outcome = advance_event_clock(1, 4, deadline, remaining, watches)
+                assert outcome.failed == failed
+                assert outcome.severity_level == (4 if failed else severity)
+                if not failed:
+                    assert outcome.watches_remaining == left
+
+
+def test_long_journey_escalates_several_times(db_session, sample_tension_event):
+    """Crossing two deadlines in one advance escalates twice."""
+    tracker = ConditionTracker(db_session)
+
+    changed = tracker.advance_time(watches=5)
+
+    db_session.refresh(sample_tension_event)
+    assert sample_tension_event.severity_level == 3
+    assert sample_tension_event.watches_remaining == 1
+    assert sample_tension_event.status == "active"
+    assert [event.id for event in changed] == [sample_tension_event.id]
+
+
+def test_long_journey_can_fail_an_event(db_session, sample_tension_event):
+    """An event that runs out of escalations mid-journey fails and is returned."""
+    tracker = ConditionTracker(db_session)
+
+    changed = tracker.advance_time(watches=30)
+
+    db_session.refresh(sample_tension_event)
+    assert sample_tension_event.status == "failed"
+    assert sample_tension_event.severity_level == sample_tension_event.max_severity
+    assert changed[0].status == "failed"
+    assert db_session.query(LogEntry).filter(LogEntry.content.contains("FAILED")).count() == 1
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
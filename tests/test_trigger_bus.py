@@ -0,0 +1,108 @@
+"""
+Tests for the per-turn trigger bus.
+"""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from core import trigger_bus
+from core.condition_tracker import ConditionTracker
+from database.models import Base, LogEntry, ResolutionCondition, TensionEvent
+
+# In-memory SQLite for testing
+engine = create_engine("sqlite:///:memory:")
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def recorder():
+    """A handler subscribed to a test-only trigger type."""
+    calls = []
+
+    def handler(db, triggers):
+        calls.append([trigger.data for trigger in triggers])
+
+    trigger_bus.subscribe(["omen_seen"], handler)
+    yield calls
+    trigger_bus.unsubscribe(["omen_seen"], handler)
+
+
+def test_open_bus_defers_and_deduplicates(db_session, recorder):
+    """Queued triggers reach each handler once, in one call, without duplicates."""
+    trigger_bus.open_bus(db_session)
+    trigger_bus.publish(db_session, "omen_seen", {"omen": "crows"})
+    trigger_bus.publish(db_session, "omen_seen", {"omen": "red moon"})
+    trigger_bus.publish(db_session, "omen_seen", {"omen": "crows"})
+    assert recorder == []
+
+    assert trigger_bus.dispatch(db_session) == 2
+    assert recorder == [[{"omen": "crows"}, {"omen": "red moon"}]]
+    assert trigger_bus.TRIGGER_BUS_KEY not in db_session.info
+
+
+def test_publish_without_bus_dispatches_immediately(db_session, recorder):
+    trigger_bus.publish(db_session, "omen_seen", {"omen": "crows"})
+    assert recorder == [[{"omen": "crows"}]]
+    assert trigger_bus.dispatch(db_session) == 0
+
+
+def test_rollback_drops_pending_triggers(db_session, recorder):
+    trigger_bus.open_bus(db_session)
+    db_session.add(LogEntry(source="Warden", content="The crows gather."))
+    db_session.flush()
+    trigger_bus.publish(db_session, "omen_seen", {"omen": "crows"})
+    db_session.rollback()
+    trigger_bus.publish(db_session, "omen_seen", {"omen": "red moon"})
+
+    trigger_bus.dispatch(db_session)
+    assert recorder == [[{"omen": "red moon"}]]
+
+
+def test_deferred_triggers_resolve_events_in_one_pass(db_session):
+    """Conditions met by several triggers in a turn are evaluated together."""
+    event = TensionEvent(
+        title="Lost Heirloom", description="", source_type="npc_request",
+        deadline_watches=3, watches_remaining=3,
+        conditions=[
+            ResolutionCondition(
+                condition_type="location_visit", description="Reach the crypt",
+                target_data={"location_name": "Crypt"},
+            ),
+            ResolutionCondition(
+                condition_type="item_received", description="Recover the ring",
+                target_data={"item_name": "Ring", "recipient_name": "Player"},
+            ),
+        ],
+    )
+    db_session.add(event)
+    db_session.commit()
+    ConditionTracker(db_session).check_all_conditions("location_visit", {"location_name": "Nowhere"})
+
+    trigger_bus.open_bus(db_session)
+    trigger_bus.publish(db_session, "location_visit", {"location_name": "Crypt"})
+    trigger_bus.publish(db_session, "item_received", {"item_name": "Ring", "recipient_name": "Player"})
+    trigger_bus.publish(db_session, "location_visit", {"location_name": "Crypt"})
+    db_session.refresh(event)
+    assert event.status == "active"
+
+    trigger_bus.dispatch(db_session)
+    db_session.commit()
+
+    db_session.refresh(event)
+    assert event.status == "resolved"
+    assert db_session.query(LogEntry).filter(LogEntry.content.like("**Condition Met:**%")).count() == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
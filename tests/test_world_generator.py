@@ -0,0 +1,101 @@
+"""
+Tests for new-world generation.
+"""
+
+import json
+import pytest
+from unittest.mock import Mock
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from core.rng import RNGService
+from core.world_generator import WorldGenerator
+from database.models import (
+    Base, GameEntity, Location, LocationConnection, MapPoint, Path,
+    ResolutionCondition, TensionEvent, WorldState,
+)
+
+SETTLEMENT = {
+    "summary": "A mill town under a grey sky.",
+    "locations": [
+        {"name": "Town Gate", "description": "Mud and timber.", "function": "Entry",
+         "current_situation": "Refugees", "contents": ["A worried guard", "A broken cart"]},
+        {"name": "Market Square", "description": "Empty stalls.", "function": "Trade",
+         "current_situation": "No grain", "contents": ["Elder Mara (worried)", "Spilled flour", "A cold brazier"]},
+    ],
+    "connections": {"Town Gate": ["Market Square", "Market Square"], "Market Square": ["Town Gate"]},
+    "active_tensions": [
+        {"title": "Empty Granary", "description": "The grain is gone.", "source_location": "Market Square",
+         "urgency": "immediate", "potential_solutions": ["Bring grain to Elder Mara", "Visit the Town Gate"]},
+    ],
+}
+POI = {
+    "summary": "A ruined tower.",
+    "locations": [
+        {"name": "Base", "description": "Rubble.", "contents": ["A goblin guard (HP: 4, Spear)", "A rope"]},
+        {"name": "Top", "description": "Wind.", "contents": []},
+    ],
+    "connections": {"Base": ["Top"], "Top": ["Base"]},
+}
+
+
+def _generate(seed):
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    statements, commits = [], []
+    event.listen(engine, "before_cursor_execute", lambda c, cur, statement, *a: statements.append(statement))
+    event.listen(engine, "commit", lambda conn: commits.append(conn))
+    llm = Mock()
+    llm.generate_response.side_effect = lambda prompt: json.dumps(SETTLEMENT if "settlement" in prompt.lower() else POI)
+    report = WorldGenerator(db, llm, rng=RNGService(seed).stream("world_gen")).generate_new_world()
+    return db, report, statements, commits
+
+
+def test_world_is_written_with_one_insert_per_table_and_one_commit():
+    db, report, statements, commits = _generate(3)
+
+    inserts = [s.split("(")[0].strip() for s in statements if s.startswith("INSERT")]
+    assert len(inserts) == len(set(inserts))
+    assert not any(s.startswith("UPDATE") for s in statements)
+    assert len(commits) == 1
+
+    for model in (WorldState, MapPoint, Location, LocationConnection, GameEntity, TensionEvent,
+                  ResolutionCondition, Path):
+        assert report.rows[model.__tablename__] == db.query(model).count()
+    assert {"llm", "planning", "map_point", "paths", "commit", "total"} <= set(report.seconds)
+    db.close()
+
+
+def test_planned_rows_reference_each_other():
+    db, report, _, _ = _generate(4)
+
+    settlement = db.query(MapPoint).filter_by(status="explored").one()
+    assert settlement.summary == SETTLEMENT["summary"]
+    gate, square = sorted(settlement.locations, key=lambda loc: loc.id)
+    assert gate.is_entry_point and not square.is_entry_point
+    assert square.contents["atmospheric"] == ["Spilled flour", "A cold brazier"]
+    assert {c.destination_location.name for c in gate.connections_from} == {"Market Square"}
+    assert {npc.name for npc in square.entities} == {"Elder Mara"}
+
+    tension = db.query(TensionEvent).one()
+    assert tension.origin_map_point_id == settlement.id and tension.due_at_watch == 2
+    assert tension.created_at is not None
+    assert len(tension.conditions) == 2
+
+    goblins = db.query(GameEntity).filter_by(entity_type="Monster").all()
+    assert goblins and all(g.current_location.map_point_id == g.current_map_point_id for g in goblins)
+    db.close()
+
+
+def _layout(db):
+    return [(p.name, p.position_x, p.position_y) for p in db.query(MapPoint).order_by(MapPoint.id)]
+
+
+def test_same_seed_builds_the_same_world():
+    first, _, _, _ = _generate(5)
+    second, _, _, _ = _generate(5)
+    assert _layout(first) == _layout(second)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
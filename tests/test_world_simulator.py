@@ -0,0 +1,119 @@
+"""
+Tests for the headless world simulation.
+"""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from core import encounters
+from core.encounters import simulate_encounter
+from core.scheduler import get_game_clock
+from core.world_simulator import WorldSimulator
+from database.models import Base, GameEntity, Location, LogEntry, MapPoint, Path, TensionEvent
+
+
+def _build_world(session, with_player=False):
+    points = [MapPoint(name=f"Point {i}", status="known") for i in range(3)]
+    session.add_all(points)
+    session.flush()
+    for point in points:
+        session.add(Location(name=f"Gate of {point.name}", description="", map_point=point, is_entry_point=True))
+    session.add_all([
+        Path(start_point_id=points[0].id, end_point_id=points[1].id, status="known", watches=2),
+        Path(start_point_id=points[1].id, end_point_id=points[2].id, status="known", watches=1),
+    ])
+    session.flush()
+    for i in range(3):
+        session.add(GameEntity(
+            name=f"Wolf {i}", entity_type="Monster", is_hostile=True,
+            hp=3, strength=8, current_map_point_id=points[i % 3].id,
+        ))
+    if with_player:
+        session.add(GameEntity(
+            name="Hero", entity_type="Character", hp=6, strength=12, armor=1,
+            attacks=[{"name": "Sword", "damage": "1d8"}], current_map_point_id=points[0].id,
+        ))
+    session.add_all([
+        TensionEvent(
+            title="Flooding", description="", source_type="world_event",
+            severity_level=1, max_severity=2, deadline_watches=2, watches_remaining=2,
+            origin_map_point_id=points[0].id,
+        ),
+        TensionEvent(
+            title="Plague", description="", source_type="world_event",
+            severity_level=1, max_severity=5, deadline_watches=4, watches_remaining=4,
+            origin_map_point_id=points[2].id,
+        ),
+    ])
+    session.commit()
+
+
+def _simulate(seed, watches, with_player=False):
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    _build_world(session, with_player)
+    report = WorldSimulator(session, seed=seed).fast_forward(watches)
+    positions = [
+        (e.name, e.current_map_point_id, e.current_location_id)
+        for e in session.query(GameEntity).order_by(GameEntity.id)
+    ]
+    return session, report, positions
+
+
+def test_fast_forward_escalates_moves_and_applies_consequences():
+    session, report, positions = _simulate(seed=3, watches=30)
+
+    assert get_game_clock(session) == 30
+    assert report.moves > 0
+    assert report.failures >= 2  # Flooding, Plague and their aftermath
+    assert report.escalations > 0
+    assert report.watches_per_second > 0
+
+    flooding = session.query(TensionEvent).filter_by(title="Flooding").one()
+    assert flooding.status == "failed"
+    # Moderate failures leave a follow-up crisis, severe ones a hostile entity
+    assert session.query(TensionEvent).filter_by(title="Aftermath of Flooding").count() == 1
+    assert session.query(GameEntity).filter_by(name="Consequence of Plague").count() == 1
+    assert any("Consequence of Plague" in c for c in report.consequences)
+
+    summary = session.query(LogEntry).filter(LogEntry.content.like("**While 30 watches passed:**%")).one()
+    assert "Flooding spiraled out of control." in summary.content
+    session.close()
+
+
+def test_fast_forward_is_deterministic_for_a_seed():
+    _, first, first_positions = _simulate(seed=11, watches=25)
+    _, second, second_positions = _simulate(seed=11, watches=25)
+    assert first_positions == second_positions
+    assert (first.moves, first.escalations, first.failures, first.summary) == (
+        second.moves, second.escalations, second.failures, second.summary
+    )
+
+
+
+def test_seeded_consequences_are_scaled_reproducibly_against_the_player(monkeypatch):
+    death_rates = []
+
+    def recording(*args, **kwargs):
+        report = simulate_encounter(*args, **kwargs)
+        death_rates.append(report.death_rate)
+        return report
+
+    monkeypatch.setattr(encounters, "simulate_encounter", recording)
+
+    def run(seed):
+        death_rates.clear()
+        session, _, _ = _simulate(seed, watches=30, with_player=True)
+        spawned = [
+            (e.name, e.hp, e.strength, e.armor, e.attacks)
+            for e in session.query(GameEntity).filter(GameEntity.name.like("Consequence of%")).order_by(GameEntity.id)
+        ]
+        return spawned, list(death_rates)
+
+    first = run(7)
+    assert first[0] and first[1]
+    assert first == run(7)
+
+if __name__ == "__main__":
+    pytest.main([__file__])